@@ -1064,6 +1064,337 @@ END;
 $$;
 
 
+--
+-- Name: standings; Type: TABLE; Schema: core; Owner: -
+--
+-- Tabla de posiciones acumulada por temporada y jornada (puntos 3/1/0):
+-- la fila (season_id, matchday_number, team_id) es la tabla "hasta esa
+-- jornada". La mantiene core.refresh_standings(), que el ETL llama en la
+-- misma transacción en que carga los partidos.
+--
+
+CREATE TABLE core.standings (
+    season_id smallint NOT NULL,
+    matchday_number smallint NOT NULL,
+    team_id integer NOT NULL,
+    played smallint NOT NULL,
+    win smallint NOT NULL,
+    draw smallint NOT NULL,
+    loss smallint NOT NULL,
+    gf smallint NOT NULL,
+    ga smallint NOT NULL,
+    points smallint NOT NULL,
+    "position" smallint NOT NULL,
+    updated_at timestamp with time zone DEFAULT now() NOT NULL,
+    CONSTRAINT standings_pkey PRIMARY KEY (season_id, matchday_number, team_id),
+    CONSTRAINT standings_season_fk FOREIGN KEY (season_id) REFERENCES core.season(season_id) ON DELETE CASCADE,
+    CONSTRAINT standings_team_fk FOREIGN KEY (team_id) REFERENCES reference.team(team_id) ON DELETE CASCADE
+);
+
+
+--
+-- Name: function: refresh_standings; Type: FUNCTION; Schema: core;
+--
+-- Recalcula core.standings de una temporada desde p_from_matchday en
+-- adelante (las jornadas anteriores no dependen de los partidos
+-- posteriores). Idempotente: solo reescribe filas que cambian.
+--
+
+CREATE OR REPLACE FUNCTION core.refresh_standings(
+    p_season_id smallint,
+    p_from_matchday smallint DEFAULT 1
+)
+RETURNS TABLE (inserted integer, updated integer)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- Un refresco por temporada a la vez: el que espera, al tomar el lock,
+    -- ya ve (READ COMMITTED) los partidos que confirmó el anterior.
+    PERFORM pg_advisory_xact_lock(hashtext('core.standings'), p_season_id);
+
+    RETURN QUERY
+    WITH results AS (
+        SELECT md.matchday_number, m.local_team_id AS team_id,
+               m.local_score AS gf, m.away_score AS ga
+        FROM core."match" m
+        JOIN core.matchday md ON md.matchday_id = m.matchday_id
+        WHERE md.season_id = p_season_id
+          AND m.local_score IS NOT NULL
+          AND m.away_score IS NOT NULL
+        UNION ALL
+        SELECT md.matchday_number, m.away_team_id,
+               m.away_score, m.local_score
+        FROM core."match" m
+        JOIN core.matchday md ON md.matchday_id = m.matchday_id
+        WHERE md.season_id = p_season_id
+          AND m.local_score IS NOT NULL
+          AND m.away_score IS NOT NULL
+    ),
+    teams AS (
+        SELECT st.team_id FROM registry.season_team st WHERE st.season_id = p_season_id
+        UNION
+        SELECT r.team_id FROM results r
+    ),
+    matchdays AS (
+        SELECT DISTINCT md.matchday_number
+        FROM core.matchday md
+        WHERE md.season_id = p_season_id
+    ),
+    per_matchday AS (
+        -- Una fila por equipo y jornada, aunque el equipo no haya jugado.
+        SELECT d.matchday_number, t.team_id,
+               count(r.gf)                         AS played,
+               count(*) FILTER (WHERE r.gf > r.ga) AS win,
+               count(*) FILTER (WHERE r.gf = r.ga) AS draw,
+               count(*) FILTER (WHERE r.gf < r.ga) AS loss,
+               COALESCE(sum(r.gf), 0)              AS gf,
+               COALESCE(sum(r.ga), 0)              AS ga
+        FROM matchdays d
+        CROSS JOIN teams t
+        LEFT JOIN results r
+          ON r.matchday_number = d.matchday_number
+         AND r.team_id = t.team_id
+        GROUP BY d.matchday_number, t.team_id
+    ),
+    cumulative AS (
+        SELECT p.matchday_number, p.team_id,
+               sum(p.played) OVER w AS played,
+               sum(p.win)    OVER w AS win,
+               sum(p.draw)   OVER w AS draw,
+               sum(p.loss)   OVER w AS loss,
+               sum(p.gf)     OVER w AS gf,
+               sum(p.ga)     OVER w AS ga
+        FROM per_matchday p
+        WINDOW w AS (PARTITION BY p.team_id ORDER BY p.matchday_number)
+    ),
+    ranked AS (
+        -- Desempate final por nombre, igual que la tabla que calcula la API.
+        SELECT c.*,
+               3 * c.win + c.draw AS points,
+               row_number() OVER (
+                   PARTITION BY c.matchday_number
+                   ORDER BY 3 * c.win + c.draw DESC, c.gf - c.ga DESC, c.gf DESC,
+                            t.team_name, c.team_id
+               ) AS pos
+        FROM cumulative c
+        JOIN reference.team t ON t.team_id = c.team_id
+    ),
+    upserted AS (
+        INSERT INTO core.standings AS s (
+            season_id, matchday_number, team_id,
+            played, win, draw, loss, gf, ga, points, "position"
+        )
+        SELECT p_season_id, k.matchday_number, k.team_id,
+               k.played, k.win, k.draw, k.loss, k.gf, k.ga, k.points, k.pos
+        FROM ranked k
+        WHERE k.matchday_number >= p_from_matchday
+        ORDER BY k.matchday_number, k.team_id
+        ON CONFLICT (season_id, matchday_number, team_id) DO UPDATE
+        SET played     = EXCLUDED.played,
+            win        = EXCLUDED.win,
+            draw       = EXCLUDED.draw,
+            loss       = EXCLUDED.loss,
+            gf         = EXCLUDED.gf,
+            ga         = EXCLUDED.ga,
+            points     = EXCLUDED.points,
+            "position" = EXCLUDED."position",
+            updated_at = now()
+        WHERE (s.played, s.win, s.draw, s.loss, s.gf, s.ga, s.points, s."position")
+              IS DISTINCT FROM
+              (EXCLUDED.played, EXCLUDED.win, EXCLUDED.draw, EXCLUDED.loss,
+               EXCLUDED.gf, EXCLUDED.ga, EXCLUDED.points, EXCLUDED."position")
+        RETURNING (s.xmax = 0) AS is_new
+    )
+    SELECT (count(*) FILTER (WHERE u.is_new))::integer,
+           (count(*) FILTER (WHERE NOT u.is_new))::integer
+    FROM upserted u;
+END;
+$$;
+
+
+--
+-- Name: player_season_stats; Type: TABLE; Schema: core; Owner: -
+--
+-- Agregado por jugador y temporada de core.basic_stats y stats.<rol>_stats
+-- (líderes y perfiles leen O(jugadores) en vez de O(jugador-partido)).
+-- role_totals suma, por nombre de columna, las estadísticas numéricas de
+-- las tablas por rol. Lo mantiene core.refresh_player_season_stats().
+--
+
+CREATE TABLE core.player_season_stats (
+    season_id smallint NOT NULL,
+    player_id integer NOT NULL,
+    matches smallint NOT NULL,
+    appearances smallint NOT NULL,
+    minutes integer NOT NULL,
+    goals smallint NOT NULL,
+    assists smallint NOT NULL,
+    goalkeeper_saves smallint NOT NULL,
+    goals_conceded smallint NOT NULL,
+    role_totals jsonb DEFAULT '{}'::jsonb NOT NULL,
+    updated_at timestamp with time zone DEFAULT now() NOT NULL,
+    CONSTRAINT player_season_stats_pkey PRIMARY KEY (season_id, player_id),
+    CONSTRAINT player_season_stats_season_fk FOREIGN KEY (season_id) REFERENCES core.season(season_id) ON DELETE CASCADE,
+    CONSTRAINT player_season_stats_player_fk FOREIGN KEY (player_id) REFERENCES reference.player(player_id) ON DELETE CASCADE
+);
+
+
+--
+-- Name: function: refresh_player_season_stats; Type: FUNCTION; Schema: core;
+--
+-- Recalcula core.player_season_stats de una temporada para p_player_ids
+-- (NULL = todos: reconstrucción completa). Idempotente: solo reescribe
+-- filas que cambian y borra las de jugadores que ya no tienen stats.
+--
+
+CREATE OR REPLACE FUNCTION core.refresh_player_season_stats(
+    p_season_id smallint,
+    p_player_ids integer[] DEFAULT NULL
+)
+RETURNS TABLE (inserted integer, updated integer)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('core.player_season_stats'), p_season_id);
+
+    DELETE FROM core.player_season_stats ps
+    WHERE ps.season_id = p_season_id
+      AND (p_player_ids IS NULL OR ps.player_id = ANY(p_player_ids))
+      AND NOT EXISTS (
+          SELECT 1
+          FROM core.basic_stats bs
+          JOIN core."match" m ON m.match_id = bs.match_id
+          JOIN core.matchday md ON md.matchday_id = m.matchday_id
+          WHERE md.season_id = p_season_id
+            AND bs.player_id = ps.player_id
+      );
+
+    RETURN QUERY
+    WITH season_rows AS (
+        SELECT bs.basic_stats_id, bs.player_id, bs.minutes, bs.goals, bs.assists
+        FROM core.basic_stats bs
+        JOIN core."match" m ON m.match_id = bs.match_id
+        JOIN core.matchday md ON md.matchday_id = m.matchday_id
+        WHERE md.season_id = p_season_id
+          AND (p_player_ids IS NULL OR bs.player_id = ANY(p_player_ids))
+    ),
+    basic AS (
+        SELECT sr.player_id,
+               count(*)                                           AS matches,
+               count(*) FILTER (WHERE COALESCE(sr.minutes, 0) > 0) AS appearances,
+               COALESCE(sum(sr.minutes), 0)                       AS minutes,
+               COALESCE(sum(sr.goals), 0)                         AS goals,
+               COALESCE(sum(sr.assists), 0)                       AS assists
+        FROM season_rows sr
+        GROUP BY sr.player_id
+    ),
+    keeper AS (
+        SELECT sr.player_id,
+               COALESCE(sum(gk.goalkeeper_saves), 0) AS goalkeeper_saves,
+               COALESCE(sum(gk.goals_conceded), 0)   AS goals_conceded
+        FROM season_rows sr
+        JOIN stats.goalkeeper_stats gk ON gk.basic_stats_id = sr.basic_stats_id
+        GROUP BY sr.player_id
+    ),
+    role_values AS (
+        -- Genérico sobre las columnas de cada tabla por rol, para no
+        -- duplicar aquí el mapeo de estadísticas.
+        SELECT sr.player_id, kv.key, sum((kv.value #>> '{}')::numeric) AS total
+        FROM season_rows sr
+        CROSS JOIN LATERAL (
+            SELECT to_jsonb(g) AS j FROM stats.goalkeeper_stats g WHERE g.basic_stats_id = sr.basic_stats_id
+            UNION ALL
+            SELECT to_jsonb(d) FROM stats.defender_stats d WHERE d.basic_stats_id = sr.basic_stats_id
+            UNION ALL
+            SELECT to_jsonb(mf) FROM stats.midfielder_stats mf WHERE mf.basic_stats_id = sr.basic_stats_id
+            UNION ALL
+            SELECT to_jsonb(fw) FROM stats.forward_stats fw WHERE fw.basic_stats_id = sr.basic_stats_id
+        ) AS r
+        CROSS JOIN LATERAL jsonb_each(r.j - 'basic_stats_id') AS kv
+        WHERE jsonb_typeof(kv.value) = 'number'
+        GROUP BY sr.player_id, kv.key
+    ),
+    roles AS (
+        SELECT rv.player_id, jsonb_object_agg(rv.key, rv.total ORDER BY rv.key) AS role_totals
+        FROM role_values rv
+        GROUP BY rv.player_id
+    ),
+    upserted AS (
+        INSERT INTO core.player_season_stats AS ps (
+            season_id, player_id, matches, appearances, minutes, goals, assists,
+            goalkeeper_saves, goals_conceded, role_totals
+        )
+        SELECT p_season_id, b.player_id, b.matches, b.appearances, b.minutes,
+               b.goals, b.assists,
+               COALESCE(k.goalkeeper_saves, 0), COALESCE(k.goals_conceded, 0),
+               COALESCE(r.role_totals, '{}'::jsonb)
+        FROM basic b
+        LEFT JOIN keeper k ON k.player_id = b.player_id
+        LEFT JOIN roles r ON r.player_id = b.player_id
+        ORDER BY b.player_id
+        ON CONFLICT (season_id, player_id) DO UPDATE
+        SET matches          = EXCLUDED.matches,
+            appearances      = EXCLUDED.appearances,
+            minutes          = EXCLUDED.minutes,
+            goals            = EXCLUDED.goals,
+            assists          = EXCLUDED.assists,
+            goalkeeper_saves = EXCLUDED.goalkeeper_saves,
+            goals_conceded   = EXCLUDED.goals_conceded,
+            role_totals      = EXCLUDED.role_totals,
+            updated_at       = now()
+        WHERE (ps.matches, ps.appearances, ps.minutes, ps.goals, ps.assists,
+               ps.goalkeeper_saves, ps.goals_conceded, ps.role_totals)
+              IS DISTINCT FROM
+              (EXCLUDED.matches, EXCLUDED.appearances, EXCLUDED.minutes,
+               EXCLUDED.goals, EXCLUDED.assists, EXCLUDED.goalkeeper_saves,
+               EXCLUDED.goals_conceded, EXCLUDED.role_totals)
+        RETURNING (ps.xmax = 0) AS is_new
+    )
+    SELECT (count(*) FILTER (WHERE u.is_new))::integer,
+           (count(*) FILTER (WHERE NOT u.is_new))::integer
+    FROM upserted u;
+END;
+$$;
+
+
+--
+-- Name: season_version; Type: TABLE; Schema: core; Owner: -
+--
+-- Versión de los datos de cada temporada. La sube core.bump_season_version()
+-- en la misma transacción que carga o corrige datos (ETL y pipeline), así
+-- la API la expone como ETag y responde 304 sin repetir las consultas.
+--
+
+CREATE TABLE core.season_version (
+    season_id smallint NOT NULL,
+    version bigint NOT NULL DEFAULT 1,
+    updated_at timestamp with time zone NOT NULL DEFAULT now(),
+    CONSTRAINT season_version_pkey PRIMARY KEY (season_id),
+    CONSTRAINT season_version_season_fk FOREIGN KEY (season_id) REFERENCES core.season(season_id) ON DELETE CASCADE
+);
+
+
+--
+-- Name: function: bump_season_version; Type: FUNCTION; Schema: core;
+--
+-- Sube la versión de una temporada y devuelve la nueva. El lock de fila
+-- del upsert serializa cargas concurrentes de la misma temporada; la nueva
+-- versión se ve recién al hacer commit, junto con los datos.
+--
+
+CREATE OR REPLACE FUNCTION core.bump_season_version(p_season_id smallint)
+RETURNS bigint
+LANGUAGE sql
+AS $$
+    INSERT INTO core.season_version AS sv (season_id)
+    VALUES (p_season_id)
+    ON CONFLICT (season_id) DO UPDATE
+        SET version = sv.version + 1,
+            updated_at = now()
+    RETURNING sv.version;
+$$;
+
+
 --
 -- Name: raw.match; Type: TABLE; Schema: raw; Owner: -
 --
@@ -1103,21 +1434,73 @@ CREATE TABLE raw.player_match (
 );
 
 
+--
+-- Name: raw.stat_name; Type: TABLE; Schema: raw; Owner: -
+--
+-- Diccionario de nombres de estadística ("Goles esperados", ...): la tabla
+-- de hechos crudos guarda solo el smallint. Solo se agregan filas; los ids
+-- nunca cambian, así que los lectores pueden cachearlo en memoria.
+
+CREATE TABLE raw.stat_name (
+    stat_name_id smallint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    stat_name    text NOT NULL UNIQUE
+);
+
+
+--
+-- Name: raw.stat_name_id; Type: FUNCTION; Schema: raw; Owner: -
+--
+-- Devuelve el id de un nombre, creándolo si hace falta (para escritores
+-- que resuelven de a uno).
+
+CREATE FUNCTION raw.stat_name_id(p_stat_name text)
+RETURNS smallint
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_id smallint;
+BEGIN
+    SELECT stat_name_id INTO v_id FROM raw.stat_name WHERE stat_name = p_stat_name;
+    IF v_id IS NULL THEN
+        INSERT INTO raw.stat_name (stat_name)
+        VALUES (p_stat_name)
+        ON CONFLICT (stat_name) DO NOTHING
+        RETURNING stat_name_id INTO v_id;
+        IF v_id IS NULL THEN
+            SELECT stat_name_id INTO v_id FROM raw.stat_name WHERE stat_name = p_stat_name;
+        END IF;
+    END IF;
+    RETURN v_id;
+END;
+$$;
+
+
 --
 -- Name: raw.player_match_stat; Type: TABLE; Schema: raw; Owner: -
 --
+-- Particionada por rangos de match_id (ver raw.ensure_player_match_stat_partition):
+-- los match_id de la fuente crecen con el tiempo, así que cada partición
+-- agrupa aproximadamente una temporada y los backfills/VACUUM de una
+-- temporada solo tocan sus particiones. La capa raw no guarda
+-- competición/temporada en esta tabla, por eso la clave es match_id.
 
 CREATE TABLE raw.player_match_stat (
     match_id integer NOT NULL,
     player_id integer NOT NULL,
-    stat_name text NOT NULL,
+    stat_name_id smallint NOT NULL REFERENCES raw.stat_name (stat_name_id),
     raw_value text NOT NULL,
     value_numeric double precision,
     value_ratio_num integer,
     value_ratio_den integer,
     CONSTRAINT raw_player_match_stat_value_ratio_den_check CHECK ((value_ratio_den >= 0)),
     CONSTRAINT raw_player_match_stat_value_ratio_num_check CHECK ((value_ratio_num >= 0))
-);
+)
+PARTITION BY RANGE (match_id);
+
+-- Red de seguridad: filas cuyo rango aún no tiene partición. La función de
+-- abajo las mueve a su partición al crearla.
+CREATE TABLE raw.player_match_stat_default
+    PARTITION OF raw.player_match_stat DEFAULT;
 
 
 --
@@ -1132,8 +1515,8 @@ ALTER TABLE ONLY raw.player_match
 -- Name: raw.player_match_stat player_match_stat_pkey; Type: CONSTRAINT; Schema: raw; Owner: -
 --
 
-ALTER TABLE ONLY raw.player_match_stat
-    ADD CONSTRAINT player_match_stat_pkey PRIMARY KEY (match_id, player_id, stat_name);
+ALTER TABLE raw.player_match_stat
+    ADD CONSTRAINT player_match_stat_pkey PRIMARY KEY (match_id, player_id, stat_name_id);
 
 
 --
@@ -1152,12 +1535,8 @@ CREATE INDEX player_match_match_id_idx
     ON raw.player_match (match_id);
 
 
---
--- Name: raw.player_match_stat match_id_idx; Type: INDEX; Schema: raw; Owner: -
---
-
-CREATE INDEX player_match_stat_match_id_idx
-    ON raw.player_match_stat (match_id);
+-- raw.player_match_stat no lleva índice propio sobre match_id: la PK
+-- (match_id, player_id, stat_name_id) ya lo cubre en cada partición.
 
 
 --
@@ -1176,12 +1555,127 @@ CREATE INDEX player_match_stat_player_id_idx
     ON raw.player_match_stat (player_id);
 
 
+-- Sin índice sobre stat_name_id: ninguna lectura filtra solo por
+-- estadística (el ETL siempre acota por match_id).
+
+
 --
--- Name: raw.player_match_stat player_match_stat_stat_name_idx; Type: INDEX; Schema: raw; Owner: -
+-- Name: raw.player_match_stat_named; Type: VIEW; Schema: raw; Owner: -
 --
+-- raw.player_match_stat con el nombre de la estadística en texto, para
+-- consultas ad hoc y para escritores que todavía insertan nombres: el
+-- INSERT sobre la vista resuelve (o crea) el id en raw.stat_name.
+
+CREATE VIEW raw.player_match_stat_named AS
+SELECT s.match_id,
+       s.player_id,
+       n.stat_name,
+       s.raw_value,
+       s.value_numeric,
+       s.value_ratio_num,
+       s.value_ratio_den
+FROM raw.player_match_stat s
+JOIN raw.stat_name n ON n.stat_name_id = s.stat_name_id;
+
+CREATE FUNCTION raw.insert_player_match_stat_named()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO raw.player_match_stat (
+        match_id, player_id, stat_name_id,
+        raw_value, value_numeric, value_ratio_num, value_ratio_den
+    )
+    VALUES (
+        NEW.match_id, NEW.player_id, raw.stat_name_id(NEW.stat_name),
+        NEW.raw_value, NEW.value_numeric, NEW.value_ratio_num, NEW.value_ratio_den
+    );
+    RETURN NEW;
+END;
+$$;
+
+CREATE TRIGGER trg_player_match_stat_named_insert
+    INSTEAD OF INSERT ON raw.player_match_stat_named
+    FOR EACH ROW
+    EXECUTE FUNCTION raw.insert_player_match_stat_named();
+
+
+--
+-- Name: raw.ensure_player_match_stat_partition; Type: FUNCTION; Schema: raw; Owner: -
+--
+-- Crea (si falta) la partición de raw.player_match_stat que cubre
+-- p_match_id: rangos fijos de 100000 match_id, tabla
+-- raw.player_match_stat_p<desde>. Si la partición DEFAULT ya tenía filas de
+-- ese rango, se mueven antes de adjuntarla. Idempotente y segura ante
+-- llamadas concurrentes.
+
+CREATE FUNCTION raw.ensure_player_match_stat_partition(p_match_id integer)
+RETURNS text
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_width constant integer := 100000;
+    v_from  integer := (p_match_id / v_width) * v_width;
+    v_to    integer := v_from + v_width;
+    v_name  text    := format('player_match_stat_p%s', v_from);
+BEGIN
+    IF to_regclass(format('raw.%I', v_name)) IS NOT NULL THEN
+        RETURN v_name;
+    END IF;
+
+    -- Serializa a los creadores del mismo rango hasta el commit.
+    PERFORM pg_advisory_xact_lock(hashtext('raw.player_match_stat'), v_from);
+    IF to_regclass(format('raw.%I', v_name)) IS NOT NULL THEN
+        RETURN v_name;
+    END IF;
+
+    EXECUTE format(
+        'CREATE TABLE raw.%I (LIKE raw.player_match_stat INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+        v_name
+    );
+    EXECUTE format(
+        'WITH moved AS (
+             DELETE FROM raw.player_match_stat_default
+             WHERE match_id >= %s AND match_id < %s
+             RETURNING *
+         )
+         INSERT INTO raw.%I SELECT * FROM moved',
+        v_from, v_to, v_name
+    );
+    -- El CHECK equivalente al rango evita que ATTACH vuelva a escanear la tabla.
+    EXECUTE format(
+        'ALTER TABLE raw.%I ADD CONSTRAINT %I CHECK (match_id >= %s AND match_id < %s)',
+        v_name, v_name || '_range_check', v_from, v_to
+    );
+    EXECUTE format(
+        'ALTER TABLE raw.player_match_stat ATTACH PARTITION raw.%I FOR VALUES FROM (%s) TO (%s)',
+        v_name, v_from, v_to
+    );
+    RETURN v_name;
+END;
+$$;
+
+
+--
+-- Name: raw.match trg_raw_match_stat_partition; Type: TRIGGER; Schema: raw; Owner: -
+--
+-- La ingesta escribe raw.match antes que sus estadísticas, así que la
+-- partición ya existe cuando llegan las filas de raw.player_match_stat.
+
+CREATE FUNCTION raw.ensure_stat_partition_for_match()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM raw.ensure_player_match_stat_partition(NEW.match_id);
+    RETURN NEW;
+END;
+$$;
 
-CREATE INDEX player_match_stat_stat_name_idx
-    ON raw.player_match_stat (stat_name);
+CREATE TRIGGER trg_raw_match_stat_partition
+    AFTER INSERT ON raw."match"
+    FOR EACH ROW
+    EXECUTE FUNCTION raw.ensure_stat_partition_for_match();
 
 
 -- =========================================================================
@@ -221,3 +221,137 @@ BEGIN
         last_updated_at     = now();
 END;
 $$;
+
+-- ==========================
+-- Cola de partidos pendientes
+-- ==========================
+-- Una fila por partido crudo. Se llena desde un trigger sobre raw.match,
+-- de modo que el descubrimiento es un index scan acotado por el batch
+-- (en vez de un anti-join raw.match vs core.match en cada iteración).
+-- Cada partido lleva su propio estado de reintentos/backoff.
+
+CREATE TABLE etl.pending_match (
+    match_id           integer PRIMARY KEY,
+    status             etl.match_status_enum NOT NULL DEFAULT 'pending',
+    attempts           integer NOT NULL DEFAULT 0,
+    next_attempt_at    timestamptz NOT NULL DEFAULT now(),
+    last_error_code    text,
+    last_error_message text,
+    enqueued_at        timestamptz NOT NULL DEFAULT now(),
+    updated_at         timestamptz NOT NULL DEFAULT now()
+);
+
+-- Solo las filas 'pending' viven en el índice: el resto (success/error)
+-- no cuesta nada en el camino caliente del descubrimiento.
+CREATE INDEX idx_etl_pending_match_due
+    ON etl.pending_match (next_attempt_at, match_id)
+    WHERE status = 'pending';
+
+CREATE OR REPLACE FUNCTION etl.enqueue_raw_match()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO etl.pending_match (match_id)
+    VALUES (NEW.match_id)
+    ON CONFLICT (match_id)
+    DO UPDATE
+    SET
+        status             = 'pending',
+        attempts           = 0,
+        next_attempt_at    = now(),
+        last_error_code    = NULL,
+        last_error_message = NULL,
+        enqueued_at        = now(),
+        updated_at         = now();
+    -- Despierta al daemon del ETL (etl.daemon). Se entrega al hacer commit
+    -- y Postgres colapsa payloads repetidos dentro de la misma transacción.
+    PERFORM pg_notify('etl_pending_match', NEW.match_id::text);
+    RETURN NEW;
+END;
+$$;
+
+CREATE TRIGGER trg_raw_match_enqueue
+    AFTER INSERT ON raw."match"
+    FOR EACH ROW
+    EXECUTE FUNCTION etl.enqueue_raw_match();
+
+-- Dead-letter: partidos que agotaron sus reintentos o fallaron con un
+-- error permanente (status = 'error'). No se descubren más hasta que se
+-- reencolan (etl.discovery.discovery.requeue_dead_letters) o el partido se
+-- vuelve a ingerir en raw.match.
+CREATE VIEW etl.v_dead_letter AS
+SELECT match_id,
+       attempts,
+       last_error_code,
+       last_error_message,
+       enqueued_at,
+       updated_at AS dead_lettered_at
+FROM etl.pending_match
+WHERE status = 'error';
+
+-- Migración: encola los partidos crudos que aún no llegaron a core.match.
+INSERT INTO etl.pending_match (match_id)
+SELECT rm.match_id
+FROM raw."match" AS rm
+LEFT JOIN core."match" AS m
+  ON m.match_id = rm.match_id
+WHERE m.match_id IS NULL
+ON CONFLICT (match_id) DO NOTHING;
+
+-- ==========================
+-- Métricas por run
+-- ==========================
+-- Formato largo: una fila por (run, métrica, etiqueta). La etiqueta es la
+-- etapa ('dimensions', 'facts', ...) o la tabla destino ('core.match', ...)
+-- según la métrica; '' cuando no aplica.
+
+CREATE TABLE etl.run_metric (
+    run_id      integer NOT NULL REFERENCES etl.run(run_id) ON DELETE CASCADE,
+    metric      text NOT NULL,
+    label       text NOT NULL DEFAULT '',
+    value       double precision NOT NULL,
+    recorded_at timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (run_id, metric, label)
+);
+
+CREATE INDEX idx_etl_run_metric_metric
+    ON etl.run_metric (metric, label, run_id);
+
+-- ==========================
+-- Backfills
+-- ==========================
+-- Reproceso de historia (python -m etl.backfill): el alcance pedido se
+-- parte en shards de rangos contiguos de match_id que se procesan en
+-- paralelo. Cada shard lleva su propio progreso (last_match_id) para poder
+-- retomarse; no se toca etl.checkpoint ni etl.pending_match.
+
+CREATE TABLE etl.backfill (
+    backfill_id  integer GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    created_at   timestamptz NOT NULL DEFAULT now(),
+    finished_at  timestamptz,
+    status       etl.run_status_enum NOT NULL DEFAULT 'running',
+    scope        jsonb NOT NULL,
+    note         text
+);
+
+CREATE TABLE etl.backfill_shard (
+    backfill_id    integer NOT NULL REFERENCES etl.backfill(backfill_id) ON DELETE CASCADE,
+    shard_no       integer NOT NULL,
+    match_id_from  integer NOT NULL,
+    match_id_to    integer NOT NULL,
+    matches_total  integer NOT NULL,
+    matches_ok     integer NOT NULL DEFAULT 0,
+    matches_error  integer NOT NULL DEFAULT 0,
+    last_match_id  integer,
+    status         etl.match_status_enum NOT NULL DEFAULT 'pending',
+    run_id         integer REFERENCES etl.run(run_id) ON DELETE SET NULL,
+    started_at     timestamptz,
+    finished_at    timestamptz,
+    updated_at     timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (backfill_id, shard_no),
+    CONSTRAINT backfill_shard_range_check CHECK (match_id_from <= match_id_to)
+);
+
+CREATE INDEX idx_etl_backfill_shard_status
+    ON etl.backfill_shard (backfill_id, status);
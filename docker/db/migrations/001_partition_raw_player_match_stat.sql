@@ -0,0 +1,131 @@
+-- =========================================================================
+-- Migración: raw.player_match_stat pasa a estar particionada por rangos de
+-- match_id (ver docker/db/init/02_domain_futbol.sql).
+--
+-- Para bases creadas antes del cambio. Reescribe la tabla completa en una
+-- sola transacción, así que conviene correrla con la ingesta detenida:
+--
+--   psql "$DB_DSN" -f docker/db/migrations/001_partition_raw_player_match_stat.sql
+-- =========================================================================
+
+BEGIN;
+
+-- 1) Apartar la tabla actual (y los nombres de sus índices).
+ALTER TABLE raw.player_match_stat RENAME TO player_match_stat_legacy;
+ALTER TABLE raw.player_match_stat_legacy
+    RENAME CONSTRAINT player_match_stat_pkey TO player_match_stat_legacy_pkey;
+DROP INDEX IF EXISTS raw.player_match_stat_match_id_idx;
+DROP INDEX IF EXISTS raw.player_match_stat_stat_name_idx;
+DROP INDEX IF EXISTS raw.player_match_stat_player_id_idx;
+
+-- 2) Tabla particionada nueva.
+CREATE TABLE raw.player_match_stat (
+    match_id integer NOT NULL,
+    player_id integer NOT NULL,
+    stat_name text NOT NULL,
+    raw_value text NOT NULL,
+    value_numeric double precision,
+    value_ratio_num integer,
+    value_ratio_den integer,
+    CONSTRAINT raw_player_match_stat_value_ratio_den_check CHECK ((value_ratio_den >= 0)),
+    CONSTRAINT raw_player_match_stat_value_ratio_num_check CHECK ((value_ratio_num >= 0))
+)
+PARTITION BY RANGE (match_id);
+
+CREATE TABLE raw.player_match_stat_default
+    PARTITION OF raw.player_match_stat DEFAULT;
+
+ALTER TABLE raw.player_match_stat
+    ADD CONSTRAINT player_match_stat_pkey PRIMARY KEY (match_id, player_id, stat_name);
+
+CREATE INDEX player_match_stat_player_id_idx
+    ON raw.player_match_stat (player_id);
+
+CREATE OR REPLACE FUNCTION raw.ensure_player_match_stat_partition(p_match_id integer)
+RETURNS text
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_width constant integer := 100000;
+    v_from  integer := (p_match_id / v_width) * v_width;
+    v_to    integer := v_from + v_width;
+    v_name  text    := format('player_match_stat_p%s', v_from);
+BEGIN
+    IF to_regclass(format('raw.%I', v_name)) IS NOT NULL THEN
+        RETURN v_name;
+    END IF;
+
+    -- Serializa a los creadores del mismo rango hasta el commit.
+    PERFORM pg_advisory_xact_lock(hashtext('raw.player_match_stat'), v_from);
+    IF to_regclass(format('raw.%I', v_name)) IS NOT NULL THEN
+        RETURN v_name;
+    END IF;
+
+    EXECUTE format(
+        'CREATE TABLE raw.%I (LIKE raw.player_match_stat INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+        v_name
+    );
+    EXECUTE format(
+        'WITH moved AS (
+             DELETE FROM raw.player_match_stat_default
+             WHERE match_id >= %s AND match_id < %s
+             RETURNING *
+         )
+         INSERT INTO raw.%I SELECT * FROM moved',
+        v_from, v_to, v_name
+    );
+    -- El CHECK equivalente al rango evita que ATTACH vuelva a escanear la tabla.
+    EXECUTE format(
+        'ALTER TABLE raw.%I ADD CONSTRAINT %I CHECK (match_id >= %s AND match_id < %s)',
+        v_name, v_name || '_range_check', v_from, v_to
+    );
+    EXECUTE format(
+        'ALTER TABLE raw.player_match_stat ATTACH PARTITION raw.%I FOR VALUES FROM (%s) TO (%s)',
+        v_name, v_from, v_to
+    );
+    RETURN v_name;
+END;
+$$;
+
+
+--
+-- Name: raw.match trg_raw_match_stat_partition; Type: TRIGGER; Schema: raw; Owner: -
+--
+-- La ingesta escribe raw.match antes que sus estadísticas, así que la
+-- partición ya existe cuando llegan las filas de raw.player_match_stat.
+
+CREATE OR REPLACE FUNCTION raw.ensure_stat_partition_for_match()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM raw.ensure_player_match_stat_partition(NEW.match_id);
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_raw_match_stat_partition ON raw."match";
+CREATE TRIGGER trg_raw_match_stat_partition
+    AFTER INSERT ON raw."match"
+    FOR EACH ROW
+    EXECUTE FUNCTION raw.ensure_stat_partition_for_match();
+
+-- 3) Una partición por rango con datos, y copia (el router reparte las filas).
+SELECT raw.ensure_player_match_stat_partition(bucket * 100000)
+FROM (
+    SELECT DISTINCT match_id / 100000 AS bucket
+    FROM raw.player_match_stat_legacy
+) AS b
+ORDER BY bucket;
+
+INSERT INTO raw.player_match_stat
+SELECT match_id, player_id, stat_name,
+       raw_value, value_numeric,
+       value_ratio_num, value_ratio_den
+FROM raw.player_match_stat_legacy;
+
+DROP TABLE raw.player_match_stat_legacy;
+
+COMMIT;
+
+ANALYZE raw.player_match_stat;
@@ -0,0 +1,105 @@
+-- =========================================================================
+-- Migración: raw.player_match_stat guarda stat_name_id (smallint, FK a
+-- raw.stat_name) en vez del nombre en texto (ver
+-- docker/db/init/02_domain_futbol.sql). Requiere 001.
+--
+-- Reescribe todas las filas; correrla con la ingesta detenida. Los
+-- escritores que insertan nombres deben pasar a raw.player_match_stat_named
+-- (o resolver ids con raw.stat_name_id()).
+--
+--   psql "$DB_DSN" -f docker/db/migrations/002_dictionary_encode_stat_names.sql
+-- =========================================================================
+
+BEGIN;
+
+CREATE TABLE raw.stat_name (
+    stat_name_id smallint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    stat_name    text NOT NULL UNIQUE
+);
+
+CREATE OR REPLACE FUNCTION raw.stat_name_id(p_stat_name text)
+RETURNS smallint
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_id smallint;
+BEGIN
+    SELECT stat_name_id INTO v_id FROM raw.stat_name WHERE stat_name = p_stat_name;
+    IF v_id IS NULL THEN
+        INSERT INTO raw.stat_name (stat_name)
+        VALUES (p_stat_name)
+        ON CONFLICT (stat_name) DO NOTHING
+        RETURNING stat_name_id INTO v_id;
+        IF v_id IS NULL THEN
+            SELECT stat_name_id INTO v_id FROM raw.stat_name WHERE stat_name = p_stat_name;
+        END IF;
+    END IF;
+    RETURN v_id;
+END;
+$$;
+
+-- 1) Diccionario con los nombres existentes.
+INSERT INTO raw.stat_name (stat_name)
+SELECT DISTINCT stat_name
+FROM raw.player_match_stat
+ORDER BY stat_name;
+
+-- 2) Columna nueva, poblada desde el diccionario.
+ALTER TABLE raw.player_match_stat ADD COLUMN stat_name_id smallint;
+
+UPDATE raw.player_match_stat s
+SET stat_name_id = n.stat_name_id
+FROM raw.stat_name n
+WHERE n.stat_name = s.stat_name;
+
+ALTER TABLE raw.player_match_stat ALTER COLUMN stat_name_id SET NOT NULL;
+ALTER TABLE raw.player_match_stat
+    ADD CONSTRAINT player_match_stat_stat_name_id_fkey
+    FOREIGN KEY (stat_name_id) REFERENCES raw.stat_name (stat_name_id);
+
+-- 3) PK sobre el id y fuera la columna de texto.
+ALTER TABLE raw.player_match_stat DROP CONSTRAINT player_match_stat_pkey;
+ALTER TABLE raw.player_match_stat
+    ADD CONSTRAINT player_match_stat_pkey PRIMARY KEY (match_id, player_id, stat_name_id);
+DROP INDEX IF EXISTS raw.player_match_stat_stat_name_idx;
+ALTER TABLE raw.player_match_stat DROP COLUMN stat_name;
+
+-- 4) Vista con nombres + INSERT compatible para escritores existentes.
+CREATE VIEW raw.player_match_stat_named AS
+SELECT s.match_id,
+       s.player_id,
+       n.stat_name,
+       s.raw_value,
+       s.value_numeric,
+       s.value_ratio_num,
+       s.value_ratio_den
+FROM raw.player_match_stat s
+JOIN raw.stat_name n ON n.stat_name_id = s.stat_name_id;
+
+CREATE OR REPLACE FUNCTION raw.insert_player_match_stat_named()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO raw.player_match_stat (
+        match_id, player_id, stat_name_id,
+        raw_value, value_numeric, value_ratio_num, value_ratio_den
+    )
+    VALUES (
+        NEW.match_id, NEW.player_id, raw.stat_name_id(NEW.stat_name),
+        NEW.raw_value, NEW.value_numeric, NEW.value_ratio_num, NEW.value_ratio_den
+    );
+    RETURN NEW;
+END;
+$$;
+
+CREATE TRIGGER trg_player_match_stat_named_insert
+    INSTEAD OF INSERT ON raw.player_match_stat_named
+    FOR EACH ROW
+    EXECUTE FUNCTION raw.insert_player_match_stat_named();
+
+COMMIT;
+
+-- DROP COLUMN solo marca la columna; VACUUM FULL por partición (o
+-- pg_repack) recupera el espacio del texto.
+ANALYZE raw.player_match_stat;
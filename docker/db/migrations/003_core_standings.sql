@@ -0,0 +1,166 @@
+-- =========================================================================
+-- Migración: tabla de posiciones incremental core.standings y su función
+-- de refresco core.refresh_standings() (ver
+-- docker/db/init/02_domain_futbol.sql).
+--
+-- Crea la tabla y la llena una vez para todas las temporadas existentes;
+-- desde ahí la mantiene el ETL al cargar partidos.
+--
+--   psql "$DB_DSN" -f docker/db/migrations/003_core_standings.sql
+-- =========================================================================
+
+BEGIN;
+
+--
+-- Name: standings; Type: TABLE; Schema: core; Owner: -
+--
+-- Tabla de posiciones acumulada por temporada y jornada (puntos 3/1/0):
+-- la fila (season_id, matchday_number, team_id) es la tabla "hasta esa
+-- jornada". La mantiene core.refresh_standings(), que el ETL llama en la
+-- misma transacción en que carga los partidos.
+--
+
+CREATE TABLE core.standings (
+    season_id smallint NOT NULL,
+    matchday_number smallint NOT NULL,
+    team_id integer NOT NULL,
+    played smallint NOT NULL,
+    win smallint NOT NULL,
+    draw smallint NOT NULL,
+    loss smallint NOT NULL,
+    gf smallint NOT NULL,
+    ga smallint NOT NULL,
+    points smallint NOT NULL,
+    "position" smallint NOT NULL,
+    updated_at timestamp with time zone DEFAULT now() NOT NULL,
+    CONSTRAINT standings_pkey PRIMARY KEY (season_id, matchday_number, team_id),
+    CONSTRAINT standings_season_fk FOREIGN KEY (season_id) REFERENCES core.season(season_id) ON DELETE CASCADE,
+    CONSTRAINT standings_team_fk FOREIGN KEY (team_id) REFERENCES reference.team(team_id) ON DELETE CASCADE
+);
+
+
+--
+-- Name: function: refresh_standings; Type: FUNCTION; Schema: core;
+--
+-- Recalcula core.standings de una temporada desde p_from_matchday en
+-- adelante (las jornadas anteriores no dependen de los partidos
+-- posteriores). Idempotente: solo reescribe filas que cambian.
+--
+
+CREATE OR REPLACE FUNCTION core.refresh_standings(
+    p_season_id smallint,
+    p_from_matchday smallint DEFAULT 1
+)
+RETURNS TABLE (inserted integer, updated integer)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- Un refresco por temporada a la vez: el que espera, al tomar el lock,
+    -- ya ve (READ COMMITTED) los partidos que confirmó el anterior.
+    PERFORM pg_advisory_xact_lock(hashtext('core.standings'), p_season_id);
+
+    RETURN QUERY
+    WITH results AS (
+        SELECT md.matchday_number, m.local_team_id AS team_id,
+               m.local_score AS gf, m.away_score AS ga
+        FROM core."match" m
+        JOIN core.matchday md ON md.matchday_id = m.matchday_id
+        WHERE md.season_id = p_season_id
+          AND m.local_score IS NOT NULL
+          AND m.away_score IS NOT NULL
+        UNION ALL
+        SELECT md.matchday_number, m.away_team_id,
+               m.away_score, m.local_score
+        FROM core."match" m
+        JOIN core.matchday md ON md.matchday_id = m.matchday_id
+        WHERE md.season_id = p_season_id
+          AND m.local_score IS NOT NULL
+          AND m.away_score IS NOT NULL
+    ),
+    teams AS (
+        SELECT st.team_id FROM registry.season_team st WHERE st.season_id = p_season_id
+        UNION
+        SELECT r.team_id FROM results r
+    ),
+    matchdays AS (
+        SELECT DISTINCT md.matchday_number
+        FROM core.matchday md
+        WHERE md.season_id = p_season_id
+    ),
+    per_matchday AS (
+        -- Una fila por equipo y jornada, aunque el equipo no haya jugado.
+        SELECT d.matchday_number, t.team_id,
+               count(r.gf)                         AS played,
+               count(*) FILTER (WHERE r.gf > r.ga) AS win,
+               count(*) FILTER (WHERE r.gf = r.ga) AS draw,
+               count(*) FILTER (WHERE r.gf < r.ga) AS loss,
+               COALESCE(sum(r.gf), 0)              AS gf,
+               COALESCE(sum(r.ga), 0)              AS ga
+        FROM matchdays d
+        CROSS JOIN teams t
+        LEFT JOIN results r
+          ON r.matchday_number = d.matchday_number
+         AND r.team_id = t.team_id
+        GROUP BY d.matchday_number, t.team_id
+    ),
+    cumulative AS (
+        SELECT p.matchday_number, p.team_id,
+               sum(p.played) OVER w AS played,
+               sum(p.win)    OVER w AS win,
+               sum(p.draw)   OVER w AS draw,
+               sum(p.loss)   OVER w AS loss,
+               sum(p.gf)     OVER w AS gf,
+               sum(p.ga)     OVER w AS ga
+        FROM per_matchday p
+        WINDOW w AS (PARTITION BY p.team_id ORDER BY p.matchday_number)
+    ),
+    ranked AS (
+        -- Desempate final por nombre, igual que la tabla que calcula la API.
+        SELECT c.*,
+               3 * c.win + c.draw AS points,
+               row_number() OVER (
+                   PARTITION BY c.matchday_number
+                   ORDER BY 3 * c.win + c.draw DESC, c.gf - c.ga DESC, c.gf DESC,
+                            t.team_name, c.team_id
+               ) AS pos
+        FROM cumulative c
+        JOIN reference.team t ON t.team_id = c.team_id
+    ),
+    upserted AS (
+        INSERT INTO core.standings AS s (
+            season_id, matchday_number, team_id,
+            played, win, draw, loss, gf, ga, points, "position"
+        )
+        SELECT p_season_id, k.matchday_number, k.team_id,
+               k.played, k.win, k.draw, k.loss, k.gf, k.ga, k.points, k.pos
+        FROM ranked k
+        WHERE k.matchday_number >= p_from_matchday
+        ORDER BY k.matchday_number, k.team_id
+        ON CONFLICT (season_id, matchday_number, team_id) DO UPDATE
+        SET played     = EXCLUDED.played,
+            win        = EXCLUDED.win,
+            draw       = EXCLUDED.draw,
+            loss       = EXCLUDED.loss,
+            gf         = EXCLUDED.gf,
+            ga         = EXCLUDED.ga,
+            points     = EXCLUDED.points,
+            "position" = EXCLUDED."position",
+            updated_at = now()
+        WHERE (s.played, s.win, s.draw, s.loss, s.gf, s.ga, s.points, s."position")
+              IS DISTINCT FROM
+              (EXCLUDED.played, EXCLUDED.win, EXCLUDED.draw, EXCLUDED.loss,
+               EXCLUDED.gf, EXCLUDED.ga, EXCLUDED.points, EXCLUDED."position")
+        RETURNING (s.xmax = 0) AS is_new
+    )
+    SELECT (count(*) FILTER (WHERE u.is_new))::integer,
+           (count(*) FILTER (WHERE NOT u.is_new))::integer
+    FROM upserted u;
+END;
+$$;
+
+SELECT s.season_id, r.inserted, r.updated
+FROM core.season s
+CROSS JOIN LATERAL core.refresh_standings(s.season_id) r
+ORDER BY s.season_id;
+
+COMMIT;
@@ -0,0 +1,164 @@
+-- =========================================================================
+-- Migración: agregado por jugador y temporada core.player_season_stats y
+-- su función de refresco core.refresh_player_season_stats() (ver
+-- docker/db/init/02_domain_futbol.sql).
+--
+-- Crea la tabla y la llena una vez para todas las temporadas; desde ahí la
+-- mantienen el ETL y los loaders del pipeline. Para reconstruir una
+-- temporada: python -m etl.rebuild_aggregates --season-id <id>
+--
+--   psql "$DB_DSN" -f docker/db/migrations/004_core_player_season_stats.sql
+-- =========================================================================
+
+BEGIN;
+
+--
+-- Name: player_season_stats; Type: TABLE; Schema: core; Owner: -
+--
+-- Agregado por jugador y temporada de core.basic_stats y stats.<rol>_stats
+-- (líderes y perfiles leen O(jugadores) en vez de O(jugador-partido)).
+-- role_totals suma, por nombre de columna, las estadísticas numéricas de
+-- las tablas por rol. Lo mantiene core.refresh_player_season_stats().
+--
+
+CREATE TABLE core.player_season_stats (
+    season_id smallint NOT NULL,
+    player_id integer NOT NULL,
+    matches smallint NOT NULL,
+    appearances smallint NOT NULL,
+    minutes integer NOT NULL,
+    goals smallint NOT NULL,
+    assists smallint NOT NULL,
+    goalkeeper_saves smallint NOT NULL,
+    goals_conceded smallint NOT NULL,
+    role_totals jsonb DEFAULT '{}'::jsonb NOT NULL,
+    updated_at timestamp with time zone DEFAULT now() NOT NULL,
+    CONSTRAINT player_season_stats_pkey PRIMARY KEY (season_id, player_id),
+    CONSTRAINT player_season_stats_season_fk FOREIGN KEY (season_id) REFERENCES core.season(season_id) ON DELETE CASCADE,
+    CONSTRAINT player_season_stats_player_fk FOREIGN KEY (player_id) REFERENCES reference.player(player_id) ON DELETE CASCADE
+);
+
+
+--
+-- Name: function: refresh_player_season_stats; Type: FUNCTION; Schema: core;
+--
+-- Recalcula core.player_season_stats de una temporada para p_player_ids
+-- (NULL = todos: reconstrucción completa). Idempotente: solo reescribe
+-- filas que cambian y borra las de jugadores que ya no tienen stats.
+--
+
+CREATE OR REPLACE FUNCTION core.refresh_player_season_stats(
+    p_season_id smallint,
+    p_player_ids integer[] DEFAULT NULL
+)
+RETURNS TABLE (inserted integer, updated integer)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('core.player_season_stats'), p_season_id);
+
+    DELETE FROM core.player_season_stats ps
+    WHERE ps.season_id = p_season_id
+      AND (p_player_ids IS NULL OR ps.player_id = ANY(p_player_ids))
+      AND NOT EXISTS (
+          SELECT 1
+          FROM core.basic_stats bs
+          JOIN core."match" m ON m.match_id = bs.match_id
+          JOIN core.matchday md ON md.matchday_id = m.matchday_id
+          WHERE md.season_id = p_season_id
+            AND bs.player_id = ps.player_id
+      );
+
+    RETURN QUERY
+    WITH season_rows AS (
+        SELECT bs.basic_stats_id, bs.player_id, bs.minutes, bs.goals, bs.assists
+        FROM core.basic_stats bs
+        JOIN core."match" m ON m.match_id = bs.match_id
+        JOIN core.matchday md ON md.matchday_id = m.matchday_id
+        WHERE md.season_id = p_season_id
+          AND (p_player_ids IS NULL OR bs.player_id = ANY(p_player_ids))
+    ),
+    basic AS (
+        SELECT sr.player_id,
+               count(*)                                           AS matches,
+               count(*) FILTER (WHERE COALESCE(sr.minutes, 0) > 0) AS appearances,
+               COALESCE(sum(sr.minutes), 0)                       AS minutes,
+               COALESCE(sum(sr.goals), 0)                         AS goals,
+               COALESCE(sum(sr.assists), 0)                       AS assists
+        FROM season_rows sr
+        GROUP BY sr.player_id
+    ),
+    keeper AS (
+        SELECT sr.player_id,
+               COALESCE(sum(gk.goalkeeper_saves), 0) AS goalkeeper_saves,
+               COALESCE(sum(gk.goals_conceded), 0)   AS goals_conceded
+        FROM season_rows sr
+        JOIN stats.goalkeeper_stats gk ON gk.basic_stats_id = sr.basic_stats_id
+        GROUP BY sr.player_id
+    ),
+    role_values AS (
+        -- Genérico sobre las columnas de cada tabla por rol, para no
+        -- duplicar aquí el mapeo de estadísticas.
+        SELECT sr.player_id, kv.key, sum((kv.value #>> '{}')::numeric) AS total
+        FROM season_rows sr
+        CROSS JOIN LATERAL (
+            SELECT to_jsonb(g) AS j FROM stats.goalkeeper_stats g WHERE g.basic_stats_id = sr.basic_stats_id
+            UNION ALL
+            SELECT to_jsonb(d) FROM stats.defender_stats d WHERE d.basic_stats_id = sr.basic_stats_id
+            UNION ALL
+            SELECT to_jsonb(mf) FROM stats.midfielder_stats mf WHERE mf.basic_stats_id = sr.basic_stats_id
+            UNION ALL
+            SELECT to_jsonb(fw) FROM stats.forward_stats fw WHERE fw.basic_stats_id = sr.basic_stats_id
+        ) AS r
+        CROSS JOIN LATERAL jsonb_each(r.j - 'basic_stats_id') AS kv
+        WHERE jsonb_typeof(kv.value) = 'number'
+        GROUP BY sr.player_id, kv.key
+    ),
+    roles AS (
+        SELECT rv.player_id, jsonb_object_agg(rv.key, rv.total ORDER BY rv.key) AS role_totals
+        FROM role_values rv
+        GROUP BY rv.player_id
+    ),
+    upserted AS (
+        INSERT INTO core.player_season_stats AS ps (
+            season_id, player_id, matches, appearances, minutes, goals, assists,
+            goalkeeper_saves, goals_conceded, role_totals
+        )
+        SELECT p_season_id, b.player_id, b.matches, b.appearances, b.minutes,
+               b.goals, b.assists,
+               COALESCE(k.goalkeeper_saves, 0), COALESCE(k.goals_conceded, 0),
+               COALESCE(r.role_totals, '{}'::jsonb)
+        FROM basic b
+        LEFT JOIN keeper k ON k.player_id = b.player_id
+        LEFT JOIN roles r ON r.player_id = b.player_id
+        ORDER BY b.player_id
+        ON CONFLICT (season_id, player_id) DO UPDATE
+        SET matches          = EXCLUDED.matches,
+            appearances      = EXCLUDED.appearances,
+            minutes          = EXCLUDED.minutes,
+            goals            = EXCLUDED.goals,
+            assists          = EXCLUDED.assists,
+            goalkeeper_saves = EXCLUDED.goalkeeper_saves,
+            goals_conceded   = EXCLUDED.goals_conceded,
+            role_totals      = EXCLUDED.role_totals,
+            updated_at       = now()
+        WHERE (ps.matches, ps.appearances, ps.minutes, ps.goals, ps.assists,
+               ps.goalkeeper_saves, ps.goals_conceded, ps.role_totals)
+              IS DISTINCT FROM
+              (EXCLUDED.matches, EXCLUDED.appearances, EXCLUDED.minutes,
+               EXCLUDED.goals, EXCLUDED.assists, EXCLUDED.goalkeeper_saves,
+               EXCLUDED.goals_conceded, EXCLUDED.role_totals)
+        RETURNING (ps.xmax = 0) AS is_new
+    )
+    SELECT (count(*) FILTER (WHERE u.is_new))::integer,
+           (count(*) FILTER (WHERE NOT u.is_new))::integer
+    FROM upserted u;
+END;
+$$;
+
+SELECT s.season_id, r.inserted, r.updated
+FROM core.season s
+CROSS JOIN LATERAL core.refresh_player_season_stats(s.season_id) r
+ORDER BY s.season_id;
+
+COMMIT;
@@ -0,0 +1,54 @@
+-- =========================================================================
+-- Migración: versión de datos por temporada core.season_version y
+-- core.bump_season_version() (ver docker/db/init/02_domain_futbol.sql).
+--
+-- Arranca todas las temporadas existentes en la versión 1; desde ahí la
+-- suben el ETL y los loaders del pipeline al confirmar cada carga.
+--
+--   psql "$DB_DSN" -f docker/db/migrations/005_core_season_version.sql
+-- =========================================================================
+
+BEGIN;
+
+--
+-- Name: season_version; Type: TABLE; Schema: core; Owner: -
+--
+-- Versión de los datos de cada temporada. La sube core.bump_season_version()
+-- en la misma transacción que carga o corrige datos (ETL y pipeline), así
+-- la API la expone como ETag y responde 304 sin repetir las consultas.
+--
+
+CREATE TABLE core.season_version (
+    season_id smallint NOT NULL,
+    version bigint NOT NULL DEFAULT 1,
+    updated_at timestamp with time zone NOT NULL DEFAULT now(),
+    CONSTRAINT season_version_pkey PRIMARY KEY (season_id),
+    CONSTRAINT season_version_season_fk FOREIGN KEY (season_id) REFERENCES core.season(season_id) ON DELETE CASCADE
+);
+
+
+--
+-- Name: function: bump_season_version; Type: FUNCTION; Schema: core;
+--
+-- Sube la versión de una temporada y devuelve la nueva. El lock de fila
+-- del upsert serializa cargas concurrentes de la misma temporada; la nueva
+-- versión se ve recién al hacer commit, junto con los datos.
+--
+
+CREATE OR REPLACE FUNCTION core.bump_season_version(p_season_id smallint)
+RETURNS bigint
+LANGUAGE sql
+AS $$
+    INSERT INTO core.season_version AS sv (season_id)
+    VALUES (p_season_id)
+    ON CONFLICT (season_id) DO UPDATE
+        SET version = sv.version + 1,
+            updated_at = now()
+    RETURNING sv.version;
+$$;
+
+INSERT INTO core.season_version (season_id)
+SELECT s.season_id FROM core.season s
+ON CONFLICT (season_id) DO NOTHING;
+
+COMMIT;
@@ -0,0 +1,262 @@
+"""
+Backfill paralelo del ETL.
+
+Reprocesa historia (una columna nueva, un mapeo corregido, ...) sin
+depender del checkpoint incremental:
+
+  1. El alcance (competición/temporada y/o rango de match_id) se parte en
+     shards de rangos contiguos de match_id (etl.backfill_shard), que
+     además caen en pocas particiones de raw.player_match_stat.
+  2. Cada shard se procesa en un proceso worker con su propio pool de
+     conexiones y su propio etl.run (trigger_source='backfill'), en
+     batches, guardando el progreso (last_match_id) tras cada batch.
+  3. Todas las cargas son upserts: repetir un partido es inocuo, y un
+     backfill interrumpido se retoma con --resume.
+
+No toma el lock del ETL ni toca etl.checkpoint / etl.pending_match, así
+que puede correr junto al ETL incremental.
+
+Uso:
+    python -m etl.backfill --competition premier_league --season 2024_2025
+    python -m etl.backfill --from-id 4000000 --to-id 4200000 --workers 8
+    python -m etl.backfill --resume 12
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from etl.config.settings import Settings, load_settings
+from etl.db import backfill_meta, etl_meta
+from etl.db.pool import close_pool
+from etl.db.status_buffer import StatusBuffer
+from etl.db.tx import db_connection, transaction
+from etl.metrics import RunMetrics
+from etl.transform.batch import process_batch, process_single, record_failure, record_success
+
+DEFAULT_WORKERS: int = min(4, os.cpu_count() or 1)
+# Más shards que workers para repartir mejor la carga entre procesos.
+SHARDS_PER_WORKER: int = 4
+
+
+def build_scope(
+    competition: Optional[str] = None,
+    season: Optional[str] = None,
+    match_id_from: Optional[int] = None,
+    match_id_to: Optional[int] = None,
+) -> Dict[str, Any]:
+    if competition is None and season is None and match_id_from is None and match_id_to is None:
+        raise ValueError("A backfill needs a competition, season or match_id range")
+    return {
+        "competition": competition,
+        "season": season,
+        "match_id_from": match_id_from,
+        "match_id_to": match_id_to,
+    }
+
+
+def run_backfill(
+    scope: Optional[Dict[str, Any]] = None,
+    workers: int = DEFAULT_WORKERS,
+    shards: Optional[int] = None,
+    resume: Optional[int] = None,
+) -> int:
+    """
+    Planifica (o retoma) un backfill y corre sus shards en paralelo.
+
+    Returns:
+        backfill_id.
+    """
+    workers = max(1, workers)
+    with db_connection() as conn:
+        with transaction(conn):
+            if resume is not None:
+                backfill = backfill_meta.load_backfill(conn, resume)
+                if backfill is None:
+                    raise ValueError(f"Unknown backfill_id {resume}")
+                backfill_id = resume
+            else:
+                if scope is None:
+                    raise ValueError("scope is required for a new backfill")
+                backfill_id = backfill_meta.create_backfill(
+                    conn, scope, shards or workers * SHARDS_PER_WORKER
+                )
+            pending = backfill_meta.open_shards(conn, backfill_id)
+
+    print(f"Backfill {backfill_id}: {len(pending)} shard(s), {workers} worker(s)")
+    if pending:
+        # spawn: cada worker arranca limpio (sin conexiones heredadas del padre).
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending)), mp_context=ctx) as pool:
+            futures = {
+                pool.submit(run_shard, backfill_id, shard_no): shard_no
+                for shard_no in pending
+            }
+            for future in as_completed(futures):
+                shard_no = futures[future]
+                try:
+                    status = future.result()
+                except Exception as exc:
+                    status = f"crashed ({exc})"
+                print(f"Backfill {backfill_id} shard {shard_no}: {status}")
+
+    with db_connection() as conn:
+        with transaction(conn):
+            final_status = backfill_meta.finish_backfill(conn, backfill_id)
+    print(f"Backfill {backfill_id} finished: {final_status}")
+    return backfill_id
+
+
+def run_shard(backfill_id: int, shard_no: int) -> str:
+    """
+    Punto de entrada del worker: procesa un shard completo.
+
+    Returns:
+        Estado final del shard ('success', 'error' o 'skipped' si ya estaba
+        terminado).
+    """
+    settings = load_settings()
+    try:
+        with db_connection() as conn:
+            return _run_shard(conn, settings, backfill_id, shard_no)
+    finally:
+        close_pool()
+
+
+def _run_shard(conn: Any, settings: Settings, backfill_id: int, shard_no: int) -> str:
+    with transaction(conn):
+        backfill = backfill_meta.load_backfill(conn, backfill_id)
+        if backfill is None:
+            raise ValueError(f"Unknown backfill_id {backfill_id}")
+        scope: Dict[str, Any] = backfill["scope"]
+        run_id = etl_meta.start_run(
+            conn,
+            trigger_source="backfill",
+            etl_version=settings.etl_version,
+            source_context={"backfill_id": backfill_id, "shard_no": shard_no},
+        )
+        shard = backfill_meta.claim_shard(conn, backfill_id, shard_no, run_id)
+        if shard is None:
+            etl_meta.finish_run(conn, run_id, "success", "shard already done")
+            return "skipped"
+
+    status_buffer = StatusBuffer(run_id)
+    metrics = RunMetrics(run_id)
+    last_match_id: Optional[int] = shard["last_match_id"]
+    ok: int = shard["matches_ok"]
+    errors: int = shard["matches_error"]
+
+    try:
+        while True:
+            with metrics.timer("discovery"):
+                with transaction(conn):
+                    match_ids = backfill_meta.next_shard_matches(
+                        conn,
+                        scope,
+                        shard["match_id_from"],
+                        shard["match_id_to"],
+                        last_match_id,
+                        settings.batch_size,
+                    )
+            if not match_ids:
+                break
+            metrics.matches_discovered += len(match_ids)
+            batch_ok, batch_errors = _process_shard_batch(
+                conn, match_ids, settings, metrics, status_buffer
+            )
+            ok += batch_ok
+            errors += batch_errors
+            last_match_id = match_ids[-1]
+
+            # Progreso + estados del batch juntos: si el worker muere, el
+            # shard se retoma desde el último batch confirmado.
+            with transaction(conn):
+                with metrics.timer("status"):
+                    status_buffer.flush(conn)
+                with metrics.timer("checkpoint"):
+                    backfill_meta.update_shard_progress(
+                        conn, backfill_id, shard_no, last_match_id, ok, errors
+                    )
+
+        shard_status = "success" if errors == 0 else "error"
+        run_status = "success" if errors == 0 else ("partial" if ok > 0 else "failed")
+        with transaction(conn):
+            metrics.persist(conn)
+            backfill_meta.finish_shard(conn, backfill_id, shard_no, shard_status)
+            etl_meta.finish_run(
+                conn, run_id, run_status, error_summary=f"processed={ok}, errors={errors}"
+            )
+        return shard_status
+
+    except Exception as e:
+        conn.rollback()
+        status_buffer.clear()
+        with transaction(conn):
+            backfill_meta.finish_shard(conn, backfill_id, shard_no, "error")
+            etl_meta.finish_run(conn, run_id, "failed", str(e))
+        raise
+
+
+def _process_shard_batch(
+    conn: Any,
+    match_ids: List[int],
+    settings: Settings,
+    metrics: RunMetrics,
+    status_buffer: StatusBuffer,
+) -> Tuple[int, int]:
+    """Mismo camino que el ETL incremental, sin tocar la cola ni el checkpoint."""
+    for match_id in match_ids:
+        status_buffer.match_started(match_id, stage="facts")
+
+    started = time.perf_counter()
+    counters_by_match = process_batch(conn, match_ids, settings, metrics, mark_done=False)
+    if counters_by_match is not None:
+        per_match = (time.perf_counter() - started) / max(len(match_ids), 1)
+        for match_id, counters in counters_by_match.items():
+            record_success(status_buffer, match_id, counters)
+            metrics.observe_match(per_match)
+        return len(counters_by_match), 0
+
+    ok = errors = 0
+    for match_id in match_ids:
+        match_started = time.perf_counter()
+        try:
+            counters = process_single(conn, match_id, settings, metrics, mark_done=False)
+            record_success(status_buffer, match_id, counters)
+            ok += 1
+        except Exception as e:
+            metrics.observe_match(time.perf_counter() - match_started, ok=False)
+            record_failure(status_buffer, match_id, e)
+            errors += 1
+    return ok, errors
+
+
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Parallel ETL backfill")
+    parser.add_argument("--competition", help="raw.match.competition (slug)")
+    parser.add_argument("--season", help="raw.match.season, e.g. 2024_2025")
+    parser.add_argument("--from-id", type=int, dest="match_id_from", help="first match_id (inclusive)")
+    parser.add_argument("--to-id", type=int, dest="match_id_to", help="last match_id (inclusive)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument(
+        "--shards", type=int, default=None,
+        help=f"number of shards (default: workers * {SHARDS_PER_WORKER})",
+    )
+    parser.add_argument("--resume", type=int, default=None, metavar="BACKFILL_ID")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = _parse_args(argv)
+    scope = None
+    if args.resume is None:
+        scope = build_scope(args.competition, args.season, args.match_id_from, args.match_id_to)
+    run_backfill(scope, workers=args.workers, shards=args.shards, resume=args.resume)
+
+
+if __name__ == "__main__":
+    main()
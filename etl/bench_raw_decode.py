@@ -0,0 +1,99 @@
+"""
+Benchmark del costo de decodificación de raw.player_match_stat.
+
+Compara, sobre N filas sintéticas (por defecto 1M), los tres caminos de
+RawAccessRepository sin tocar la base:
+  - dict:     RealDictCursor + _row_to_stat (dataclass con int()/str()).
+  - tuple:    cursor de tuplas + RawPlayerStatRow._make.
+  - columnar: cursor de tuplas + stat_columns_from_rows (NumPy).
+
+Uso:
+    python -m etl.bench_raw_decode [n_rows]
+"""
+from __future__ import annotations
+
+import gc
+import sys
+import time
+from typing import Callable, List, Tuple
+
+from etl.raw_access.columnar import stat_columns_from_rows
+from etl.raw_access.models import RawPlayerStatRow
+from etl.raw_access.repository import RawAccessRepository
+
+_COLUMNS: Tuple[str, ...] = (
+    "match_id",
+    "player_id",
+    "stat_name_id",
+    "raw_value",
+    "value_numeric",
+    "value_ratio_num",
+    "value_ratio_den",
+)
+_STAT_NAMES: Tuple[str, ...] = (
+    "Goles",
+    "Asistencias",
+    "Pases completados",
+    "Goles esperados",
+    "Pases en el último tercio",
+    "Duelos aéreos (ganados)",
+)
+
+
+def _make_rows(n_rows: int) -> List[tuple]:
+    rows: List[tuple] = []
+    for i in range(n_rows):
+        ratio = i % 3 == 0
+        rows.append(
+            (
+                i // 600,
+                i // 20,
+                i % len(_STAT_NAMES) + 1,
+                "7/9 (78%)" if ratio else "1",
+                None if ratio else 1.0,
+                7 if ratio else None,
+                9 if ratio else None,
+            )
+        )
+    return rows
+
+
+def _timed(label: str, fn: Callable[[], object], n_rows: int) -> None:
+    gc.collect()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    per_million = elapsed * 1_000_000 / n_rows
+    print(f"{label:<10} {elapsed:8.3f}s   {per_million:8.3f}s / 1M rows")
+    del result
+
+
+def run_benchmark(n_rows: int = 1_000_000) -> None:
+    print(f"Decoding {n_rows:,} synthetic raw.player_match_stat rows…")
+    tuples = _make_rows(n_rows)
+    # Un RealDictCursor entrega un dict por fila; lo construimos aquí para
+    # medir solo el costo de decodificación en Python.
+    dicts = [dict(zip(_COLUMNS, row)) for row in tuples]
+
+    # raw.player_match_stat trae stat_name_id; el nombre sale del diccionario.
+    names = {i + 1: name for i, name in enumerate(_STAT_NAMES)}
+    to_record = RawAccessRepository._row_to_stat
+
+    _timed("dict", lambda: [to_record(r, names[r["stat_name_id"]]) for r in dicts], n_rows)
+    _timed(
+        "tuple",
+        lambda: [
+            RawPlayerStatRow(r[0], r[1], names[r[2]], r[3], r[4], r[5], r[6])
+            for r in tuples
+        ],
+        n_rows,
+    )
+    _timed(
+        "columnar",
+        lambda: stat_columns_from_rows(tuples, resolve_names=lambda _ids: names),
+        n_rows,
+    )
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -13,6 +13,15 @@ class Settings:
     etl_version: str
     log_sql: bool = False
     competition_map: Dict[str, int] | None = None
+    metrics_textfile: Optional[str] = None
+    pool_min_size: int = 1
+    pool_max_size: int = 4
+    notify_debounce_seconds: float = 2.0
+    notify_max_wait_seconds: float = 10.0
+    sweep_interval_seconds: float = 60.0
+    retry_max_attempts: int = 8
+    retry_base_delay_seconds: int = 60
+    retry_max_delay_seconds: int = 6 * 60 * 60
 
 
 _SETTINGS_CACHE: Optional[Settings] = None
@@ -28,6 +37,16 @@ def _get_env_int(name: str, default: int) -> int:
         return default
 
 
+def _get_env_float(name: str, default: float) -> float:
+    raw: Optional[str] = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
 def _get_env_bool(name: str, default: bool) -> bool:
     raw: Optional[str] = os.getenv(name)
     if raw is None:
@@ -73,6 +92,23 @@ def load_settings() -> Settings:
     etl_version = os.getenv("ETL_VERSION", "v1.0")
     log_sql = _get_env_bool("ETL_LOG_SQL", False)
     competition_map = _get_competition_map()
+    # Ruta del .prom para el textfile collector de node_exporter (opcional).
+    metrics_textfile = os.getenv("ETL_METRICS_TEXTFILE") or None
+    pool_min_size = max(0, _get_env_int("ETL_POOL_MIN_SIZE", 1))
+    pool_max_size = max(1, pool_min_size, _get_env_int("ETL_POOL_MAX_SIZE", 4))
+    # Modo daemon (etl.daemon): ventana de debounce de NOTIFY, espera máxima
+    # de un micro-batch y barrido periódico de respaldo.
+    notify_debounce_seconds = max(0.0, _get_env_float("ETL_NOTIFY_DEBOUNCE_SECONDS", 2.0))
+    notify_max_wait_seconds = max(
+        notify_debounce_seconds, _get_env_float("ETL_NOTIFY_MAX_WAIT_SECONDS", 10.0)
+    )
+    sweep_interval_seconds = max(1.0, _get_env_float("ETL_SWEEP_INTERVAL_SECONDS", 60.0))
+    # Cola de reintentos: intentos antes de dead-letter y backoff exponencial.
+    retry_max_attempts = max(1, _get_env_int("ETL_RETRY_MAX_ATTEMPTS", 8))
+    retry_base_delay_seconds = max(1, _get_env_int("ETL_RETRY_BASE_DELAY_SECONDS", 60))
+    retry_max_delay_seconds = max(
+        retry_base_delay_seconds, _get_env_int("ETL_RETRY_MAX_DELAY_SECONDS", 6 * 60 * 60)
+    )
 
     _SETTINGS_CACHE = Settings(
         dsn=dsn,
@@ -80,6 +116,15 @@ def load_settings() -> Settings:
         etl_version=etl_version,
         log_sql=log_sql,
         competition_map=competition_map,
+        metrics_textfile=metrics_textfile,
+        pool_min_size=pool_min_size,
+        pool_max_size=pool_max_size,
+        notify_debounce_seconds=notify_debounce_seconds,
+        notify_max_wait_seconds=notify_max_wait_seconds,
+        sweep_interval_seconds=sweep_interval_seconds,
+        retry_max_attempts=retry_max_attempts,
+        retry_base_delay_seconds=retry_base_delay_seconds,
+        retry_max_delay_seconds=retry_max_delay_seconds,
     )
     return _SETTINGS_CACHE
 
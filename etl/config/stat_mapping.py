@@ -0,0 +1,215 @@
+"""
+Mapeo de estadísticas crudas (nombres de raw.stat_name) a columnas
+de core.basic_stats y stats.<rol>_stats. El mapeo trabaja con nombres; los
+ids de raw.player_match_stat.stat_name_id se resuelven con el caché de
+etl.raw_access.stat_names al armar cada consulta.
+
+La fuente de verdad son los JSON del pipeline:
+  - pipeline/config/stats_name_map.json        -> core.basic_stats
+  - pipeline/config/stat_maps/<rol>_map.json   -> stats.<rol>_stats
+
+Los mapas del pipeline solo dicen "nombre crudo -> columna". Lo que en el
+pipeline se resolvía con pandas (split de "n/m", extracción de "(nPen)")
+se declara aquí para que el ETL pueda pivotear en SQL.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+SOURCE_VALUE: str = "value"
+SOURCE_RATIO_DEN: str = "ratio_den"
+SOURCE_PATTERN: str = "pattern"
+
+_DEFAULT_CONFIG_DIR: Path = Path(__file__).resolve().parents[2] / "pipeline" / "config"
+_IDENTIFIER = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+# (nombre del grupo, posición en raw.player_match, tabla destino, archivo)
+_ROLE_GROUPS: Tuple[Tuple[str, str, str, str], ...] = (
+    ("goalkeeper", "GK", "stats.goalkeeper_stats", "goalkeeper_map.json"),
+    ("defender", "DF", "stats.defender_stats", "defender_map.json"),
+    ("midfielder", "MF", "stats.midfielder_stats", "midfielder_map.json"),
+    ("forward", "FW", "stats.forward_stats", "forward_map.json"),
+)
+
+# Estadísticas "n/m (xx%)": el numerador va a la columna del mapa y el
+# denominador a la columna indicada aquí (mismo criterio que
+# split_n_m_column / standardize_basic_stats_columns del pipeline).
+RATIO_TOTAL_COLUMNS: Dict[str, Dict[str, str]] = {
+    "basic": {
+        "Pases completados": "passes_total",
+        "Duelos aéreos (ganados)": "aerial_duels_total",
+        "Duelos en el suelo (ganados)": "ground_duels_total",
+    },
+    "goalkeeper": {"Penales atajados": "penalties_received"},
+    "defender": {"Barridas ganadas": "tackles_total"},
+    "midfielder": {
+        "Barridas ganadas": "tackles_total",
+        "Pases largos completados": "long_passes_total",
+        "Regates": "dribbles_total",
+        "Centros": "crosses_total",
+    },
+    "forward": {"Regates": "dribbles_total"},
+}
+
+# Columnas que salen de un patrón sobre raw_value (primer grupo capturado).
+RAW_PATTERN_COLUMNS: Dict[str, Dict[str, Tuple[str, str]]] = {
+    "forward": {"Goles": ("penalties_won", r"\((\d+)Pen\)")},
+}
+
+# Columnas de los mapas que no existen en la tabla del rol
+# (los goles viven en core.basic_stats).
+EXCLUDED_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "forward": ("goals",),
+}
+
+# Nombres del mapa que en la tabla destino tienen otro nombre.
+COLUMN_RENAMES: Dict[str, Dict[str, str]] = {
+    "midfielder": {"successful_tackles": "tackles_won"},
+}
+
+# raw.player_match.position puede venir como código o con el nombre de la
+# fuente (mismo mapeo que participation_normalizer del pipeline).
+POSITION_CODES: Dict[str, str] = {
+    "Goalkeeper": "GK",
+    "Defender": "DF",
+    "Midfielder": "MF",
+    "Attacker": "FW",
+    "Management": "MNG",
+}
+
+
+def normalize_position(position: Optional[str]) -> Optional[str]:
+    if position is None:
+        return None
+    return POSITION_CODES.get(position, position)
+
+
+def position_aliases(code: str) -> Tuple[str, ...]:
+    """Valores crudos de position que corresponden a un código."""
+    return (code,) + tuple(raw for raw, c in POSITION_CODES.items() if c == code)
+
+
+@dataclass(frozen=True)
+class StatColumn:
+    column: str
+    stat_name: str
+    source: str = SOURCE_VALUE
+    pattern: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class StatGroup:
+    name: str
+    table: str
+    position: Optional[str]
+    columns: Tuple[StatColumn, ...]
+
+    def column_names(self) -> Tuple[str, ...]:
+        """Columnas destino en orden de aparición, sin duplicados."""
+        seen: Dict[str, None] = {}
+        for col in self.columns:
+            seen.setdefault(col.column, None)
+        return tuple(seen)
+
+
+@dataclass(frozen=True)
+class StatMapping:
+    basic: StatGroup
+    roles: Tuple[StatGroup, ...]
+
+    def groups(self) -> Tuple[StatGroup, ...]:
+        return (self.basic,) + self.roles
+
+    def role_for_position(self, position: Optional[str]) -> Optional[StatGroup]:
+        code = normalize_position(position)
+        for group in self.roles:
+            if group.position == code:
+                return group
+        return None
+
+    def stat_names(self) -> Tuple[str, ...]:
+        seen: Dict[str, None] = {}
+        for group in self.groups():
+            for col in group.columns:
+                seen.setdefault(col.stat_name, None)
+        return tuple(seen)
+
+
+_MAPPING_CACHE: Dict[str, StatMapping] = {}
+
+
+def _read_map(path: Path) -> Dict[str, str]:
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            raw = json.load(f)
+    except FileNotFoundError as exc:
+        raise ValueError(f"Stat map not found: {path}") from exc
+    if not isinstance(raw, dict):
+        raise ValueError(f"Stat map must be a JSON object: {path}")
+    return {str(k): str(v) for k, v in raw.items()}
+
+
+def _build_group(
+    name: str, table: str, position: Optional[str], name_map: Dict[str, str]
+) -> StatGroup:
+    excluded = set(EXCLUDED_COLUMNS.get(name, ()))
+    renames = COLUMN_RENAMES.get(name, {})
+    columns = []
+    for stat_name, column in name_map.items():
+        # Entradas identidad ("basic_stats_id": "basic_stats_id") son
+        # artefactos del pivot en pandas, no nombres crudos.
+        if stat_name == column or column in excluded:
+            continue
+        columns.append(StatColumn(column=renames.get(column, column), stat_name=stat_name))
+
+    for stat_name, column in RATIO_TOTAL_COLUMNS.get(name, {}).items():
+        columns.append(
+            StatColumn(column=column, stat_name=stat_name, source=SOURCE_RATIO_DEN)
+        )
+
+    for stat_name, (column, pattern) in RAW_PATTERN_COLUMNS.get(name, {}).items():
+        columns.append(
+            StatColumn(
+                column=column,
+                stat_name=stat_name,
+                source=SOURCE_PATTERN,
+                pattern=pattern,
+            )
+        )
+
+    for col in columns:
+        if not _IDENTIFIER.match(col.column):
+            raise ValueError(f"Invalid column name '{col.column}' in stat map '{name}'")
+
+    return StatGroup(name=name, table=table, position=position, columns=tuple(columns))
+
+
+def load_stat_mapping(config_dir: Optional[str] = None) -> StatMapping:
+    """
+    Carga (y cachea) el mapeo de estadísticas.
+
+    Args:
+        config_dir: Directorio con stats_name_map.json y stat_maps/.
+                    Por defecto ETL_STAT_MAP_DIR o pipeline/config del repo.
+    """
+    base = Path(config_dir or os.getenv("ETL_STAT_MAP_DIR") or _DEFAULT_CONFIG_DIR)
+    key = str(base.resolve())
+    if key in _MAPPING_CACHE:
+        return _MAPPING_CACHE[key]
+
+    basic = _build_group(
+        "basic", "core.basic_stats", None, _read_map(base / "stats_name_map.json")
+    )
+    roles = tuple(
+        _build_group(name, table, position, _read_map(base / "stat_maps" / filename))
+        for name, position, table, filename in _ROLE_GROUPS
+    )
+
+    mapping = StatMapping(basic=basic, roles=roles)
+    _MAPPING_CACHE[key] = mapping
+    return mapping
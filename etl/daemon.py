@@ -0,0 +1,179 @@
+"""
+Modo daemon del ETL.
+
+En vez de depender del intervalo de un cron, el proceso queda corriendo y
+hace LISTEN sobre el canal que dispara la ingesta cruda (el trigger
+etl.enqueue_raw_match sobre raw.match, o un NOTIFY explícito de la fuente
+de datos):
+
+- Las notificaciones se agrupan con un debounce: el micro-batch se procesa
+  cuando el canal lleva ``notify_debounce_seconds`` en silencio, o a lo
+  sumo ``notify_max_wait_seconds`` después de la primera notificación.
+- Cada ``sweep_interval_seconds`` sin actividad se corre un barrido de
+  respaldo: recoge reintentos cuyo backoff venció y cualquier NOTIFY
+  perdido (p. ej. durante una reconexión).
+
+El trabajo en sí es run_etl(): la cola etl.pending_match sigue siendo la
+fuente de verdad; el payload de la notificación no se usa.
+
+Uso:
+    python -m etl.daemon
+"""
+from __future__ import annotations
+
+import select
+import signal
+import time
+from typing import Callable, Optional
+
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from psycopg2.extensions import connection as PGConnection
+
+from etl.config.settings import Settings, load_settings
+from etl.db.connection import get_connection
+from etl.main import run_etl
+
+NOTIFY_CHANNEL: str = "etl_pending_match"
+RECONNECT_BASE_DELAY_SECONDS: float = 1.0
+RECONNECT_MAX_DELAY_SECONDS: float = 60.0
+
+
+class Debouncer:
+    """
+    Agrupa ráfagas de notificaciones en un único disparo.
+
+    Los tiempos son de time.monotonic(); se pasan explícitamente para poder
+    probar la lógica sin dormir.
+    """
+
+    def __init__(self, quiet_seconds: float, max_wait_seconds: float) -> None:
+        self.quiet_seconds = quiet_seconds
+        self.max_wait_seconds = max(max_wait_seconds, quiet_seconds)
+        self.first_at: Optional[float] = None
+        self.last_at: Optional[float] = None
+        self.count: int = 0
+
+    @property
+    def pending(self) -> bool:
+        return self.first_at is not None
+
+    def notify(self, now: float, n: int = 1) -> None:
+        if self.first_at is None:
+            self.first_at = now
+        self.last_at = now
+        self.count += n
+
+    def deadline(self) -> Optional[float]:
+        """Instante en que vence el micro-batch actual (None si no hay)."""
+        if self.first_at is None or self.last_at is None:
+            return None
+        return min(self.last_at + self.quiet_seconds, self.first_at + self.max_wait_seconds)
+
+    def due(self, now: float) -> bool:
+        deadline = self.deadline()
+        return deadline is not None and now >= deadline
+
+    def reset(self) -> None:
+        self.first_at = None
+        self.last_at = None
+        self.count = 0
+
+
+def _listen(settings: Settings) -> PGConnection:
+    # Conexión dedicada, fuera del pool: el LISTEN es estado de sesión y la
+    # conexión queda tomada toda la vida del daemon.
+    conn = get_connection()
+    conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+    with conn.cursor() as cur:
+        cur.execute(f"LISTEN {NOTIFY_CHANNEL}")
+    return conn
+
+
+def _drain(conn: PGConnection) -> int:
+    conn.poll()
+    n = len(conn.notifies)
+    conn.notifies.clear()
+    return n
+
+
+def _safe_run(run: Callable[[str], None], trigger_source: str) -> None:
+    try:
+        run(trigger_source)
+    except Exception as exc:
+        # run_etl ya dejó el run como 'failed' en etl.run; el daemon sigue.
+        print(f"ETL run ({trigger_source}) failed: {exc}")
+
+
+def run_daemon(
+    settings: Optional[Settings] = None,
+    run: Callable[[str], None] = lambda source: run_etl(trigger_source=source),
+) -> None:
+    """
+    Bucle principal: LISTEN + debounce + barrido periódico.
+
+    Termina con SIGTERM/SIGINT al terminar el micro-batch en curso.
+    """
+    settings = settings or load_settings()
+    debouncer = Debouncer(settings.notify_debounce_seconds, settings.notify_max_wait_seconds)
+    stopping = False
+
+    def _stop(_signum, _frame) -> None:
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    listen_conn: Optional[PGConnection] = None
+    reconnect_delay = RECONNECT_BASE_DELAY_SECONDS
+    # Al arrancar (y tras cada reconexión) se barre: lo encolado mientras
+    # no escuchábamos no va a notificarse de nuevo.
+    next_sweep = time.monotonic()
+
+    while not stopping:
+        if listen_conn is None or listen_conn.closed:
+            try:
+                listen_conn = _listen(settings)
+            except Exception as exc:
+                print(f"ETL daemon could not LISTEN ({exc}); retrying in {reconnect_delay:.0f}s")
+                time.sleep(reconnect_delay)
+                reconnect_delay = min(reconnect_delay * 2, RECONNECT_MAX_DELAY_SECONDS)
+                continue
+            reconnect_delay = RECONNECT_BASE_DELAY_SECONDS
+            next_sweep = time.monotonic()
+
+        now = time.monotonic()
+        if debouncer.due(now):
+            debouncer.reset()
+            _safe_run(run, "notify")
+            next_sweep = time.monotonic() + settings.sweep_interval_seconds
+            continue
+        if now >= next_sweep:
+            _safe_run(run, "sweep")
+            next_sweep = time.monotonic() + settings.sweep_interval_seconds
+            continue
+
+        deadline = debouncer.deadline()
+        wake_at = next_sweep if deadline is None else min(deadline, next_sweep)
+        try:
+            ready, _, _ = select.select([listen_conn], [], [], max(0.0, wake_at - now))
+            if ready:
+                n = _drain(listen_conn)
+                if n:
+                    debouncer.notify(time.monotonic(), n)
+        except InterruptedError:
+            continue
+        except Exception as exc:
+            print(f"ETL daemon lost its LISTEN connection: {exc}")
+            try:
+                listen_conn.close()
+            except Exception:
+                pass
+            listen_conn = None
+
+    if listen_conn is not None and not listen_conn.closed:
+        listen_conn.close()
+
+
+if __name__ == "__main__":
+    run_daemon()
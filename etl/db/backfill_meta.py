@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from psycopg2.extensions import connection as PGConnection
+from psycopg2.extras import Json
+
+# Filtro de alcance sobre raw.match; cada criterio es opcional.
+_SCOPE_FILTER: str = """
+    (%(competition)s::text IS NULL OR rm.competition = %(competition)s)
+    AND (%(season)s::text IS NULL OR rm.season = %(season)s)
+    AND (%(match_id_from)s::integer IS NULL OR rm.match_id >= %(match_id_from)s)
+    AND (%(match_id_to)s::integer IS NULL OR rm.match_id <= %(match_id_to)s)
+"""
+
+
+def create_backfill(conn: PGConnection, scope: Dict[str, Any], shards: int) -> int:
+    """
+    Registra el backfill y lo parte en ``shards`` rangos contiguos de
+    match_id con cantidades de partidos parejas (ntile sobre raw.match).
+
+    Returns:
+        backfill_id. Un alcance vacío deja el backfill sin shards.
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            "INSERT INTO etl.backfill (scope) VALUES (%s) RETURNING backfill_id",
+            (Json(scope),),
+        )
+        backfill_id = int(cur.fetchone()["backfill_id"])
+        cur.execute(
+            f"""
+            INSERT INTO etl.backfill_shard (
+                backfill_id, shard_no, match_id_from, match_id_to, matches_total
+            )
+            SELECT %(backfill_id)s, shard_no, min(match_id), max(match_id), count(*)
+            FROM (
+                SELECT rm.match_id,
+                       ntile(%(shards)s) OVER (ORDER BY rm.match_id) AS shard_no
+                FROM raw."match" AS rm
+                WHERE {_SCOPE_FILTER}
+            ) AS t
+            GROUP BY shard_no
+            """,
+            dict(scope, backfill_id=backfill_id, shards=max(1, shards)),
+        )
+    return backfill_id
+
+
+def load_backfill(conn: PGConnection, backfill_id: int) -> Optional[Dict[str, Any]]:
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT backfill_id, status, scope FROM etl.backfill WHERE backfill_id = %s",
+            (backfill_id,),
+        )
+        row = cur.fetchone()
+    return dict(row) if row else None
+
+
+def open_shards(conn: PGConnection, backfill_id: int) -> List[int]:
+    """Shards que todavía hay que correr (todo lo que no terminó bien)."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT shard_no
+            FROM etl.backfill_shard
+            WHERE backfill_id = %s
+              AND status <> 'success'
+            ORDER BY shard_no
+            """,
+            (backfill_id,),
+        )
+        return [int(r["shard_no"]) for r in cur.fetchall()]
+
+
+def claim_shard(
+    conn: PGConnection, backfill_id: int, shard_no: int, run_id: int
+) -> Optional[Dict[str, Any]]:
+    """
+    Marca el shard como 'running' y lo asocia al run del worker.
+
+    Un shard interrumpido ('running'/'pending') sigue desde last_match_id;
+    uno que terminó con errores ('error') vuelve a empezar (las cargas son
+    upserts, así que repetir partidos es inocuo).
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE etl.backfill_shard
+            SET status        = 'running',
+                run_id        = %s,
+                last_match_id = CASE WHEN status = 'error' THEN NULL ELSE last_match_id END,
+                matches_ok    = CASE WHEN status = 'error' THEN 0 ELSE matches_ok END,
+                matches_error = CASE WHEN status = 'error' THEN 0 ELSE matches_error END,
+                started_at    = COALESCE(started_at, now()),
+                finished_at   = NULL,
+                updated_at    = now()
+            WHERE backfill_id = %s
+              AND shard_no = %s
+              AND status <> 'success'
+            RETURNING match_id_from, match_id_to, last_match_id,
+                      matches_ok, matches_error
+            """,
+            (run_id, backfill_id, shard_no),
+        )
+        row = cur.fetchone()
+    return dict(row) if row else None
+
+
+def next_shard_matches(
+    conn: PGConnection,
+    scope: Dict[str, Any],
+    match_id_from: int,
+    match_id_to: int,
+    after_match_id: Optional[int],
+    limit: int,
+) -> List[int]:
+    """Siguiente tramo del shard, en orden de match_id."""
+    with conn.cursor() as cur:
+        cur.execute(
+            f"""
+            SELECT rm.match_id
+            FROM raw."match" AS rm
+            WHERE rm.match_id BETWEEN %(shard_from)s AND %(shard_to)s
+              AND rm.match_id > %(after)s
+              AND {_SCOPE_FILTER}
+            ORDER BY rm.match_id
+            LIMIT %(limit)s
+            """,
+            dict(
+                scope,
+                shard_from=match_id_from,
+                shard_to=match_id_to,
+                after=after_match_id if after_match_id is not None else match_id_from - 1,
+                limit=limit,
+            ),
+        )
+        return [int(r["match_id"]) for r in cur.fetchall()]
+
+
+def update_shard_progress(
+    conn: PGConnection,
+    backfill_id: int,
+    shard_no: int,
+    last_match_id: int,
+    matches_ok: int,
+    matches_error: int,
+) -> None:
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE etl.backfill_shard
+            SET last_match_id = %s,
+                matches_ok    = %s,
+                matches_error = %s,
+                updated_at    = now()
+            WHERE backfill_id = %s AND shard_no = %s
+            """,
+            (last_match_id, matches_ok, matches_error, backfill_id, shard_no),
+        )
+
+
+def finish_shard(
+    conn: PGConnection, backfill_id: int, shard_no: int, status: str
+) -> None:
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE etl.backfill_shard
+            SET status      = %s,
+                finished_at = now(),
+                updated_at  = now()
+            WHERE backfill_id = %s AND shard_no = %s
+            """,
+            (status, backfill_id, shard_no),
+        )
+
+
+def finish_backfill(conn: PGConnection, backfill_id: int) -> str:
+    """Cierra el backfill con un estado derivado de sus shards."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE etl.backfill AS b
+            SET finished_at = now(),
+                status = CASE
+                    WHEN s.n_open = 0 THEN 'success'
+                    WHEN s.n_ok > 0 OR s.done > 0 THEN 'partial'
+                    ELSE 'failed'
+                END::etl.run_status_enum
+            FROM (
+                SELECT count(*) FILTER (WHERE status <> 'success') AS n_open,
+                       count(*) FILTER (WHERE status = 'success')  AS n_ok,
+                       COALESCE(sum(matches_ok), 0)                AS done
+                FROM etl.backfill_shard
+                WHERE backfill_id = %s
+            ) AS s
+            WHERE b.backfill_id = %s
+            RETURNING b.status::text AS status
+            """,
+            (backfill_id, backfill_id),
+        )
+        row = cur.fetchone()
+    return str(row["status"]) if row else "failed"
@@ -5,6 +5,7 @@ from typing import Optional
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from psycopg2.extensions import connection as PGConnection
+from psycopg2.extensions import cursor as TupleCursor
 
 from etl.config.settings import load_settings, Settings
 
@@ -12,6 +13,38 @@ from etl.config.settings import load_settings, Settings
 _SETTINGS: Optional[Settings] = None
 
 
+class _CountingMixin:
+    """
+    Cuenta las sentencias enviadas al servidor (execute_values pasa por
+    execute una vez por página; executemany envía una por juego de
+    parámetros). El contador es del proceso y solo crece: las métricas del
+    run toman diferencias (ver statements_executed y etl.metrics).
+    """
+
+    executed: int = 0
+
+    def execute(self, query, vars=None):  # type: ignore[override]
+        _CountingMixin.executed += 1
+        return super().execute(query, vars)  # type: ignore[misc]
+
+    def executemany(self, query, vars_list):  # type: ignore[override]
+        vars_list = list(vars_list)
+        _CountingMixin.executed += len(vars_list)
+        return super().executemany(query, vars_list)  # type: ignore[misc]
+
+
+class CountingCursor(_CountingMixin, RealDictCursor):
+    """Cursor por defecto del ETL: filas como dict."""
+
+
+class CountingTupleCursor(_CountingMixin, TupleCursor):
+    """Cursor de tuplas (para RETURNING/fetch posicionales en cargas masivas)."""
+
+
+def statements_executed() -> int:
+    return _CountingMixin.executed
+
+
 def _get_settings() -> Settings:
     global _SETTINGS
     if _SETTINGS is None:
@@ -25,11 +58,12 @@ def get_connection() -> PGConnection:
 
     Usa:
       - settings.dsn como cadena de conexión.
-      - RealDictCursor para que fetchone()/fetchall() devuelvan dicts.
+      - CountingCursor (RealDictCursor) para que fetchone()/fetchall()
+        devuelvan dicts y se puedan medir los round trips.
     """
     settings = _get_settings()
     conn: PGConnection = psycopg2.connect(
         settings.dsn,
-        cursor_factory=RealDictCursor,
+        cursor_factory=CountingCursor,
     )
     return conn
@@ -0,0 +1,166 @@
+"""
+Pool de conexiones del ETL.
+
+- connection(): presta una conexión cualquiera y la devuelve al salir.
+- session(): igual, pero para trabajo que toma locks de sesión (advisory
+  locks). Toda la vida del lock ocurre en esa misma conexión, y al
+  devolverla se liberan los advisory locks que hayan quedado para que no
+  "viajen" con la conexión a otro usuario del pool.
+
+Antes de prestar una conexión se verifica que siga viva; si estuvo ociosa
+más de ``health_check_after`` segundos se hace un ``SELECT 1``. Las muertas
+se descartan y se prueba la siguiente (o una nueva).
+"""
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from psycopg2 import pool as pg_pool
+from psycopg2.extensions import STATUS_READY
+from psycopg2.extensions import connection as PGConnection
+
+from etl.config.settings import Settings, load_settings
+from etl.db.connection import CountingCursor
+
+
+class EtlConnectionPool:
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int = 1,
+        max_size: int = 4,
+        health_check_after: float = 30.0,
+        acquire_timeout: float = 30.0,
+    ) -> None:
+        self._pool = pg_pool.ThreadedConnectionPool(
+            min_size, max_size, dsn, cursor_factory=CountingCursor
+        )
+        # ThreadedConnectionPool falla si se agota; el semáforo hace esperar.
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._last_used: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        self.health_check_after = health_check_after
+        self.acquire_timeout = acquire_timeout
+        self.max_size = max_size
+
+    # ------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------
+
+    @contextmanager
+    def connection(self) -> Iterator[PGConnection]:
+        conn = self._checkout()
+        try:
+            yield conn
+        finally:
+            self._checkin(conn, reset_session=False)
+
+    @contextmanager
+    def session(self) -> Iterator[PGConnection]:
+        """Conexión fija para trabajo con locks de sesión."""
+        conn = self._checkout()
+        try:
+            yield conn
+        finally:
+            self._checkin(conn, reset_session=True)
+
+    def close(self) -> None:
+        self._pool.closeall()
+        with self._lock:
+            self._last_used.clear()
+
+    # ------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------
+
+    def _checkout(self) -> PGConnection:
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise pg_pool.PoolError(
+                f"No ETL connection available after {self.acquire_timeout}s "
+                f"(max_size={self.max_size})"
+            )
+        try:
+            # Tras un reinicio de Postgres todas las ociosas están muertas: se
+            # descartan hasta dar con una viva. Son a lo sumo max_size; la
+            # siguiente ya es una conexión nueva.
+            for _ in range(self.max_size + 1):
+                conn = self._pool.getconn()
+                if self._is_healthy(conn):
+                    return conn
+                self._discard(conn)
+            raise pg_pool.PoolError("No healthy ETL connection could be opened")
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _checkin(self, conn: PGConnection, reset_session: bool) -> None:
+        close = bool(conn.closed)
+        if not close:
+            try:
+                if conn.status != STATUS_READY:
+                    conn.rollback()
+                if reset_session:
+                    with conn.cursor() as cur:
+                        cur.execute("SELECT pg_advisory_unlock_all()")
+                    conn.commit()
+            except Exception:
+                close = True
+
+        with self._lock:
+            if close:
+                self._last_used.pop(id(conn), None)
+            else:
+                self._last_used[id(conn)] = time.monotonic()
+        try:
+            self._pool.putconn(conn, close=close)
+        finally:
+            self._slots.release()
+
+    def _is_healthy(self, conn: PGConnection) -> bool:
+        if conn.closed:
+            return False
+        with self._lock:
+            last_used = self._last_used.get(id(conn))
+        if last_used is not None and time.monotonic() - last_used < self.health_check_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, conn: PGConnection) -> None:
+        with self._lock:
+            self._last_used.pop(id(conn), None)
+        self._pool.putconn(conn, close=True)
+
+
+_POOL: Optional[EtlConnectionPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_pool(settings: Optional[Settings] = None) -> EtlConnectionPool:
+    """Pool del proceso (se crea en el primer uso)."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            settings = settings or load_settings()
+            _POOL = EtlConnectionPool(
+                settings.dsn,
+                min_size=settings.pool_min_size,
+                max_size=settings.pool_max_size,
+            )
+        return _POOL
+
+
+def close_pool() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.close()
+            _POOL = None
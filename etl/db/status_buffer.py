@@ -0,0 +1,205 @@
+"""
+Buffer en memoria de estados por partido (etl.run_match) y errores
+(etl.error_log).
+
+En vez de una llamada a etl.register_match_status por transición y un
+INSERT por error, el loop principal anota aquí y vuelca una vez por batch
+con un INSERT multi-fila por tabla.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from psycopg2.extensions import connection as PGConnection
+from psycopg2.extras import Json, execute_values
+
+_RUN_MATCH_UPSERT_SQL: str = """
+    INSERT INTO etl.run_match (
+        run_id, match_id, stage, status, tries,
+        error_code, error_message,
+        rows_inserted_core, rows_updated_core,
+        rows_inserted_stats, rows_updated_stats,
+        started_at, finished_at
+    )
+    VALUES %s
+    ON CONFLICT (run_id, match_id)
+    DO UPDATE
+    SET
+        stage               = EXCLUDED.stage,
+        status              = EXCLUDED.status,
+        tries               = etl.run_match.tries + EXCLUDED.tries,
+        error_code          = EXCLUDED.error_code,
+        error_message       = EXCLUDED.error_message,
+        rows_inserted_core  = EXCLUDED.rows_inserted_core,
+        rows_updated_core   = EXCLUDED.rows_updated_core,
+        rows_inserted_stats = EXCLUDED.rows_inserted_stats,
+        rows_updated_stats  = EXCLUDED.rows_updated_stats,
+        started_at          = COALESCE(etl.run_match.started_at,
+                                       EXCLUDED.started_at),
+        finished_at         = COALESCE(EXCLUDED.finished_at,
+                                       etl.run_match.finished_at),
+        last_updated_at     = now()
+"""
+_RUN_MATCH_TEMPLATE: str = (
+    "(%s, %s, %s::etl.stage_enum, %s::etl.match_status_enum, %s, %s, %s, "
+    "%s, %s, %s, %s, %s, %s)"
+)
+
+# run_match_id se resuelve contra las filas recién volcadas de etl.run_match.
+_ERROR_LOG_INSERT_SQL: str = """
+    INSERT INTO etl.error_log(
+        run_id, run_match_id, match_id, stage,
+        created_at, message, detail, context
+    )
+    SELECT v.run_id, rm.run_match_id, v.match_id, v.stage,
+           v.created_at, v.message, v.detail, v.context
+    FROM (VALUES %s) AS v(run_id, match_id, stage, created_at,
+                          message, detail, context)
+    LEFT JOIN etl.run_match rm
+           ON rm.run_id = v.run_id
+          AND rm.match_id = v.match_id
+"""
+_ERROR_LOG_TEMPLATE: str = (
+    "(%s::integer, %s::integer, %s::etl.stage_enum, %s::timestamptz, "
+    "%s::text, %s::text, %s::jsonb)"
+)
+
+
+@dataclass
+class _MatchStatus:
+    stage: str
+    status: str
+    tries: int = 0
+    error_code: Optional[str] = None
+    error_message: Optional[str] = None
+    rows_inserted_core: int = 0
+    rows_updated_core: int = 0
+    rows_inserted_stats: int = 0
+    rows_updated_stats: int = 0
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+@dataclass
+class StatusBuffer:
+    """
+    Acumula transiciones de estado y errores de un run.
+
+    Por partido solo se conserva la última transición (running -> success
+    colapsa en una fila), manteniendo el started_at de la primera.
+    """
+
+    run_id: int
+    _statuses: Dict[int, _MatchStatus] = field(default_factory=dict, init=False)
+    _errors: List[tuple] = field(default_factory=list, init=False)
+
+    def __len__(self) -> int:
+        return len(self._statuses) + len(self._errors)
+
+    def match_started(self, match_id: int, stage: str) -> None:
+        now = datetime.now(timezone.utc)
+        current = self._statuses.get(match_id)
+        tries = current.tries + 1 if current else 1
+        started_at = current.started_at if current else now
+        self._statuses[match_id] = _MatchStatus(
+            stage=stage, status="running", tries=tries, started_at=started_at
+        )
+
+    def match_finished(
+        self,
+        match_id: int,
+        stage: str,
+        status: str,
+        error_code: Optional[str] = None,
+        error_message: Optional[str] = None,
+        rows_inserted_core: int = 0,
+        rows_updated_core: int = 0,
+        rows_inserted_stats: int = 0,
+        rows_updated_stats: int = 0,
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        current = self._statuses.get(match_id)
+        self._statuses[match_id] = _MatchStatus(
+            stage=stage,
+            status=status,
+            tries=current.tries if current else 1,
+            error_code=error_code,
+            error_message=error_message,
+            rows_inserted_core=rows_inserted_core,
+            rows_updated_core=rows_updated_core,
+            rows_inserted_stats=rows_inserted_stats,
+            rows_updated_stats=rows_updated_stats,
+            started_at=current.started_at if current else now,
+            finished_at=now,
+        )
+
+    def error(
+        self,
+        match_id: Optional[int],
+        stage: Optional[str],
+        message: str,
+        detail: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self._errors.append(
+            (
+                self.run_id,
+                match_id,
+                stage,
+                datetime.now(timezone.utc),
+                message,
+                detail,
+                Json(context) if context is not None else None,
+            )
+        )
+
+    def flush(self, conn: PGConnection) -> None:
+        """
+        Vuelca lo acumulado con un INSERT multi-fila por tabla y vacía el
+        buffer. No hace commit: se llama dentro de la transacción del batch.
+        """
+        if self._statuses:
+            rows = [
+                (
+                    self.run_id,
+                    match_id,
+                    s.stage,
+                    s.status,
+                    s.tries,
+                    s.error_code,
+                    s.error_message,
+                    s.rows_inserted_core,
+                    s.rows_updated_core,
+                    s.rows_inserted_stats,
+                    s.rows_updated_stats,
+                    s.started_at,
+                    s.finished_at,
+                )
+                for match_id, s in sorted(self._statuses.items())
+            ]
+            with conn.cursor() as cur:
+                execute_values(
+                    cur,
+                    _RUN_MATCH_UPSERT_SQL,
+                    rows,
+                    template=_RUN_MATCH_TEMPLATE,
+                    page_size=len(rows),
+                )
+
+        if self._errors:
+            with conn.cursor() as cur:
+                execute_values(
+                    cur,
+                    _ERROR_LOG_INSERT_SQL,
+                    self._errors,
+                    template=_ERROR_LOG_TEMPLATE,
+                    page_size=len(self._errors),
+                )
+
+        self.clear()
+
+    def clear(self) -> None:
+        self._statuses = {}
+        self._errors = []
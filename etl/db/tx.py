@@ -5,24 +5,33 @@ from typing import Iterator
 
 from psycopg2.extensions import connection as PGConnection
 
-from etl.db.connection import get_connection
+from etl.db.pool import get_pool
 
 
 @contextmanager
 def db_connection() -> Iterator[PGConnection]:
     """
-    Context manager para una conexión de DB.
+    Context manager para una conexión de DB tomada del pool del ETL.
+    Al salir la conexión vuelve al pool (no se cierra).
 
     Ejemplo:
         with db_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute("SELECT 1")
     """
-    conn: PGConnection = get_connection()
-    try:
+    with get_pool().connection() as conn:
+        yield conn
+
+
+@contextmanager
+def db_session() -> Iterator[PGConnection]:
+    """
+    Como db_connection, pero para trabajo que toma locks de sesión
+    (pg_advisory_lock): todo ocurre en la misma conexión y al devolverla
+    se liberan los advisory locks pendientes.
+    """
+    with get_pool().session() as conn:
         yield conn
-    finally:
-        conn.close()
 
 
 @contextmanager
@@ -1,8 +1,10 @@
 from __future__ import annotations
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from psycopg2.extensions import connection as PGConnection
 
 CHECKPOINT_NAME: str = "max_match_id_processed"
+RETRY_BASE_DELAY_SECONDS: int = 60
+RETRY_MAX_DELAY_SECONDS: int = 6 * 60 * 60
 
 def get_last_checkpoint(conn: PGConnection) -> int:
     """
@@ -12,6 +14,10 @@ def get_last_checkpoint(conn: PGConnection) -> int:
       - checkpoint_name = 'max_match_id_processed'
       - last_value = match_id máximo procesado de forma exitosa
 
+    Es solo una marca informativa: el descubrimiento se hace sobre
+    etl.pending_match, así que un partido fallido por debajo del máximo
+    sigue siendo reintentable.
+
     Args:
         conn: Conexión psycopg2 ya abierta.
 
@@ -40,7 +46,8 @@ def update_checkpoint(conn: PGConnection, new_max_match_id: int) -> None:
     Actualiza el checkpoint con el nuevo match_id máximo procesado.
 
     Usa un upsert sobre etl.checkpoint para mantener un único registro
-    por checkpoint_name.
+    por checkpoint_name. El valor nunca retrocede: reintentos exitosos de
+    partidos antiguos no bajan la marca.
 
     Args:
         conn: Conexión psycopg2 ya abierta (se espera que el caller maneje la transacción).
@@ -54,7 +61,10 @@ def update_checkpoint(conn: PGConnection, new_max_match_id: int) -> None:
         VALUES (%s, %s, now(), 'updated by ETL')
         ON CONFLICT (checkpoint_name)
         DO UPDATE SET
-            last_value = EXCLUDED.last_value,
+            last_value = GREATEST(
+                etl.checkpoint.last_value::int,
+                EXCLUDED.last_value::int
+            )::text,
             updated_at = EXCLUDED.updated_at,
             note       = EXCLUDED.note
     """
@@ -67,36 +77,158 @@ def discover_pending_matches(conn: PGConnection, batch_size: int) -> List[int]:
     """
     Descubre qué partidos están pendientes por procesar.
 
-    Criterios:
-      - Existen en raw.match.
-      - NO existen todavía en core.match.
-      - Tienen match_id > checkpoint actual (modo incremental).
+    Lee la cola etl.pending_match (llenada por el trigger sobre raw.match):
+      - status = 'pending'.
+      - next_attempt_at <= now() (respeta el backoff de los reintentos).
 
-    El resultado está limitado por batch_size para procesar en lotes.
+    La consulta usa el índice parcial idx_etl_pending_match_due, por lo que
+    su costo es proporcional a batch_size y no al tamaño de raw.match.
 
     Args:
         conn: Conexión psycopg2 ya abierta.
         batch_size: Tamaño máximo del lote de match_id a devolver.
 
     Returns:
-        List[int]: Lista de match_id pendientes, ordenados de menor a mayor.
+        List[int]: Lista de match_id pendientes, en orden de vencimiento.
     """
-    last_id: int = get_last_checkpoint(conn)
-
     query: str = """
-        SELECT rm.match_id
-        FROM raw.match AS rm
-        LEFT JOIN core.match AS m
-          ON m.match_id = rm.match_id
-        WHERE m.match_id IS NULL
-          AND rm.match_id > %s
-        ORDER BY rm.match_id
+        SELECT match_id
+        FROM etl.pending_match
+        WHERE status = 'pending'
+          AND next_attempt_at <= now()
+        ORDER BY next_attempt_at, match_id
         LIMIT %s
     """
 
     with conn.cursor() as cur:
-        cur.execute(query, (last_id, batch_size))
+        cur.execute(query, (batch_size,))
         rows: List[Dict[str, Any]] = cur.fetchall()
 
     pending_ids: List[int] = [int(r["match_id"]) for r in rows]
     return pending_ids
+
+
+def mark_match_done(conn: PGConnection, match_id: int) -> None:
+    """
+    Marca un partido de la cola como procesado con éxito.
+
+    La fila sale del índice parcial, así que no vuelve a descubrirse
+    hasta que el trigger de raw.match la encole otra vez.
+
+    Args:
+        conn: Conexión psycopg2 ya abierta (el caller maneja la transacción).
+        match_id: Partido procesado.
+    """
+    query: str = """
+        UPDATE etl.pending_match
+        SET status             = 'success',
+            last_error_code    = NULL,
+            last_error_message = NULL,
+            updated_at         = now()
+        WHERE match_id = %s
+    """
+
+    with conn.cursor() as cur:
+        cur.execute(query, (match_id,))
+
+
+def reschedule_match(
+    conn: PGConnection,
+    match_id: int,
+    error_code: Optional[str] = None,
+    error_message: Optional[str] = None,
+    base_delay_seconds: int = RETRY_BASE_DELAY_SECONDS,
+    max_delay_seconds: int = RETRY_MAX_DELAY_SECONDS,
+    max_attempts: Optional[int] = None,
+    permanent: bool = False,
+) -> str:
+    """
+    Devuelve un partido fallido a la cola con backoff exponencial, o lo
+    manda a dead-letter.
+
+    El próximo intento se agenda en base_delay_seconds * 2^attempts
+    (acotado a max_delay_seconds), y se guarda el último error. Si el error
+    es permanente o se alcanzó max_attempts, el partido queda en
+    status = 'error' y deja de descubrirse (ver requeue_dead_letters).
+
+    Args:
+        conn: Conexión psycopg2 ya abierta (el caller maneja la transacción).
+        match_id: Partido que falló.
+        error_code: Código/tipo del error (p. ej. nombre de la excepción).
+        error_message: Mensaje del error.
+        base_delay_seconds: Retardo del primer reintento.
+        max_delay_seconds: Tope del retardo.
+        max_attempts: Intentos antes de dead-letter (None = sin tope).
+        permanent: Reintentar no va a ayudar; dead-letter directo.
+
+    Returns:
+        str: Nuevo estado del partido en la cola ('pending' o 'error').
+    """
+    # "attempts" a la derecha del SET es el valor previo al UPDATE.
+    dead: str = """
+        (%(permanent)s
+         OR (%(max_attempts)s::integer IS NOT NULL AND attempts + 1 >= %(max_attempts)s))
+    """
+    query: str = f"""
+        UPDATE etl.pending_match
+        SET status             = CASE WHEN {dead} THEN 'error' ELSE 'pending' END
+                                 ::etl.match_status_enum,
+            attempts           = attempts + 1,
+            next_attempt_at    = CASE
+                WHEN {dead} THEN next_attempt_at
+                ELSE now() + make_interval(
+                    secs => LEAST(%(base_delay)s * power(2, attempts), %(max_delay)s)
+                )
+            END,
+            last_error_code    = %(error_code)s,
+            last_error_message = %(error_message)s,
+            updated_at         = now()
+        WHERE match_id = %(match_id)s
+        RETURNING status::text AS status
+    """
+
+    with conn.cursor() as cur:
+        cur.execute(
+            query,
+            {
+                "permanent": permanent,
+                "max_attempts": max_attempts,
+                "base_delay": base_delay_seconds,
+                "max_delay": max_delay_seconds,
+                "error_code": error_code,
+                "error_message": error_message,
+                "match_id": match_id,
+            },
+        )
+        row: Optional[Dict[str, Any]] = cur.fetchone()
+
+    return str(row["status"]) if row else "error"
+
+
+def requeue_dead_letters(
+    conn: PGConnection, match_ids: Optional[List[int]] = None
+) -> int:
+    """
+    Vuelve a encolar partidos en dead-letter (status = 'error'), p. ej.
+    después de corregir un mapeo o completar datos crudos.
+
+    Args:
+        conn: Conexión psycopg2 ya abierta (el caller maneja la transacción).
+        match_ids: Partidos a reencolar; None = todos los de dead-letter.
+
+    Returns:
+        int: Cantidad de partidos reencolados.
+    """
+    query: str = """
+        UPDATE etl.pending_match
+        SET status          = 'pending',
+            attempts        = 0,
+            next_attempt_at = now(),
+            updated_at      = now()
+        WHERE status = 'error'
+          AND (%(match_ids)s::integer[] IS NULL OR match_id = ANY(%(match_ids)s))
+    """
+
+    with conn.cursor() as cur:
+        cur.execute(query, {"match_ids": match_ids})
+        return int(cur.rowcount)
@@ -0,0 +1,67 @@
+"""
+Política de reintentos de la cola etl.pending_match.
+
+Un partido que falla vuelve a la cola con backoff exponencial hasta
+``max_attempts`` intentos; ahí queda en status = 'error' (dead-letter) y
+deja de descubrirse hasta que se lo reencole (requeue_dead_letters o una
+nueva ingesta del partido en raw.match).
+
+Los errores se clasifican para no gastar reintentos en vano:
+  - permanentes: datos crudos incompletos o inválidos; reintentar no
+    cambia nada, van directo a dead-letter.
+  - transitorios: locks, deadlocks, conflictos de serialización,
+    timeouts, conexión caída; se reintentan con backoff.
+  - el resto se trata como transitorio (con el tope de intentos).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Tuple, Type
+
+import psycopg2
+from psycopg2 import errors as pg_errors
+
+from etl.config.settings import Settings
+from etl.dimensions.exceptions import MissingDimensionData
+
+ERROR_PERMANENT: str = "permanent"
+ERROR_TRANSIENT: str = "transient"
+ERROR_UNKNOWN: str = "unknown"
+
+_PERMANENT: Tuple[Type[BaseException], ...] = (
+    MissingDimensionData,
+    psycopg2.DataError,
+)
+
+_TRANSIENT: Tuple[Type[BaseException], ...] = (
+    pg_errors.LockNotAvailable,
+    pg_errors.DeadlockDetected,
+    pg_errors.SerializationFailure,
+    pg_errors.QueryCanceled,
+    psycopg2.OperationalError,
+)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 8
+    base_delay_seconds: int = 60
+    max_delay_seconds: int = 6 * 60 * 60
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Settings]) -> "RetryPolicy":
+        if settings is None:
+            return cls()
+        return cls(
+            max_attempts=settings.retry_max_attempts,
+            base_delay_seconds=settings.retry_base_delay_seconds,
+            max_delay_seconds=settings.retry_max_delay_seconds,
+        )
+
+
+def classify_error(error: BaseException) -> str:
+    if isinstance(error, _PERMANENT):
+        return ERROR_PERMANENT
+    if isinstance(error, _TRANSIENT):
+        return ERROR_TRANSIENT
+    return ERROR_UNKNOWN
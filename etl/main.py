@@ -1,12 +1,43 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+import time
+from typing import List
+
+from psycopg2.extensions import connection as PGConnection
+
 from etl.config.settings import load_settings, Settings
-from etl.db.tx import db_connection, transaction
+from etl.db.tx import db_connection, db_session, transaction
 from etl.db import etl_meta
-from etl.discovery.discovery import discover_pending_matches, update_checkpoint
-from etl.dimensions.dimensions import upsert_dimensions_for_match
-from etl.transform.match_transform import process_match
+from etl.db.status_buffer import StatusBuffer
+from etl.discovery.discovery import (
+    discover_pending_matches,
+    reschedule_match,
+    update_checkpoint,
+)
+from etl.discovery.retry import ERROR_PERMANENT, RetryPolicy, classify_error
+from etl.metrics import RunMetrics, write_textfile
+from etl.transform.batch import (
+    process_batch,
+    process_single,
+    record_failure,
+    record_success,
+)
+
+
+def _save_metrics(conn: PGConnection, metrics: RunMetrics, settings: Settings) -> None:
+    """
+    Persiste las métricas del run (dentro de la transacción del llamador) y,
+    si ETL_METRICS_TEXTFILE está definido, escribe el .prom para
+    node_exporter.
+    """
+    snapshot = metrics.snapshot()
+    metrics.persist(conn, snapshot)
+    if settings.metrics_textfile:
+        try:
+            write_textfile(settings.metrics_textfile, snapshot, metrics.run_id)
+        except OSError as exc:
+            # El textfile es opcional; no debe tumbar el run.
+            print(f"Could not write ETL metrics textfile: {exc}")
 
 
 def run_etl(trigger_source: str = "scheduler") -> None:
@@ -22,10 +53,17 @@ def run_etl(trigger_source: str = "scheduler") -> None:
     """
     settings: Settings = load_settings()
 
+    # El lock del ETL es un advisory lock de sesión: se toma, se usa y se
+    # libera en la misma conexión del pool.
+    with db_session() as conn:
+        _run_in_session(conn, settings, trigger_source)
+
+
+def _run_in_session(conn: PGConnection, settings: Settings, trigger_source: str) -> None:
     # =====================================================
     # Bloque 0: Crear run + lock
     # =====================================================
-    with db_connection() as conn, transaction(conn):
+    with transaction(conn):
         run_id: int = etl_meta.start_run(
             conn,
             trigger_source=trigger_source,
@@ -41,126 +79,148 @@ def run_etl(trigger_source: str = "scheduler") -> None:
             etl_meta.finish_run(conn, run_id, "failed", "Could not acquire ETL lock.")
             return
 
+    # Estados por partido y errores se acumulan y se vuelcan una vez por batch
+    status_buffer = StatusBuffer(run_id)
+    metrics = RunMetrics(run_id)
+    retry_policy = RetryPolicy.from_settings(settings)
+
     # =====================================================
     # Bloque 1: Descubrir y procesar partidos
     # =====================================================
     try:
-        with db_connection() as conn:
-            processed: int = 0
-            errors: int = 0
-            max_seen_match_id: int = 0
+        max_seen_match_id: int = 0
 
-            while True:
+        while True:
+            with metrics.timer("discovery"):
                 pending: List[int] = discover_pending_matches(
                     conn, settings.batch_size
                 )
-                if not pending:
-                    break
-
-                for match_id in pending:
+            if not pending:
+                break
+            metrics.matches_discovered += len(pending)
+
+            for match_id in pending:
+                status_buffer.match_started(match_id, stage="facts")
+
+            # Camino rápido: todo el batch en una transacción con
+            # sentencias multi-fila. Si algo falla se reintenta partido
+            # por partido para aislar al culpable.
+            batch_started = time.perf_counter()
+            batch_counters = process_batch(conn, pending, settings, metrics)
+            if batch_counters is not None:
+                # Latencia por partido amortizada sobre el batch
+                per_match = (time.perf_counter() - batch_started) / max(len(pending), 1)
+                for match_id, counters in batch_counters.items():
+                    record_success(status_buffer, match_id, counters)
+                    metrics.observe_match(per_match)
+                max_seen_match_id = max([max_seen_match_id, *batch_counters])
+            retry_one_by_one: List[int] = pending if batch_counters is None else []
+
+            for match_id in retry_one_by_one:
+                match_started = time.perf_counter()
+                try:
+                    # Bloques 2 y 3: dimensiones + hechos del partido
+                    counters = process_single(conn, match_id, settings, metrics)
+                    record_success(status_buffer, match_id, counters)
                     max_seen_match_id = max(max_seen_match_id, match_id)
 
-                    try:
-                        with transaction(conn):
-                            etl_meta.register_match_status(
-                                conn,
-                                run_id,
-                                match_id,
-                                stage="facts",
-                                status="running",
-                            )
-
-                            # =====================================================
-                            # Bloque 2: Dimensiones
-                            # =====================================================
-                            upsert_dimensions_for_match(conn, match_id, settings=settings)
-
-                            # =====================================================
-                            # Bloque 3: Hechos
-                            # =====================================================
-                            counters: Dict[str, int] = process_match(
-                                conn, run_id, match_id
-                            )
-
-                            etl_meta.register_match_status(
-                                conn,
-                                run_id,
-                                match_id,
-                                stage="facts",
-                                status="success",
-                                rows_inserted_core=counters.get(
-                                    "core_inserted", 0
-                                ),
-                                rows_updated_core=counters.get(
-                                    "core_updated", 0
-                                ),
-                                rows_inserted_stats=counters.get(
-                                    "stats_inserted", 0
-                                ),
-                                rows_updated_stats=counters.get(
-                                    "stats_updated", 0
-                                ),
-                            )
-                            processed += 1
-
-                    except Exception as e:
-                        errors += 1
-                        # Registrar error del partido
-                        with transaction(conn):
-                            etl_meta.register_match_status(
-                                conn,
-                                run_id,
-                                match_id,
-                                stage="facts",
-                                status="error",
-                                error_code=type(e).__name__,
-                                error_message=str(e),
-                            )
-                            etl_meta.log_error(
-                                conn,
-                                run_id=run_id,
-                                run_match_id=None,
-                                match_id=match_id,
-                                stage="facts",
-                                message="Error processing match",
-                                detail=str(e),
-                                context={"match_id": match_id},
-                            )
-
-                # =====================================================
-                # Bloque 4: Guardar checkpoint
-                # =====================================================
-                with transaction(conn):
-                    update_checkpoint(conn, max_seen_match_id)
+                except Exception as e:
+                    metrics.observe_match(time.perf_counter() - match_started, ok=False)
+                    # Devolver el partido a la cola con backoff (o a
+                    # dead-letter si el error es permanente o se agotaron
+                    # los intentos); el estado y el error quedan en el
+                    # buffer hasta el fin del batch.
+                    error_kind = classify_error(e)
+                    with transaction(conn):
+                        queue_status = reschedule_match(
+                            conn,
+                            match_id,
+                            error_code=type(e).__name__,
+                            error_message=str(e),
+                            base_delay_seconds=retry_policy.base_delay_seconds,
+                            max_delay_seconds=retry_policy.max_delay_seconds,
+                            max_attempts=retry_policy.max_attempts,
+                            permanent=error_kind == ERROR_PERMANENT,
+                        )
+                    record_failure(
+                        status_buffer,
+                        match_id,
+                        e,
+                        context={
+                            "error_kind": error_kind,
+                            "dead_letter": queue_status == "error",
+                        },
+                    )
 
             # =====================================================
-            # Bloque 5: Finalizar run
+            # Bloque 4: Volcar estados/errores del batch y guardar
+            # checkpoint (marca informativa; la cola etl.pending_match
+            # es la que decide qué se reintenta)
             # =====================================================
-            final_status: str = (
-                "success"
-                if errors == 0
-                else ("partial" if processed > 0 else "failed")
-            )
-
             with transaction(conn):
-                etl_meta.finish_run(
-                    conn,
-                    run_id,
-                    final_status,
-                    error_summary=f"processed={processed}, errors={errors}",
-                )
-                etl_meta.release_etl_lock(conn)
+                with metrics.timer("status"):
+                    status_buffer.flush(conn)
+                if max_seen_match_id:
+                    with metrics.timer("checkpoint"):
+                        update_checkpoint(conn, max_seen_match_id)
+
+        # =====================================================
+        # Bloque 5: Finalizar run
+        # =====================================================
+        processed, errors = metrics.matches_ok, metrics.matches_error
+        final_status: str = (
+            "success"
+            if errors == 0
+            else ("partial" if processed > 0 else "failed")
+        )
+
+        with transaction(conn):
+            _save_metrics(conn, metrics, settings)
+            etl_meta.finish_run(
+                conn,
+                run_id,
+                final_status,
+                error_summary=f"processed={processed}, errors={errors}",
+            )
+            etl_meta.release_etl_lock(conn)
 
     except Exception as e:
         # =====================================================
         # Falla global del ETL
         # =====================================================
-        with db_connection() as conn, transaction(conn):
-            etl_meta.finish_run(conn, run_id, "failed", str(e))
-            etl_meta.release_etl_lock(conn)
+        if conn.closed:
+            # Se perdió la sesión (y con ella el advisory lock); se cierra
+            # el run desde otra conexión del pool.
+            with db_connection() as other:
+                _fail_run(other, run_id, status_buffer, metrics, settings, str(e))
+        else:
+            conn.rollback()
+            _fail_run(conn, run_id, status_buffer, metrics, settings, str(e))
         raise
 
 
+def _fail_run(
+    conn: PGConnection,
+    run_id: int,
+    status_buffer: StatusBuffer,
+    metrics: RunMetrics,
+    settings: Settings,
+    error: str,
+) -> None:
+    # Lo que quedó en el buffer es diagnóstico; los partidos de un
+    # batch sin volcar siguen pendientes en etl.pending_match o ya
+    # quedaron confirmados junto a sus hechos.
+    try:
+        with transaction(conn):
+            status_buffer.flush(conn)
+            _save_metrics(conn, metrics, settings)
+    except Exception:
+        status_buffer.clear()
+    with transaction(conn):
+        etl_meta.finish_run(conn, run_id, "failed", error)
+        etl_meta.release_etl_lock(conn)
+
+
 if __name__ == "__main__":
     # Para ejecución manual durante pruebas
     run_etl(trigger_source="manual")
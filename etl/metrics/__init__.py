@@ -0,0 +1,11 @@
+"""
+Métricas de throughput del ETL.
+
+- RunMetrics: acumula tiempos por etapa, latencias por partido, filas por
+  tabla y round trips; se persiste en etl.run_metric.
+- write_textfile(): exposición estilo Prometheus para node_exporter.
+"""
+from .run_metrics import RunMetrics, percentile
+from .textfile import render, write_textfile
+
+__all__ = ["RunMetrics", "percentile", "render", "write_textfile"]
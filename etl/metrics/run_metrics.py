@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import math
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from etl.db.connection import statements_executed
+
+# Etapas medidas por RunMetrics.timer (etiqueta de stage_seconds).
+STAGES: Tuple[str, ...] = ("discovery", "dimensions", "facts", "status", "checkpoint")
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Percentil por rango más cercano (q en [0, 1]); 0.0 si no hay datos."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class RunMetrics:
+    """
+    Métricas de un run del ETL, acumuladas en memoria.
+
+    - Tiempo por etapa (timer).
+    - Latencia por partido (observe_match) -> p50/p95.
+    - Batches que fallaron y se reintentaron partido por partido.
+    - Filas insertadas/actualizadas por tabla destino (add_rows).
+    - Round trips a la base: sentencias enviadas por los cursores del ETL
+      (etl.db.connection.statements_executed).
+    """
+
+    run_id: int
+    started_at: float = field(default_factory=time.perf_counter)
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+    match_seconds: List[float] = field(default_factory=list)
+    rows: Dict[Tuple[str, str], int] = field(default_factory=dict)
+    matches_ok: int = 0
+    matches_error: int = 0
+    matches_discovered: int = 0
+    batches_failed: int = 0
+    _round_trips_start: int = field(default_factory=statements_executed)
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + elapsed
+
+    def observe_match(self, seconds: float, ok: bool = True) -> None:
+        self.match_seconds.append(seconds)
+        if ok:
+            self.matches_ok += 1
+        else:
+            self.matches_error += 1
+
+    def add_rows(self, table: str, inserted: int = 0, updated: int = 0) -> None:
+        for op, n in (("inserted", inserted), ("updated", updated)):
+            if n:
+                key = (table, op)
+                self.rows[key] = self.rows.get(key, 0) + n
+
+    @property
+    def round_trips(self) -> int:
+        return statements_executed() - self._round_trips_start
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def snapshot(self) -> List[Tuple[str, str, float]]:
+        """Métricas como (metric, label, value), en el formato de etl.run_metric."""
+        elapsed = self.elapsed_seconds
+        done = self.matches_ok + self.matches_error
+        out: List[Tuple[str, str, float]] = [
+            ("duration_seconds", "", elapsed),
+            ("matches_discovered", "", float(self.matches_discovered)),
+            ("matches_ok", "", float(self.matches_ok)),
+            ("matches_error", "", float(self.matches_error)),
+            ("batches_failed", "", float(self.batches_failed)),
+            ("matches_per_second", "", done / elapsed if elapsed > 0 else 0.0),
+            ("db_round_trips", "", float(self.round_trips)),
+            ("match_latency_p50_seconds", "", percentile(self.match_seconds, 0.50)),
+            ("match_latency_p95_seconds", "", percentile(self.match_seconds, 0.95)),
+        ]
+        for stage in STAGES:
+            out.append(("stage_seconds", stage, self.stage_seconds.get(stage, 0.0)))
+        for (table, op), n in sorted(self.rows.items()):
+            out.append((f"rows_{op}", table, float(n)))
+        return out
+
+    def persist(self, conn: Any, snapshot: Optional[List[Tuple[str, str, float]]] = None) -> None:
+        """
+        Guarda el snapshot en etl.run_metric y los contadores de etl.run.
+        No hace commit.
+        """
+        from psycopg2.extras import execute_values
+
+        snapshot = snapshot if snapshot is not None else self.snapshot()
+        rows = [(self.run_id, metric, label, value) for metric, label, value in snapshot]
+        with conn.cursor() as cur:
+            execute_values(
+                cur,
+                """
+                INSERT INTO etl.run_metric (run_id, metric, label, value)
+                VALUES %s
+                ON CONFLICT (run_id, metric, label)
+                DO UPDATE SET value = EXCLUDED.value, recorded_at = now()
+                """,
+                rows,
+                page_size=len(rows),
+            )
+            cur.execute(
+                """
+                UPDATE etl.run
+                SET matches_discovered      = %s,
+                    matches_processed_ok    = %s,
+                    matches_processed_error = %s
+                WHERE run_id = %s
+                """,
+                (self.matches_discovered, self.matches_ok, self.matches_error, self.run_id),
+            )
@@ -0,0 +1,73 @@
+"""
+Exportador a archivo de texto en formato de exposición de Prometheus,
+pensado para el textfile collector de node_exporter
+(--collector.textfile.directory).
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+from typing import Dict, List, Sequence, Tuple
+
+_PREFIX: str = "fifth_referee_etl"
+
+# metric -> (nombre de la etiqueta, HELP)
+_METRICS: Dict[str, Tuple[str, str]] = {
+    "duration_seconds": ("", "Wall time of the last ETL run."),
+    "matches_discovered": ("", "Matches discovered in the last run."),
+    "matches_ok": ("", "Matches processed successfully in the last run."),
+    "matches_error": ("", "Matches that failed in the last run."),
+    "batches_failed": ("", "Batches that failed and were retried match by match in the last run."),
+    "matches_per_second": ("", "Processed matches per second in the last run."),
+    "db_round_trips": ("", "Statements sent to PostgreSQL in the last run."),
+    "match_latency_p50_seconds": ("", "Median per-match latency in the last run."),
+    "match_latency_p95_seconds": ("", "95th percentile per-match latency in the last run."),
+    "stage_seconds": ("stage", "Time spent per ETL stage in the last run."),
+    "rows_inserted": ("table", "Rows inserted per target table in the last run."),
+    "rows_updated": ("table", "Rows updated per target table in the last run."),
+}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render(snapshot: Sequence[Tuple[str, str, float]], run_id: int) -> str:
+    by_metric: Dict[str, List[Tuple[str, float]]] = {}
+    for metric, label, value in snapshot:
+        by_metric.setdefault(metric, []).append((label, value))
+
+    lines: List[str] = [
+        f"# HELP {_PREFIX}_last_run_id Identifier of the last ETL run (etl.run.run_id).",
+        f"# TYPE {_PREFIX}_last_run_id gauge",
+        f"{_PREFIX}_last_run_id {run_id}",
+    ]
+    for metric, samples in by_metric.items():
+        label_name, help_text = _METRICS.get(metric, ("label", metric))
+        name = f"{_PREFIX}_{metric}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        for label, value in samples:
+            if label_name and label:
+                lines.append(f'{name}{{{label_name}="{_escape(label)}"}} {value:g}')
+            else:
+                lines.append(f"{name} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: str, snapshot: Sequence[Tuple[str, str, float]], run_id: int) -> None:
+    """
+    Escribe el archivo de forma atómica (temporal + rename en el mismo
+    directorio) para que node_exporter nunca lea un archivo a medias.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".etl_metrics_", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(render(snapshot, run_id))
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
@@ -1,15 +1,24 @@
 from .models import (
     RawMatchRecord,
     RawParticipationRecord,
+    RawParticipationRow,
     RawPlayerStatRecord,
+    RawPlayerStatRow,
+    RawWideStatRow,
     RawMatchBundle,
 )
 from .repository import RawAccessRepository
+from .stat_names import StatNameDictionary, get_stat_name_dictionary
 
 __all__ = [
     "RawMatchRecord",
     "RawParticipationRecord",
+    "RawParticipationRow",
     "RawPlayerStatRecord",
+    "RawPlayerStatRow",
+    "RawWideStatRow",
     "RawMatchBundle",
     "RawAccessRepository",
+    "StatNameDictionary",
+    "get_stat_name_dictionary",
 ]
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class RawStatColumns:
+    """
+    Columnar form of raw.player_match_stat for a batch of matches.
+
+    Rows are ordered by (match_id, player_id). ``stat_code`` indexes into
+    ``stat_names``; NULL numeric values are NaN. ``raw_value`` is not kept:
+    the parsed value columns are what the transform consumes.
+    """
+
+    match_id: np.ndarray
+    player_id: np.ndarray
+    stat_code: np.ndarray
+    stat_names: Tuple[str, ...]
+    value_numeric: np.ndarray
+    value_ratio_num: np.ndarray
+    value_ratio_den: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.match_id.shape[0])
+
+    def match_slices(self) -> Dict[int, slice]:
+        """Returns the contiguous row range of every match in the batch."""
+        if len(self) == 0:
+            return {}
+        ids, starts = np.unique(self.match_id, return_index=True)
+        ends = list(starts[1:]) + [len(self)]
+        return {int(m): slice(int(s), int(e)) for m, s, e in zip(ids, starts, ends)}
+
+    def for_match(self, match_id: int) -> "RawStatColumns":
+        lo = int(np.searchsorted(self.match_id, match_id, side="left"))
+        hi = int(np.searchsorted(self.match_id, match_id, side="right"))
+        return RawStatColumns(
+            match_id=self.match_id[lo:hi],
+            player_id=self.player_id[lo:hi],
+            stat_code=self.stat_code[lo:hi],
+            stat_names=self.stat_names,
+            value_numeric=self.value_numeric[lo:hi],
+            value_ratio_num=self.value_ratio_num[lo:hi],
+            value_ratio_den=self.value_ratio_den[lo:hi],
+        )
+
+
+def stat_columns_from_rows(
+    rows: Iterable[Sequence[object]],
+    resolve_names: Optional[Callable[[Iterable[int]], Mapping[int, str]]] = None,
+) -> RawStatColumns:
+    """
+    Builds RawStatColumns from tuple rows in the SELECT order used by
+    RawAccessRepository (match_id, player_id, stat_name_id, raw_value,
+    value_numeric, value_ratio_num, value_ratio_den).
+
+    With ``resolve_names`` the third column holds raw.stat_name ids: rows
+    are factorized on the small integer and only the distinct ids are
+    decoded to names. Without it the third column is taken as the name.
+    """
+    match_ids: List[object] = []
+    player_ids: List[object] = []
+    names: List[object] = []
+    numeric: List[object] = []
+    ratio_num: List[object] = []
+    ratio_den: List[object] = []
+
+    for row in rows:
+        match_ids.append(row[0])
+        player_ids.append(row[1])
+        names.append(row[2])
+        numeric.append(row[4])
+        ratio_num.append(row[5])
+        ratio_den.append(row[6])
+
+    codes: Dict[object, int] = {}
+    stat_code = np.fromiter(
+        (codes.setdefault(n, len(codes)) for n in names),
+        dtype=np.int16,
+        count=len(names),
+    )
+
+    return RawStatColumns(
+        match_id=np.asarray(match_ids, dtype=np.int32),
+        player_id=np.asarray(player_ids, dtype=np.int32),
+        stat_code=stat_code,
+        stat_names=_code_names(codes, resolve_names),
+        value_numeric=np.asarray(numeric, dtype=np.float64),
+        value_ratio_num=np.asarray(ratio_num, dtype=np.float64),
+        value_ratio_den=np.asarray(ratio_den, dtype=np.float64),
+    )
+
+
+def _code_names(
+    codes: Dict[object, int],
+    resolve_names: Optional[Callable[[Iterable[int]], Mapping[int, str]]],
+) -> Tuple[str, ...]:
+    if resolve_names is None:
+        return tuple(str(n) for n in codes)
+    names = resolve_names(codes)  # type: ignore[arg-type]
+    return tuple(names[n] for n in codes)  # type: ignore[index]
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
 
 
 @dataclass(frozen=True)
@@ -44,6 +44,52 @@ class RawPlayerStatRecord:
     value_ratio_den: Optional[int]
 
 
+class RawParticipationRow(NamedTuple):
+    """
+    Lean variant of RawParticipationRecord, built positionally from a
+    tuple cursor row (same column order as the SELECT).
+    """
+
+    match_id: int
+    player_id: int
+    team_id: int
+    jersey_number: Optional[int]
+    position: Optional[str]
+    status: Optional[int]
+
+
+class RawPlayerStatRow(NamedTuple):
+    """
+    Lean variant of RawPlayerStatRecord, built positionally from a
+    tuple cursor row (same column order as the SELECT).
+    """
+
+    match_id: int
+    player_id: int
+    stat_name: str
+    raw_value: str
+    value_numeric: Optional[float]
+    value_ratio_num: Optional[int]
+    value_ratio_den: Optional[int]
+
+
+@dataclass(frozen=True)
+class RawWideStatRow:
+    """
+    Stats of one (match, player) already pivoted in Postgres.
+
+    ``basic`` holds the core.basic_stats columns; ``role`` the columns of
+    the stats.<role>_stats table matching ``position`` (empty when the
+    position has no role table).
+    """
+
+    match_id: int
+    player_id: int
+    position: Optional[str]
+    basic: Dict[str, Optional[float]]
+    role: Dict[str, Optional[float]]
+
+
 @dataclass(frozen=True)
 class RawMatchBundle:
     match: RawMatchRecord
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from etl.config.stat_mapping import (
+    SOURCE_PATTERN,
+    SOURCE_RATIO_DEN,
+    StatColumn,
+    StatGroup,
+    StatMapping,
+    normalize_position,
+    position_aliases,
+)
+
+from .models import RawMatchBundle, RawWideStatRow
+
+_LEADING_NUMBER = re.compile(r"^[0-9]+(?:\.[0-9]+)?")
+
+# Valor "escalar" de una estadística: el numerador de "n/m (xx%)" (no el
+# porcentaje), el numérico parseado o, en último caso, el número al inicio
+# de raw_value ("90'").
+_VALUE_EXPR: str = (
+    "COALESCE(s.value_ratio_num, s.value_numeric, "
+    "substring(s.raw_value FROM '^[0-9]+(?:\\.[0-9]+)?')::double precision)"
+)
+# Los ids de raw.stat_name son positivos: este valor representa una
+# estadística que todavía no está en el diccionario (no matchea filas).
+_NO_STAT_ID: int = -1
+
+_RATIO_DEN_EXPR: str = "s.value_ratio_den::double precision"
+_PATTERN_EXPR: str = "substring(s.raw_value FROM %s)::double precision"
+
+
+@dataclass(frozen=True)
+class _StatRef:
+    """Placeholder for a stat_name_id, resolved per execution (see params)."""
+
+    name: str
+
+
+@dataclass(frozen=True)
+class WideStatQuery:
+    """
+    Pivot query generated from a StatMapping.
+
+    ``sql`` expects ``select_params + (match_ids, min_id, max_id,
+    stat_name_ids)`` (the bounds keep the partitioned stat table prunable,
+    see repository._STAT_MATCH_FILTER); build it with ``params``, which
+    resolves stat names to raw.stat_name ids. ``layout``
+    lists, in SELECT order after (match_id, player_id, position), the
+    target columns of every group.
+    """
+
+    sql: str
+    select_params: Tuple[Any, ...]
+    stat_names: Tuple[str, ...]
+    layout: Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+    def params(
+        self, match_ids: Sequence[int], stat_ids: Mapping[str, int]
+    ) -> Tuple[Any, ...]:
+        """
+        ``stat_ids`` maps stat names to raw.stat_name ids; names missing
+        from it (never ingested) match no row.
+        """
+        ids = list(match_ids)
+        select_params = tuple(
+            stat_ids.get(p.name, _NO_STAT_ID) if isinstance(p, _StatRef) else p
+            for p in self.select_params
+        )
+        wanted = [stat_ids[n] for n in self.stat_names if n in stat_ids]
+        return select_params + (ids, min(ids), max(ids), wanted)
+
+    def decode(self, row: Sequence[Any], mapping: StatMapping) -> RawWideStatRow:
+        position = normalize_position(row[2])
+        role_group = mapping.role_for_position(position)
+        basic: Dict[str, Optional[float]] = {}
+        role: Dict[str, Optional[float]] = {}
+
+        offset = 3
+        for group_name, columns in self.layout:
+            width = len(columns)
+            if group_name == mapping.basic.name:
+                basic = dict(zip(columns, row[offset:offset + width]))
+            elif role_group is not None and group_name == role_group.name:
+                role = dict(zip(columns, row[offset:offset + width]))
+            offset += width
+
+        return RawWideStatRow(
+            match_id=int(row[0]),
+            player_id=int(row[1]),
+            position=position,
+            basic=basic,
+            role=role,
+        )
+
+
+def _aggregate(col: StatColumn, group: StatGroup, params: List[Any]) -> str:
+    if col.source == SOURCE_RATIO_DEN:
+        expr = _RATIO_DEN_EXPR
+    elif col.source == SOURCE_PATTERN:
+        expr = _PATTERN_EXPR
+        params.append(col.pattern)
+    else:
+        expr = _VALUE_EXPR
+
+    condition = "s.stat_name_id = %s"
+    params.append(_StatRef(col.stat_name))
+    if group.position is not None:
+        # Las columnas de rol solo se calculan para jugadores de ese rol.
+        condition += " AND pm.position = ANY(%s)"
+        params.append(list(position_aliases(group.position)))
+
+    return f"max({expr}) FILTER (WHERE {condition})"
+
+
+@lru_cache(maxsize=8)
+def build_wide_stat_query(mapping: StatMapping) -> WideStatQuery:
+    """
+    Genera un SELECT con un aggregate FILTER por columna destino.
+
+    Una columna alimentada por varias estadísticas (p. ej. passes_total desde
+    "Pases totales" o desde el denominador de "Pases completados") se resuelve
+    con COALESCE en el orden del mapeo. Las estadísticas (como
+    stat_name_id, resueltos en WideStatQuery.params) y los patrones viajan
+    como parámetros; las columnas ya vienen validadas por
+    load_stat_mapping.
+    """
+    select_exprs: List[str] = []
+    params: List[Any] = []
+    layout: List[Tuple[str, Tuple[str, ...]]] = []
+
+    for group in mapping.groups():
+        by_column: Dict[str, List[StatColumn]] = {}
+        for col in group.columns:
+            by_column.setdefault(col.column, []).append(col)
+
+        for column, sources in by_column.items():
+            aggregates = [_aggregate(col, group, params) for col in sources]
+            if len(aggregates) == 1:
+                expr = aggregates[0]
+            else:
+                expr = f"COALESCE({', '.join(aggregates)})"
+            select_exprs.append(f'{expr} AS "{group.name}__{column}"')
+
+        layout.append((group.name, tuple(by_column)))
+
+    select_list = ",\n           ".join(select_exprs)
+    sql = f"""
+    SELECT s.match_id, s.player_id, pm.position,
+           {select_list}
+    FROM raw.player_match_stat s
+    LEFT JOIN raw.player_match pm
+           ON pm.match_id = s.match_id
+          AND pm.player_id = s.player_id
+    WHERE s.match_id = ANY(%s)
+      AND s.match_id BETWEEN %s AND %s
+      AND s.stat_name_id = ANY(%s::smallint[])
+    GROUP BY s.match_id, s.player_id, pm.position
+    ORDER BY s.match_id, s.player_id
+    """
+
+    return WideStatQuery(
+        sql=sql,
+        select_params=tuple(params),
+        stat_names=mapping.stat_names(),
+        layout=tuple(layout),
+    )
+
+
+def _python_value(col: StatColumn, stat: Any) -> Optional[float]:
+    if col.source == SOURCE_RATIO_DEN:
+        den = stat.value_ratio_den
+        return float(den) if den is not None else None
+    if col.source == SOURCE_PATTERN:
+        found = re.search(col.pattern or "", stat.raw_value or "")
+        if found is None:
+            return None
+        return float(found.group(1) if found.groups() else found.group(0))
+    if stat.value_ratio_num is not None:
+        return float(stat.value_ratio_num)
+    if stat.value_numeric is not None:
+        return float(stat.value_numeric)
+    leading = _LEADING_NUMBER.match(stat.raw_value or "")
+    return float(leading.group(0)) if leading else None
+
+
+def _pivot_group(group: StatGroup, stats: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    values: Dict[str, Optional[float]] = {name: None for name in group.column_names()}
+    for col in group.columns:
+        if values[col.column] is not None:
+            continue  # mismo COALESCE en orden del mapeo que la versión SQL
+        stat = stats.get(col.stat_name)
+        if stat is not None:
+            values[col.column] = _python_value(col, stat)
+    return values
+
+
+def pivot_bundle_stats(
+    bundle: RawMatchBundle, mapping: StatMapping
+) -> List[RawWideStatRow]:
+    """
+    Equivalente en Python de build_wide_stat_query para un bundle ya
+    cargado (mismas reglas de valor, una fila por jugador con estadísticas
+    mapeadas, ordenadas por player_id).
+    """
+    known = set(mapping.stat_names())
+    positions = {p.player_id: p.position for p in bundle.participations}
+
+    by_player: Dict[int, Dict[str, Any]] = {}
+    for stat in bundle.stats:
+        if stat.stat_name in known:
+            by_player.setdefault(stat.player_id, {})[stat.stat_name] = stat
+
+    rows: List[RawWideStatRow] = []
+    for player_id in sorted(by_player):
+        stats = by_player[player_id]
+        position = normalize_position(positions.get(player_id))
+        role_group = mapping.role_for_position(position)
+        rows.append(
+            RawWideStatRow(
+                match_id=bundle.match.match_id,
+                player_id=player_id,
+                position=position,
+                basic=_pivot_group(mapping.basic, stats),
+                role=_pivot_group(role_group, stats) if role_group else {},
+            )
+        )
+    return rows
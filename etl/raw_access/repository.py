@@ -1,18 +1,97 @@
 from __future__ import annotations
 
-from typing import Any, Iterable, List, Optional, Sequence, Tuple
+import itertools
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 try:
     from psycopg2.extensions import connection as PGConnection
+    from psycopg2.extensions import cursor as TupleCursor
 except ImportError:  # pragma: no cover
     PGConnection = Any  # type: ignore
+    TupleCursor = None  # type: ignore
+
+if TYPE_CHECKING:  # pragma: no cover
+    from etl.config.stat_mapping import StatMapping
+
+    from .columnar import RawStatColumns
 
 from .models import (
     RawMatchBundle,
     RawMatchRecord,
     RawParticipationRecord,
+    RawParticipationRow,
     RawPlayerStatRecord,
+    RawPlayerStatRow,
+    RawWideStatRow,
 )
+from .stat_names import StatNameDictionary, get_stat_name_dictionary
+
+
+DEFAULT_ITERSIZE: int = 5000
+
+# raw.player_match_stat is range-partitioned by match_id. The explicit
+# BETWEEN bound lets the planner prune partitions from a plain range
+# comparison, even when the ANY(...) array is large or only known at
+# execution time.
+_STAT_MATCH_FILTER: str = "match_id = ANY(%s) AND match_id BETWEEN %s AND %s"
+
+_STATS_BATCH_SQL: str = f"""
+    SELECT match_id, player_id, stat_name_id,
+           raw_value, value_numeric,
+           value_ratio_num, value_ratio_den
+    FROM raw.player_match_stat
+    WHERE {_STAT_MATCH_FILTER}
+    ORDER BY match_id, player_id
+"""
+
+
+def _stat_match_params(match_ids: Sequence[int]) -> Tuple[List[int], int, int]:
+    """Parameters for _STAT_MATCH_FILTER (match_ids must not be empty)."""
+    ids = list(match_ids)
+    return ids, min(ids), max(ids)
+
+_cursor_ids = itertools.count(1)
+
+
+class _GroupedStream:
+    """
+    Wraps an iterator of rows ordered by match_id and hands them out one
+    match at a time, keeping at most one look-ahead row in memory.
+    """
+
+    def __init__(self, rows: Iterable[Any], convert: Callable[[Any], Any]) -> None:
+        self._rows = iter(rows)
+        self._convert = convert
+        self._pending: Any = None
+
+    def take(self, match_id: int) -> Tuple[Any, ...]:
+        group: List[Any] = []
+        while True:
+            if self._pending is None:
+                row = next(self._rows, None)
+                if row is None:
+                    break
+                self._pending = self._convert(row)
+
+            record = self._pending
+            if record.match_id > match_id:
+                break
+            self._pending = None
+            if record.match_id == match_id:
+                group.append(record)
+            # rows for match_ids without a raw.match row are skipped
+        return tuple(group)
 
 
 class RawAccessRepository:
@@ -20,8 +99,16 @@ class RawAccessRepository:
     Provides typed accessors for raw.match, raw.player_match y raw.player_match_stat.
     """
 
-    def __init__(self, conn: PGConnection) -> None:
+    def __init__(
+        self,
+        conn: PGConnection,
+        stat_names: Optional[StatNameDictionary] = None,
+    ) -> None:
         self._conn = conn
+        # raw.player_match_stat stores stat_name_id; names are decoded here.
+        self._stat_names = (
+            stat_names if stat_names is not None else get_stat_name_dictionary()
+        )
 
     def load_match_bundle(self, match_id: int) -> Optional[RawMatchBundle]:
         match = self._fetch_match(match_id)
@@ -37,15 +124,20 @@ class RawAccessRepository:
         )
 
     def load_match_bundles(
-        self, match_ids: Sequence[int]
+        self, match_ids: Sequence[int], include_stats: bool = True
     ) -> List[RawMatchBundle]:
+        """
+        Loads the bundles of a batch. With ``include_stats=False``
+        raw.player_match_stat is not read (for callers that get the stats
+        already pivoted through load_wide_stat_rows).
+        """
         if not match_ids:
             return []
 
         matches = self._fetch_matches(match_ids)
         bundles: List[RawMatchBundle] = []
         parts_by_match = self._fetch_participations_grouped(match_ids)
-        stats_by_match = self._fetch_stats_grouped(match_ids)
+        stats_by_match = self._fetch_stats_grouped(match_ids) if include_stats else {}
 
         for match in matches:
             bundles.append(
@@ -57,10 +149,176 @@ class RawAccessRepository:
             )
         return bundles
 
+    def iter_match_bundles(
+        self,
+        match_ids: Sequence[int],
+        itersize: int = DEFAULT_ITERSIZE,
+        lean: bool = False,
+    ) -> Iterator[RawMatchBundle]:
+        """
+        Streams complete bundles one match at a time, in match_id order.
+
+        Uses named (server-side) cursors so that only ``itersize`` rows per
+        table are held client-side at once, instead of materializing every
+        stat row of the requested matches. Named cursors live inside the
+        current transaction, so the caller must not commit until the
+        iterator is exhausted or closed.
+
+        With ``lean=True`` participations and stats are read through tuple
+        cursors and decoded positionally into RawParticipationRow /
+        RawPlayerStatRow, skipping the per-row dict and per-field casts.
+        """
+        if not match_ids:
+            return
+
+        ids = list(match_ids)
+        row_factory = TupleCursor if lean else None
+        to_part = RawParticipationRow._make if lean else self._row_to_participation
+        name = self._stat_name
+        if lean:
+            def to_stat(r: Any) -> RawPlayerStatRow:
+                return RawPlayerStatRow(r[0], r[1], name(r[2]), r[3], r[4], r[5], r[6])
+        else:
+            def to_stat(r: Any) -> RawPlayerStatRecord:
+                return self._row_to_stat(r, name(r["stat_name_id"]))
+        with self._named_cursor("matches", itersize) as match_cur, \
+                self._named_cursor("parts", itersize, row_factory) as part_cur, \
+                self._named_cursor("stats", itersize, row_factory) as stat_cur:
+            match_cur.execute(
+                """
+                SELECT match_id, competition, season, matchday,
+                       local_team_id, away_team_id,
+                       local_score, away_score,
+                       stadium, duration,
+                       source_system, source_url,
+                       ran_at, raw_run_id
+                FROM raw.match
+                WHERE match_id = ANY(%s)
+                ORDER BY match_id
+                """,
+                (ids,),
+            )
+            part_cur.execute(
+                """
+                SELECT match_id, player_id, team_id,
+                       jersey_number, position, status
+                FROM raw.player_match
+                WHERE match_id = ANY(%s)
+                ORDER BY match_id, player_id
+                """,
+                (ids,),
+            )
+            stat_cur.execute(
+                f"""
+                SELECT match_id, player_id, stat_name_id,
+                       raw_value, value_numeric,
+                       value_ratio_num, value_ratio_den
+                FROM raw.player_match_stat
+                WHERE {_STAT_MATCH_FILTER}
+                ORDER BY match_id, player_id
+                """,
+                _stat_match_params(ids),
+            )
+
+            parts = _GroupedStream(part_cur, to_part)
+            stats = _GroupedStream(stat_cur, to_stat)
+            for row in match_cur:
+                match = self._row_to_match(row)
+                yield RawMatchBundle(
+                    match=match,
+                    participations=parts.take(match.match_id),
+                    stats=stats.take(match.match_id),
+                )
+
+    def load_stat_rows(self, match_ids: Sequence[int]) -> List[RawPlayerStatRow]:
+        """
+        Fast decode path: stats for a batch as RawPlayerStatRow tuples,
+        ordered by (match_id, player_id).
+        """
+        if not match_ids:
+            return []
+
+        with self._tuple_cursor() as cur:
+            cur.execute(_STATS_BATCH_SQL, _stat_match_params(match_ids))
+            rows = cur.fetchall()
+
+        names = self._names_for(row[2] for row in rows)
+        return [
+            RawPlayerStatRow(r[0], r[1], names[r[2]], r[3], r[4], r[5], r[6])
+            for r in rows
+        ]
+
+    def load_stat_columns(self, match_ids: Sequence[int]) -> "RawStatColumns":
+        """
+        Columnar decode path: stats for a batch as NumPy arrays
+        (see RawStatColumns). Requires numpy.
+        """
+        from .columnar import stat_columns_from_rows
+
+        if not match_ids:
+            return stat_columns_from_rows(())
+
+        with self._tuple_cursor() as cur:
+            cur.execute(_STATS_BATCH_SQL, _stat_match_params(match_ids))
+            rows = cur.fetchall()
+
+        return stat_columns_from_rows(rows, resolve_names=self._names_for)
+
+    def load_wide_stat_rows(
+        self,
+        match_ids: Sequence[int],
+        mapping: Optional["StatMapping"] = None,
+    ) -> List[RawWideStatRow]:
+        """
+        Stats for a batch already pivoted in Postgres: one RawWideStatRow per
+        (match, player), ordered by (match_id, player_id).
+
+        The SELECT is generated from the stat mapping (one FILTER aggregate
+        per target column), so only mapped stats leave the database and each
+        player travels as a single row instead of one row per stat.
+        """
+        from etl.config.stat_mapping import load_stat_mapping
+
+        from .pivot import build_wide_stat_query
+
+        if not match_ids:
+            return []
+
+        mapping = mapping or load_stat_mapping()
+        query = build_wide_stat_query(mapping)
+        stat_ids = self._stat_names.ids_for(self._conn, query.stat_names)
+        with self._tuple_cursor() as cur:
+            cur.execute(query.sql, query.params(match_ids, stat_ids))
+            rows = cur.fetchall()
+
+        return [query.decode(row, mapping) for row in rows]
+
     # ------------------------------------------------------------
     # Internal fetchers
     # ------------------------------------------------------------
 
+    def _stat_name(self, stat_name_id: int) -> str:
+        return self._stat_names.name(self._conn, stat_name_id)
+
+    def _names_for(self, stat_name_ids: Iterable[int]) -> Mapping[int, str]:
+        return self._stat_names.names_by_id(self._conn, set(stat_name_ids))
+
+    def _tuple_cursor(self) -> Any:
+        if TupleCursor is None:  # pragma: no cover
+            return self._conn.cursor()
+        return self._conn.cursor(cursor_factory=TupleCursor)
+
+    def _named_cursor(
+        self, label: str, itersize: int, cursor_factory: Any = None
+    ) -> Any:
+        name = f"raw_access_{label}_{next(_cursor_ids)}"
+        if cursor_factory is None:
+            cur = self._conn.cursor(name=name)
+        else:
+            cur = self._conn.cursor(name=name, cursor_factory=cursor_factory)
+        cur.itersize = itersize
+        return cur
+
     def _fetch_match(self, match_id: int) -> Optional[RawMatchRecord]:
         with self._conn.cursor() as cur:
             cur.execute(
@@ -144,7 +402,7 @@ class RawAccessRepository:
         with self._conn.cursor() as cur:
             cur.execute(
                 """
-                SELECT match_id, player_id, stat_name,
+                SELECT match_id, player_id, stat_name_id,
                        raw_value, value_numeric,
                        value_ratio_num, value_ratio_den
                 FROM raw.player_match_stat
@@ -154,7 +412,8 @@ class RawAccessRepository:
             )
             rows = cur.fetchall()
 
-        return [self._row_to_stat(row) for row in rows]
+        names = self._names_for(row["stat_name_id"] for row in rows)
+        return [self._row_to_stat(row, names[row["stat_name_id"]]) for row in rows]
 
     def _fetch_stats_grouped(
         self, match_ids: Sequence[int]
@@ -164,21 +423,22 @@ class RawAccessRepository:
 
         with self._conn.cursor() as cur:
             cur.execute(
-                """
-                SELECT match_id, player_id, stat_name,
+                f"""
+                SELECT match_id, player_id, stat_name_id,
                        raw_value, value_numeric,
                        value_ratio_num, value_ratio_den
                 FROM raw.player_match_stat
-                WHERE match_id = ANY(%s)
+                WHERE {_STAT_MATCH_FILTER}
                 ORDER BY match_id
                 """,
-                (list(match_ids),),
+                _stat_match_params(match_ids),
             )
             rows = cur.fetchall()
 
+        names = self._names_for(row["stat_name_id"] for row in rows)
         grouped: dict[int, List[RawPlayerStatRecord]] = {}
         for row in rows:
-            stat = self._row_to_stat(row)
+            stat = self._row_to_stat(row, names[row["stat_name_id"]])
             grouped.setdefault(stat.match_id, []).append(stat)
         return {k: tuple(v) for k, v in grouped.items()}
 
@@ -218,11 +478,11 @@ class RawAccessRepository:
         )
 
     @staticmethod
-    def _row_to_stat(row: dict) -> RawPlayerStatRecord:
+    def _row_to_stat(row: dict, stat_name: str) -> RawPlayerStatRecord:
         return RawPlayerStatRecord(
             match_id=int(row["match_id"]),
             player_id=int(row["player_id"]),
-            stat_name=str(row["stat_name"]),
+            stat_name=stat_name,
             raw_value=str(row["raw_value"]),
             value_numeric=row.get("value_numeric"),
             value_ratio_num=row.get("value_ratio_num"),
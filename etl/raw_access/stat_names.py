@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, FrozenSet, Iterable, Mapping, Optional, Sequence
+
+
+class StatNameDictionary:
+    """
+    In-memory cache of raw.stat_name (smallint ``stat_name_id`` <-> text).
+
+    raw.player_match_stat stores only the id; readers decode ids back to
+    names here and writers/queries resolve names to ids. Entries are
+    append-only in the database, so the cache never goes stale for the ids
+    it already holds: a miss triggers one reload of the (small) table.
+    Names still missing after that reload are remembered for ``absent_ttl``
+    seconds, so stats of the mapping that never show up in the data don't
+    reload it on every call, while a long-lived worker still picks up a
+    name that is added to raw.stat_name later.
+    """
+
+    def __init__(
+        self, entries: Optional[Mapping[int, str]] = None, absent_ttl: float = 60.0
+    ) -> None:
+        self._lock = threading.Lock()
+        self._by_id: Dict[int, str] = {}
+        self._by_name: Dict[str, int] = {}
+        # Names looked up and not found in raw.stat_name (negative cache).
+        self._absent: FrozenSet[str] = frozenset()
+        self._absent_expires_at = 0.0
+        self.absent_ttl = absent_ttl
+        if entries:
+            self._replace(entries)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def load(self, conn: Any) -> None:
+        """(Re)loads the whole dictionary."""
+        with conn.cursor() as cur:
+            cur.execute("SELECT stat_name_id, stat_name FROM raw.stat_name")
+            rows = cur.fetchall()
+        entries: Dict[int, str] = {}
+        for row in rows:
+            if isinstance(row, Mapping):
+                entries[int(row["stat_name_id"])] = str(row["stat_name"])
+            else:
+                entries[int(row[0])] = str(row[1])
+        self._replace(entries)
+
+    def names_by_id(self, conn: Any, ids: Iterable[int]) -> Dict[int, str]:
+        """
+        The id -> name map, guaranteed to cover ``ids`` (reloads once on a
+        miss). Hot loops should grab this once per batch and index it.
+        """
+        by_id = self._by_id
+        if any(i not in by_id for i in ids):
+            self.load(conn)
+            by_id = self._by_id
+        return by_id
+
+    def name(self, conn: Any, stat_name_id: int) -> str:
+        try:
+            return self._by_id[stat_name_id]
+        except KeyError:
+            self.load(conn)
+            return self._by_id[stat_name_id]
+
+    def ids_for(
+        self, conn: Any, names: Sequence[str], create: bool = False
+    ) -> Dict[str, int]:
+        """
+        Resolves names to ids. Unknown names are left out, unless
+        ``create`` is set, in which case they are inserted first (for raw
+        writers).
+        """
+        by_name, absent = self._by_name, self._absent
+        if absent and time.monotonic() >= self._absent_expires_at:
+            absent = frozenset()
+        missing = [n for n in names if n not in by_name and (create or n not in absent)]
+        if missing:
+            if create:
+                from psycopg2.extras import execute_values
+
+                with conn.cursor() as cur:
+                    execute_values(
+                        cur,
+                        """
+                        INSERT INTO raw.stat_name (stat_name)
+                        VALUES %s
+                        ON CONFLICT (stat_name) DO NOTHING
+                        """,
+                        [(n,) for n in dict.fromkeys(missing)],
+                    )
+            self.load(conn)
+            by_name = self._by_name
+            with self._lock:
+                if create:
+                    self._absent = frozenset()
+                else:
+                    now = time.monotonic()
+                    if now >= self._absent_expires_at:
+                        self._absent, self._absent_expires_at = frozenset(), now + self.absent_ttl
+                    self._absent = self._absent.union(n for n in missing if n not in by_name)
+        return {n: by_name[n] for n in names if n in by_name}
+
+    def _replace(self, entries: Mapping[int, str]) -> None:
+        by_id = dict(entries)
+        by_name = {name: i for i, name in by_id.items()}
+        with self._lock:
+            # A grown table may now hold names remembered as absent.
+            if len(by_id) > len(self._by_id):
+                self._absent = frozenset()
+            # Swap whole dicts so concurrent readers never see a half-built map.
+            self._by_id, self._by_name = by_id, by_name
+
+
+_DICTIONARY: Optional[StatNameDictionary] = None
+_DICTIONARY_LOCK = threading.Lock()
+
+
+def get_stat_name_dictionary() -> StatNameDictionary:
+    """Process-wide dictionary (loaded lazily on first miss)."""
+    global _DICTIONARY
+    with _DICTIONARY_LOCK:
+        if _DICTIONARY is None:
+            _DICTIONARY = StatNameDictionary()
+        return _DICTIONARY
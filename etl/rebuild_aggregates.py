@@ -0,0 +1,73 @@
+"""
+Reconstrucción bajo demanda de los agregados que mantiene el ETL:
+
+  - core.standings            (core.refresh_standings)
+  - core.player_season_stats  (core.refresh_player_season_stats)
+
+El ETL los refresca de forma incremental al cargar partidos; esto sirve
+tras cargas por fuera del ETL, correcciones manuales o una migración.
+Cada temporada va en su propia transacción; si algo cambió, también sube
+su versión de datos (core.season_version).
+
+Uso:
+    python -m etl.rebuild_aggregates --season-id 12
+    python -m etl.rebuild_aggregates --all
+"""
+from __future__ import annotations
+
+import argparse
+from typing import List, Optional, Sequence
+
+from psycopg2.extensions import connection as PGConnection
+
+from etl.db.connection import CountingTupleCursor
+from etl.db.pool import close_pool
+from etl.db.tx import db_connection, transaction
+from etl.transform.player_season import rebuild_player_season_stats
+from etl.transform.season_version import bump_season_version
+from etl.transform.standings import rebuild_standings
+
+
+def _all_season_ids(conn: PGConnection) -> List[int]:
+    with conn.cursor(cursor_factory=CountingTupleCursor) as cur:
+        cur.execute("SELECT season_id FROM core.season ORDER BY season_id")
+        return [int(r[0]) for r in cur.fetchall()]
+
+
+def rebuild_aggregates(season_ids: Optional[Sequence[int]] = None) -> None:
+    """Reconstruye los agregados de ``season_ids`` (None = todas)."""
+    with db_connection() as conn:
+        if season_ids is None:
+            with transaction(conn):
+                season_ids = _all_season_ids(conn)
+        for season_id in season_ids:
+            with transaction(conn):
+                with conn.cursor(cursor_factory=CountingTupleCursor) as cur:
+                    standings = rebuild_standings(cur, season_id)
+                    players = rebuild_player_season_stats(cur, season_id)
+                    if any(standings) or any(players):
+                        bump_season_version(cur, season_id)
+            print(
+                f"season {season_id}: standings +{standings[0]}/~{standings[1]}, "
+                f"player_season_stats +{players[0]}/~{players[1]}"
+            )
+
+
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuild ETL-maintained aggregates")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--season-id", type=int, action="append", dest="season_ids")
+    target.add_argument("--all", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = _parse_args(argv)
+    try:
+        rebuild_aggregates(None if args.all else args.season_ids)
+    finally:
+        close_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+from etl.backfill import _process_shard_batch, build_scope
+from etl.db.status_buffer import StatusBuffer
+from etl.metrics import RunMetrics
+
+
+class BackfillTests(unittest.TestCase):
+    def test_build_scope_requires_a_filter(self):
+        with self.assertRaises(ValueError):
+            build_scope()
+        scope = build_scope(competition="premier_league", season="2024_2025")
+        self.assertEqual("premier_league", scope["competition"])
+        self.assertIsNone(scope["match_id_from"])
+
+    def test_batch_never_touches_the_pending_queue(self):
+        buffer, metrics = StatusBuffer(run_id=1), RunMetrics(run_id=1)
+        with mock.patch("etl.backfill.process_batch", return_value={10: {}, 11: {}}) as batch:
+            ok, errors = _process_shard_batch(None, [10, 11], None, metrics, buffer)
+
+        self.assertEqual((2, 0), (ok, errors))
+        self.assertFalse(batch.call_args.kwargs["mark_done"])
+
+    def test_failed_batch_falls_back_to_single_matches(self):
+        buffer, metrics = StatusBuffer(run_id=1), RunMetrics(run_id=1)
+
+        def single(_conn, match_id, *_args, **kwargs):
+            self.assertFalse(kwargs["mark_done"])
+            if match_id == 11:
+                raise ValueError("boom")
+            return {}
+
+        with mock.patch("etl.backfill.process_batch", return_value=None), \
+                mock.patch("etl.backfill.process_single", side_effect=single):
+            ok, errors = _process_shard_batch(None, [10, 11, 12], None, metrics, buffer)
+
+        self.assertEqual((2, 1), (ok, errors))
+        self.assertEqual(1, metrics.matches_error)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import unittest
+from unittest import mock
+
+from psycopg2 import InterfaceError, OperationalError
+
+from etl.metrics import RunMetrics
+from etl.transform.batch import process_batch
+
+
+class _FakeConnection:
+    def __init__(self, closed=0):
+        self.closed = closed
+        self.rollbacks = 0
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def _run(conn, error):
+    metrics = RunMetrics(run_id=1)
+    out = io.StringIO()
+    with mock.patch(
+        "etl.transform.batch.upsert_dimensions_for_match", side_effect=error
+    ), contextlib.redirect_stdout(out):
+        result = process_batch(conn, [10, 11], None, metrics)
+    return result, metrics, out.getvalue()
+
+
+class ProcessBatchTests(unittest.TestCase):
+    def test_failed_batch_is_logged_and_counted(self):
+        conn = _FakeConnection()
+        result, metrics, output = _run(conn, ValueError("bad row"))
+
+        self.assertIsNone(result)
+        self.assertEqual(1, conn.rollbacks)
+        self.assertEqual(1, metrics.batches_failed)
+        self.assertIn("ValueError: bad row", output)
+        self.assertIn(("batches_failed", "", 1.0), metrics.snapshot())
+
+    def test_lost_connection_propagates(self):
+        with self.assertRaises(OperationalError):
+            _run(_FakeConnection(closed=2), OperationalError("server closed the connection"))
+
+    def test_interface_error_propagates(self):
+        metrics = RunMetrics(run_id=1)
+        with self.assertRaises(InterfaceError), mock.patch(
+            "etl.transform.batch.upsert_dimensions_for_match",
+            side_effect=InterfaceError("connection already closed"),
+        ):
+            process_batch(_FakeConnection(), [10], None, metrics)
+        self.assertEqual(0, metrics.batches_failed)
+
+
+if __name__ == "__main__":
+    unittest.main()
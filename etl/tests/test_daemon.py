@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import unittest
+
+from etl.daemon import Debouncer
+
+
+class DebouncerTests(unittest.TestCase):
+    def test_fires_after_quiet_window(self):
+        debouncer = Debouncer(quiet_seconds=2.0, max_wait_seconds=10.0)
+        self.assertFalse(debouncer.pending)
+        self.assertIsNone(debouncer.deadline())
+
+        debouncer.notify(100.0)
+        debouncer.notify(101.0)
+        self.assertFalse(debouncer.due(102.5))
+        self.assertTrue(debouncer.due(103.0))
+        self.assertEqual(2, debouncer.count)
+
+    def test_max_wait_bounds_a_continuous_burst(self):
+        debouncer = Debouncer(quiet_seconds=2.0, max_wait_seconds=5.0)
+        for t in (0.0, 1.0, 2.0, 3.0, 4.0):
+            debouncer.notify(t)
+        # El canal nunca queda en silencio, pero el batch vence a los 5s
+        self.assertEqual(5.0, debouncer.deadline())
+        self.assertTrue(debouncer.due(5.0))
+
+        debouncer.reset()
+        self.assertFalse(debouncer.pending)
+        self.assertFalse(debouncer.due(100.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import unittest
+
+from psycopg2 import errors as pg_errors
+
+from etl.dimensions.exceptions import MissingDimensionData
+from etl.discovery.discovery import (
+    discover_pending_matches,
+    mark_match_done,
+    reschedule_match,
+)
+from etl.discovery.retry import (
+    ERROR_PERMANENT,
+    ERROR_TRANSIENT,
+    ERROR_UNKNOWN,
+    classify_error,
+)
+
+
+class _FakeCursor:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def execute(self, query, params=None):
+        self._conn.executed.append((" ".join(query.split()), params))
+
+    def fetchall(self):
+        return self._conn.rows
+
+    def fetchone(self):
+        return self._conn.rows[0] if self._conn.rows else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        return False
+
+
+class _FakeConnection:
+    def __init__(self, rows=None):
+        self.rows = rows or []
+        self.executed = []
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+
+class DiscoveryTests(unittest.TestCase):
+    def test_discover_reads_due_rows_from_queue(self):
+        conn = _FakeConnection(rows=[{"match_id": 7}, {"match_id": 3}])
+
+        pending = discover_pending_matches(conn, batch_size=50)
+
+        self.assertEqual([7, 3], pending)
+        query, params = conn.executed[0]
+        self.assertIn("FROM etl.pending_match", query)
+        self.assertIn("status = 'pending'", query)
+        self.assertIn("next_attempt_at <= now()", query)
+        self.assertNotIn("raw.match", query)
+        self.assertEqual((50,), params)
+
+    def test_mark_done_and_reschedule_target_single_match(self):
+        conn = _FakeConnection()
+
+        mark_match_done(conn, 11)
+        reschedule_match(conn, 12, error_code="ValueError", error_message="boom")
+
+        done_query, done_params = conn.executed[0]
+        self.assertIn("status = 'success'", done_query)
+        self.assertEqual((11,), done_params)
+
+        retry_query, retry_params = conn.executed[1]
+        self.assertIn("attempts = attempts + 1", retry_query)
+        self.assertEqual(12, retry_params["match_id"])
+        self.assertEqual("boom", retry_params["error_message"])
+        self.assertIsNone(retry_params["max_attempts"])
+
+    def test_reschedule_reports_dead_letter(self):
+        conn = _FakeConnection(rows=[{"status": "error"}])
+
+        status = reschedule_match(conn, 12, error_code="MissingDimensionData", permanent=True)
+
+        self.assertEqual("error", status)
+        query, params = conn.executed[0]
+        self.assertIn("THEN 'error' ELSE 'pending'", query)
+        self.assertTrue(params["permanent"])
+
+    def test_classify_error(self):
+        self.assertEqual(ERROR_PERMANENT, classify_error(MissingDimensionData("x")))
+        self.assertEqual(ERROR_TRANSIENT, classify_error(pg_errors.DeadlockDetected()))
+        self.assertEqual(ERROR_UNKNOWN, classify_error(KeyError("x")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+from etl.config.stat_mapping import load_stat_mapping
+from etl.dimensions.context import DimensionsContext, MatchdayInfo, SeasonInfo
+from etl.dimensions.exceptions import MissingDimensionData
+from etl.raw_access import (
+    RawMatchBundle,
+    RawMatchRecord,
+    RawParticipationRecord,
+    RawPlayerStatRecord,
+)
+from etl.raw_access.pivot import pivot_bundle_stats
+from etl.transform.match_transform import transform_matches
+
+
+def _bundle() -> RawMatchBundle:
+    def stat(player_id, name, raw, numeric=None, ratio=(None, None)):
+        return RawPlayerStatRecord(10, player_id, name, raw, numeric, ratio[0], ratio[1])
+
+    return RawMatchBundle(
+        match=RawMatchRecord(
+            match_id=10, competition="liga", season="2024_2025", matchday=3,
+            local_team_id=1, away_team_id=2, local_score=2, away_score=1,
+            stadium=None, duration=90, source_system=None, source_url=None,
+            ran_at=None, raw_run_id="run",
+        ),
+        participations=(
+            RawParticipationRecord(10, 7, 1, 9, "Attacker", 1),
+            RawParticipationRecord(10, 8, 2, 1, "GK", 2),
+            RawParticipationRecord(10, 99, 2, None, None, 5),
+        ),
+        stats=(
+            stat(7, "Minutes", "90'"),
+            stat(7, "Goles", "2(1Pen)"),
+            stat(7, "Pases completados", "20/25 (80%)", 80.0, (20, 25)),
+            stat(7, "Regates", "3/5 (60%)", None, (3, 5)),
+            stat(8, "Penales atajados", "1/2", None, (1, 2)),
+            stat(8, "Estadística desconocida", "4", 4.0),
+        ),
+    )
+
+
+def _context() -> DimensionsContext:
+    return DimensionsContext(
+        competition_id=1,
+        season=SeasonInfo(season_id=5, competition_id=1, season_label="2024_2025"),
+        matchday=MatchdayInfo(matchday_id=50, season_id=5, matchday_number=3),
+        season_teams={},
+        team_players={},
+    )
+
+
+class _FakeCursor:
+    def __init__(self):
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+
+    def fetchone(self):
+        return (0, 3)
+
+    def __exit__(self, *_args):
+        return False
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.cur = _FakeCursor()
+
+    def cursor(self, cursor_factory=None):
+        return self.cur
+
+
+class MatchTransformTests(unittest.TestCase):
+    def test_pivot_bundle_stats_applies_mapping_rules(self):
+        mapping = load_stat_mapping()
+        rows = {r.player_id: r for r in pivot_bundle_stats(_bundle(), mapping)}
+
+        forward = rows[7]
+        self.assertEqual("FW", forward.position)
+        self.assertEqual(90.0, forward.basic["minutes"])
+        self.assertEqual(2.0, forward.basic["goals"])
+        self.assertEqual(20.0, forward.basic["passes_completed"])
+        self.assertEqual(25.0, forward.basic["passes_total"])
+        self.assertEqual(1.0, forward.role["penalties_won"])
+        self.assertEqual(3.0, forward.role["dribbles_completed"])
+        self.assertEqual(5.0, forward.role["dribbles_total"])
+
+        keeper = rows[8]
+        self.assertEqual(1.0, keeper.role["penalties_saved"])
+        self.assertEqual(2.0, keeper.role["penalties_received"])
+        self.assertNotIn(99, rows)
+
+    def test_transform_matches_counts_per_table(self):
+        results = [
+            [(10, True, None)],                             # core.match
+            [(10, True), (10, True), (10, False)],          # core.participation
+            [(500, 10, 7, "inserted"), (501, 10, 8, "unchanged")],  # core.basic_stats
+            [(501, False)],                                 # stats.goalkeeper_stats
+            [(500, True)],                                  # stats.forward_stats
+        ]
+        calls = []
+
+        def fake_execute_values(_cur, sql, rows, **_kwargs):
+            calls.append((sql, rows))
+            return results[len(calls) - 1]
+
+        conn = _FakeConnection()
+        table_rows = {}
+        with mock.patch("etl.transform.match_transform.execute_values", fake_execute_values):
+            counters = transform_matches(
+                conn, [_bundle()], {10: _context()}, table_rows=table_rows
+            )
+
+        self.assertEqual(
+            {"core_inserted": 4, "core_updated": 1, "stats_inserted": 1, "stats_updated": 1},
+            counters[10],
+        )
+        participation_rows = calls[1][1]
+        self.assertIn((10, 99, "starter", "MNG"), participation_rows)
+        self.assertIn("stats.forward_stats", calls[-1][0])
+        self.assertEqual(500, calls[-1][1][0][0])
+
+        # El partido cambió: se refresca core.standings de su temporada, y
+        # el agregado de los jugadores con stats nuevas o modificadas
+        # (7 por basic + forward, 8 solo por goalkeeper); al final sube la
+        # versión de datos de la temporada.
+        (
+            (standings_sql, standings_params),
+            (players_sql, players_params),
+            (version_sql, version_params),
+        ) = conn.cur.executed
+        self.assertIn("core.refresh_standings", standings_sql)
+        self.assertEqual(([10], []), standings_params)
+        self.assertEqual((0, 3), table_rows["core.standings"])
+        self.assertIn("core.refresh_player_season_stats", players_sql)
+        self.assertEqual(([10, 10], [7, 8]), players_params)
+        self.assertIn("core.bump_season_version", version_sql)
+        self.assertEqual(([10],), version_params)
+
+    def test_match_moved_to_another_matchday_refreshes_from_previous_one(self):
+        # El partido estaba en la jornada 45 y pasó a la 50 (la del contexto).
+        results = [[(10, False, 45)], [], [], [], []]
+
+        def fake_execute_values(_cur, _sql, _rows, **_kwargs):
+            return results.pop(0) if results else []
+
+        conn = _FakeConnection()
+        with mock.patch("etl.transform.match_transform.execute_values", fake_execute_values):
+            counters = transform_matches(conn, [_bundle()], {10: _context()})
+
+        self.assertEqual(1, counters[10]["core_updated"])
+        standings_sql, standings_params = conn.cur.executed[0]
+        self.assertIn("core.refresh_standings", standings_sql)
+        self.assertIn("unnest", standings_sql)
+        self.assertEqual(([10], [45]), standings_params)
+
+    def test_unchanged_matches_skip_standings_refresh(self):
+        results = [[], [], [], [], []]
+
+        def fake_execute_values(_cur, _sql, _rows, **_kwargs):
+            return results.pop(0) if results else []
+
+        conn = _FakeConnection()
+        with mock.patch("etl.transform.match_transform.execute_values", fake_execute_values):
+            transform_matches(conn, [_bundle()], {10: _context()})
+
+        self.assertEqual([], conn.cur.executed)
+
+    def test_transform_matches_requires_context(self):
+        with self.assertRaises(MissingDimensionData):
+            transform_matches(_FakeConnection(), [_bundle()], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
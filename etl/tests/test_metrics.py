@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+from etl.metrics import RunMetrics, percentile, render, write_textfile
+
+
+class RunMetricsTests(unittest.TestCase):
+    def test_percentile_nearest_rank(self):
+        values = [float(v) for v in range(1, 101)]
+
+        self.assertEqual(50.0, percentile(values, 0.50))
+        self.assertEqual(95.0, percentile(values, 0.95))
+        self.assertEqual(0.0, percentile([], 0.95))
+
+    def test_snapshot_and_textfile(self):
+        metrics = RunMetrics(run_id=42)
+        with metrics.timer("facts"):
+            pass
+        metrics.observe_match(0.2)
+        metrics.observe_match(0.4, ok=False)
+        metrics.add_rows("core.match", inserted=3, updated=1)
+
+        snapshot = {(m, label): v for m, label, v in metrics.snapshot()}
+        self.assertEqual(1.0, snapshot[("matches_ok", "")])
+        self.assertEqual(1.0, snapshot[("matches_error", "")])
+        self.assertEqual(3.0, snapshot[("rows_inserted", "core.match")])
+        self.assertIn(("stage_seconds", "dimensions"), snapshot)
+
+        text = render(metrics.snapshot(), run_id=42)
+        self.assertIn("fifth_referee_etl_last_run_id 42", text)
+        self.assertIn('fifth_referee_etl_rows_inserted{table="core.match"} 3', text)
+        self.assertIn("# TYPE fifth_referee_etl_stage_seconds gauge", text)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "etl.prom")
+            write_textfile(path, metrics.snapshot(), run_id=42)
+            with open(path, encoding="utf-8") as f:
+                self.assertIn("fifth_referee_etl_matches_ok 1", f.read())
+            self.assertEqual(["etl.prom"], os.listdir(tmp))
+
+
+if __name__ == "__main__":
+    unittest.main()
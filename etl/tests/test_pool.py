@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+from psycopg2.extensions import STATUS_READY
+
+from etl.db.pool import EtlConnectionPool
+
+
+class _FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, params=None):
+        if self.conn.broken:
+            raise RuntimeError("server closed the connection")
+        self.conn.executed.append(sql)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        return False
+
+
+class _FakeConnection:
+    def __init__(self, broken=False):
+        self.closed = 0
+        self.status = STATUS_READY
+        self.broken = broken
+        self.executed = []
+        self.commits = 0
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.status = STATUS_READY
+
+
+class _FakeThreadedPool:
+    def __init__(self, conns):
+        self.idle = list(conns)
+        self.returned = []
+
+    def getconn(self):
+        return self.idle.pop(0)
+
+    def putconn(self, conn, close=False):
+        self.returned.append((conn, close))
+        if not close:
+            self.idle.append(conn)
+
+    def closeall(self):
+        self.idle.clear()
+
+
+def _make_pool(conns, **kwargs):
+    fake = _FakeThreadedPool(conns)
+    with mock.patch("etl.db.pool.pg_pool.ThreadedConnectionPool", return_value=fake):
+        pool = EtlConnectionPool("dbname=test", **kwargs)
+    return pool, fake
+
+
+class EtlConnectionPoolTests(unittest.TestCase):
+    def test_session_releases_advisory_locks_on_checkin(self):
+        conn = _FakeConnection()
+        pool, fake = _make_pool([conn], max_size=1)
+
+        with pool.session() as got:
+            self.assertIs(conn, got)
+
+        self.assertEqual(["SELECT 1", "SELECT pg_advisory_unlock_all()"], conn.executed)
+        self.assertEqual(1, conn.commits)
+        self.assertEqual([(conn, False)], fake.returned)
+
+    def test_connection_is_reused_without_health_check_when_recent(self):
+        conn = _FakeConnection()
+        pool, _fake = _make_pool([conn], max_size=1)
+
+        with pool.connection():
+            pass
+        with pool.connection() as again:
+            self.assertIs(conn, again)
+
+        # Solo el primer checkout (sin uso previo) hace SELECT 1
+        self.assertEqual(["SELECT 1"], conn.executed)
+
+    def test_broken_connection_is_discarded(self):
+        broken, healthy = _FakeConnection(broken=True), _FakeConnection()
+        pool, fake = _make_pool([broken, healthy], max_size=2)
+
+        with pool.connection() as got:
+            self.assertIs(healthy, got)
+
+        self.assertIn((broken, True), fake.returned)
+
+    def test_all_idle_connections_dead_after_restart(self):
+        dead = [_FakeConnection(broken=True) for _ in range(2)]
+        fresh = _FakeConnection()
+        pool, fake = _make_pool(dead + [fresh], max_size=2)
+
+        with pool.connection() as got:
+            self.assertIs(fresh, got)
+
+        self.assertEqual([(c, True) for c in dead], fake.returned[:2])
+
+    def test_no_healthy_connection_raises_and_frees_the_slot(self):
+        pool, _fake = _make_pool(
+            [_FakeConnection(broken=True) for _ in range(3)], max_size=2, acquire_timeout=0.01
+        )
+
+        with self.assertRaises(Exception):
+            with pool.connection():
+                pass
+        self.assertTrue(pool._slots.acquire(timeout=0.01))
+
+    def test_exhausted_pool_times_out(self):
+        pool, _fake = _make_pool([_FakeConnection()], max_size=1, acquire_timeout=0.01)
+
+        with pool.connection():
+            with self.assertRaises(Exception):
+                with pool.connection():
+                    pass
+
+
+if __name__ == "__main__":
+    unittest.main()
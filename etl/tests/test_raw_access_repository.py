@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import unittest
+from unittest import mock
 from datetime import datetime, timezone
 
 from etl.raw_access import (
@@ -9,7 +10,18 @@ from etl.raw_access import (
     RawMatchRecord,
     RawParticipationRecord,
     RawPlayerStatRecord,
+    RawPlayerStatRow,
 )
+from etl.config.stat_mapping import load_stat_mapping
+from etl.raw_access.columnar import stat_columns_from_rows
+from etl.raw_access.pivot import build_wide_stat_query
+from etl.raw_access.stat_names import StatNameDictionary
+
+_STAT_IDS = {"goals": 1, "passes": 2}
+
+
+def _dictionary():
+    return StatNameDictionary({i: name for name, i in _STAT_IDS.items()})
 
 
 class _FakeCursor:
@@ -43,6 +55,46 @@ class _FakeConnection:
         return _FakeCursor(self._responses)
 
 
+class _FakeNamedCursor:
+    def __init__(self, rows):
+        self._rows = rows
+        self.itersize = None
+
+    def execute(self, *_args, **_kwargs):
+        return None
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        return False
+
+
+class _FakeStreamingConnection:
+    def __init__(self, streams):
+        self._streams = streams
+        self.cursor_names = []
+
+    def cursor(self, name=None, cursor_factory=None):
+        if name is None:
+            raise AssertionError("Streaming reads must use named cursors")
+        self.cursor_names.append(name)
+        return _FakeNamedCursor(self._streams.pop(0))
+
+
+class _FakeTupleConnection:
+    def __init__(self, rows):
+        self._rows = rows
+        self.cursor_factories = []
+
+    def cursor(self, cursor_factory=None):
+        self.cursor_factories.append(cursor_factory)
+        return _FakeCursor([{"fetchall": self._rows}])
+
+
 class RawAccessRepositoryTests(unittest.TestCase):
     def test_load_match_bundle(self):
         responses = [
@@ -50,7 +102,7 @@ class RawAccessRepositoryTests(unittest.TestCase):
             {"fetchall": [_participation_row(), _participation_row(team_id=20)]},
             {"fetchall": [_stat_row(), _stat_row(player_id=3, stat_name="passes")]},
         ]
-        repo = RawAccessRepository(_FakeConnection(responses))
+        repo = RawAccessRepository(_FakeConnection(responses), _dictionary())
 
         bundle = repo.load_match_bundle(123)
 
@@ -64,6 +116,149 @@ class RawAccessRepositoryTests(unittest.TestCase):
         self.assertEqual(len(stats_groups[2]), 1)
         self.assertEqual(len(stats_groups[3]), 1)
 
+    def test_iter_match_bundles_groups_rows_per_match(self):
+        match_a = dict(_match_row(), match_id=10)
+        match_b = dict(_match_row(), match_id=12)
+        parts = [
+            _participation_row(),
+            dict(_participation_row(team_id=20), match_id=12),
+        ]
+        stats = [
+            _stat_row(),
+            _stat_row(stat_name="passes"),
+            dict(_stat_row(), match_id=11),  # orphan, no raw.match row
+            dict(_stat_row(player_id=3), match_id=12),
+        ]
+        conn = _FakeStreamingConnection([[match_a, match_b], parts, stats])
+        repo = RawAccessRepository(conn, _dictionary())
+
+        bundles = list(repo.iter_match_bundles([10, 11, 12], itersize=100))
+
+        self.assertEqual([10, 12], [b.match.match_id for b in bundles])
+        self.assertEqual(1, len(bundles[0].participations))
+        self.assertEqual(2, len(bundles[0].stats))
+        self.assertEqual(1, len(bundles[1].participations))
+        self.assertEqual(1, len(bundles[1].stats))
+        self.assertEqual(3, len(conn.cursor_names))
+
+    def test_iter_match_bundles_lean_decodes_tuples(self):
+        conn = _FakeStreamingConnection(
+            [[_match_row()], [_participation_tuple()], [_stat_tuple()]]
+        )
+        repo = RawAccessRepository(conn, _dictionary())
+
+        (bundle,) = repo.iter_match_bundles([10], lean=True)
+
+        self.assertIsInstance(bundle.stats[0], RawPlayerStatRow)
+        self.assertEqual("goals", bundle.stats[0].stat_name)
+        self.assertEqual([7], [p.jersey_number for p in bundle.participations])
+        self.assertEqual({2: 1}, {k: len(v) for k, v in bundle.stats_by_player().items()})
+
+    def test_load_stat_rows_and_columns(self):
+        rows = [
+            _stat_tuple(),
+            _stat_tuple(player_id=3, stat_name="passes", numeric=None, ratio=(7, 9)),
+            _stat_tuple(match_id=11, stat_name="goals"),
+        ]
+        repo = RawAccessRepository(_FakeTupleConnection(rows), _dictionary())
+
+        stat_rows = repo.load_stat_rows([10, 11])
+        self.assertEqual(3, len(stat_rows))
+        self.assertEqual(7, stat_rows[1].value_ratio_num)
+
+        self.assertEqual("passes", stat_rows[1].stat_name)
+
+        cols = stat_columns_from_rows(rows, resolve_names=lambda _ids: {1: "goals", 2: "passes"})
+        self.assertEqual(3, len(cols))
+        self.assertEqual(("goals", "passes"), cols.stat_names)
+        self.assertEqual([0, 1, 0], cols.stat_code.tolist())
+        self.assertTrue(cols.value_numeric[1] != cols.value_numeric[1])  # NaN
+        self.assertEqual({10: slice(0, 2), 11: slice(2, 3)}, cols.match_slices())
+        self.assertEqual([10, 10], cols.for_match(10).match_id.tolist())
+
+    def test_load_wide_stat_rows_splits_basic_and_role_columns(self):
+        mapping = load_stat_mapping()
+        query = build_wide_stat_query(mapping)
+        width = sum(len(columns) for _, columns in query.layout)
+        row = [10, 2, "FW"] + list(range(width))
+        conn = _FakeTupleConnection([tuple(row)])
+        names = StatNameDictionary(dict(enumerate(mapping.stat_names(), start=1)))
+        repo = RawAccessRepository(conn, names)
+
+        wide = repo.load_wide_stat_rows([10], mapping)
+
+        self.assertEqual(1, len(wide))
+        self.assertEqual(mapping.basic.column_names(), tuple(wide[0].basic))
+        forward = mapping.role_for_position("FW")
+        assert forward  # for mypy
+        self.assertEqual(forward.column_names(), tuple(wide[0].role))
+        self.assertIn("penalties_won", wide[0].role)
+        self.assertNotIn("goals", wide[0].role)
+        params = query.params([10], {"Minutes": 7})
+        self.assertEqual(query.sql.count("%s"), len(params))
+        self.assertIn("FILTER (WHERE s.stat_name_id = %s", query.sql)
+        # Nombres resueltos a ids; los que no están en el diccionario no matchean
+        self.assertIn(7, params)
+        self.assertEqual([7], params[-1])
+        self.assertNotIn("Minutes", params)
+
+    def test_stat_name_dictionary_reloads_on_miss(self):
+        names = StatNameDictionary({1: "goals"})
+        rows = [
+            {"stat_name_id": 1, "stat_name": "goals"},
+            {"stat_name_id": 2, "stat_name": "passes"},
+        ]
+        responses = [{"fetchall": rows}, {"fetchall": rows}]
+        conn = _FakeConnection(responses)
+
+        self.assertEqual("goals", names.name(conn, 1))  # cache, sin consulta
+        self.assertEqual(2, len(responses))
+        self.assertEqual("passes", names.name(conn, 2))  # recarga una vez
+        self.assertEqual(1, len(responses))
+        # Un nombre desconocido recarga y queda fuera del resultado
+        self.assertEqual({"passes": 2}, names.ids_for(conn, ["passes", "shots"]))
+        self.assertEqual([], responses)
+        # ...y no vuelve a recargar por ese nombre en las llamadas siguientes
+        self.assertEqual({"passes": 2}, names.ids_for(conn, ["passes", "shots"]))
+
+    def test_stat_name_dictionary_absent_names_expire(self):
+        names = StatNameDictionary({1: "goals"}, absent_ttl=60.0)
+        before = [{"stat_name_id": 1, "stat_name": "goals"}]
+        after = before + [{"stat_name_id": 4, "stat_name": "xg"}]
+        responses = [{"fetchall": before}, {"fetchall": after}]
+        conn = _FakeConnection(responses)
+
+        with mock.patch("etl.raw_access.stat_names.time.monotonic", return_value=100.0):
+            self.assertEqual({}, names.ids_for(conn, ["xg"]))
+            # Dentro del TTL no recarga (queda la segunda respuesta sin usar)
+            self.assertEqual({}, names.ids_for(conn, ["xg"]))
+            self.assertEqual(1, len(responses))
+        # "xg" aparece en raw.stat_name; vencido el TTL se vuelve a buscar
+        with mock.patch("etl.raw_access.stat_names.time.monotonic", return_value=161.0):
+            self.assertEqual({"goals": 1, "xg": 4}, names.ids_for(conn, ["goals", "xg"]))
+        self.assertEqual([], responses)
+
+    def test_stat_name_dictionary_create_clears_negative_cache(self):
+        names = StatNameDictionary({1: "goals"})
+        conn = _FakeConnection([{"fetchall": [{"stat_name_id": 1, "stat_name": "goals"}]}])
+        self.assertEqual({}, names.ids_for(conn, ["shots"]))
+
+        rows = [
+            {"stat_name_id": 1, "stat_name": "goals"},
+            {"stat_name_id": 3, "stat_name": "shots"},
+        ]
+        # INSERT de los faltantes (execute_values) + recarga
+        conn = _FakeConnection([{"fetchall": rows}])
+        with mock.patch("psycopg2.extras.execute_values") as insert:
+            self.assertEqual({"shots": 3}, names.ids_for(conn, ["shots"], create=True))
+        self.assertEqual([("shots",)], insert.call_args.args[2])
+        self.assertEqual(frozenset(), names._absent)
+
+    def test_iter_match_bundles_empty_ids(self):
+        repo = RawAccessRepository(_FakeStreamingConnection([]), _dictionary())
+
+        self.assertEqual([], list(repo.iter_match_bundles([])))
+
     def test_match_bundle_grouping_helpers(self):
         bundle = RawMatchBundle(
             match=RawMatchRecord(
@@ -136,7 +331,7 @@ def _stat_row(player_id: int = 2, stat_name: str = "goals"):
     return {
         "match_id": 10,
         "player_id": player_id,
-        "stat_name": stat_name,
+        "stat_name_id": _STAT_IDS[stat_name],
         "raw_value": "1",
         "value_numeric": 1.0,
         "value_ratio_num": None,
@@ -144,5 +339,13 @@ def _stat_row(player_id: int = 2, stat_name: str = "goals"):
     }
 
 
+def _participation_tuple():
+    return (10, 2, 10, 7, "FW", 1)
+
+
+def _stat_tuple(match_id=10, player_id=2, stat_name="goals", numeric=1.0, ratio=(None, None)):
+    return (match_id, player_id, _STAT_IDS[stat_name], "1", numeric, ratio[0], ratio[1])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+from etl.db.status_buffer import StatusBuffer
+
+
+class _FakeCursor:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        return False
+
+
+class _FakeConnection:
+    def cursor(self):
+        return _FakeCursor()
+
+
+class StatusBufferTests(unittest.TestCase):
+    def test_flush_writes_one_statement_per_table(self):
+        buffer = StatusBuffer(run_id=5)
+        buffer.match_started(10, stage="facts")
+        buffer.match_finished(10, stage="facts", status="success", rows_inserted_core=3)
+        buffer.match_started(11, stage="facts")
+        buffer.match_finished(
+            11, stage="facts", status="error", error_code="ValueError", error_message="boom"
+        )
+        buffer.error(match_id=11, stage="facts", message="Error processing match")
+
+        with mock.patch("etl.db.status_buffer.execute_values") as execute_values:
+            buffer.flush(_FakeConnection())
+
+        self.assertEqual(2, execute_values.call_count)
+        status_sql, status_rows = execute_values.call_args_list[0][0][1:3]
+        self.assertIn("INSERT INTO etl.run_match", status_sql)
+        self.assertIn("ON CONFLICT (run_id, match_id)", status_sql)
+        # running -> success colapsa en una sola fila por partido
+        self.assertEqual([10, 11], [row[1] for row in status_rows])
+        self.assertEqual(
+            ("success", 1, 3), (status_rows[0][3], status_rows[0][4], status_rows[0][7])
+        )
+        self.assertIsNotNone(status_rows[0][11])
+        self.assertIsNotNone(status_rows[0][12])
+        self.assertEqual("ValueError", status_rows[1][5])
+
+        error_sql, error_rows = execute_values.call_args_list[1][0][1:3]
+        self.assertIn("INSERT INTO etl.error_log", error_sql)
+        self.assertEqual(1, len(error_rows))
+        self.assertEqual(0, len(buffer))
+
+    def test_flush_empty_buffer_is_noop(self):
+        with mock.patch("etl.db.status_buffer.execute_values") as execute_values:
+            StatusBuffer(run_id=1).flush(_FakeConnection())
+
+        execute_values.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,3 @@
+from .match_transform import FactCounters, process_match, transform_matches
+
+__all__ = ["FactCounters", "process_match", "transform_matches"]
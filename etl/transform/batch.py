@@ -0,0 +1,145 @@
+"""
+Procesamiento de un batch de partidos (dimensiones + hechos), compartido
+por el run incremental (etl.main) y el backfill (etl.backfill).
+
+- process_batch: todo el batch en una transacción con sentencias
+  multi-fila; devuelve None si falló (rollback hecho). Si se perdió la
+  conexión propaga el error: reintentar partido por partido no serviría.
+- process_single: un partido en su propia transacción, para aislar al
+  culpable cuando el batch falla; propaga la excepción.
+
+Con ``mark_done=False`` no se toca la cola etl.pending_match (el backfill
+reprocesa historia sin interferir con el ETL incremental).
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from psycopg2 import InterfaceError
+from psycopg2.extensions import connection as PGConnection
+
+from etl.config.settings import Settings
+from etl.db.status_buffer import StatusBuffer
+from etl.db.tx import transaction
+from etl.dimensions.dimensions import upsert_dimensions_for_match
+from etl.discovery.discovery import mark_match_done
+from etl.metrics import RunMetrics
+from etl.raw_access import RawAccessRepository
+
+from .match_transform import FactCounters, process_match, transform_matches
+
+
+def process_batch(
+    conn: PGConnection,
+    match_ids: List[int],
+    settings: Settings,
+    metrics: RunMetrics,
+    mark_done: bool = True,
+) -> Optional[Dict[int, FactCounters]]:
+    """
+    Dimensiones + hechos de todo el batch en una sola transacción.
+
+    Returns:
+        Contadores por partido, o None si el batch falló (rollback hecho;
+        el llamador reintenta partido por partido y registra el error).
+
+    Raises:
+        El error original si la conexión quedó cerrada o inutilizable.
+    """
+    table_rows: Dict[str, Tuple[int, int]] = {}
+    try:
+        with transaction(conn):
+            with metrics.timer("dimensions"):
+                contexts = {
+                    match_id: upsert_dimensions_for_match(conn, match_id, settings=settings)
+                    for match_id in match_ids
+                }
+            with metrics.timer("facts"):
+                repo = RawAccessRepository(conn)
+                bundles = repo.load_match_bundles(match_ids, include_stats=False)
+                wide_rows = repo.load_wide_stat_rows(match_ids)
+                counters = transform_matches(
+                    conn, bundles, contexts, wide_rows=wide_rows, table_rows=table_rows
+                )
+                if mark_done:
+                    for match_id in match_ids:
+                        mark_match_done(conn, match_id)
+    except Exception as exc:
+        if conn.closed or isinstance(exc, InterfaceError):
+            raise
+        metrics.batches_failed += 1
+        print(
+            f"ETL batch of {len(match_ids)} match(es) failed, retrying one by one: "
+            f"{type(exc).__name__}: {exc}"
+        )
+        return None
+
+    for table, (inserted, updated) in table_rows.items():
+        metrics.add_rows(table, inserted, updated)
+    return counters
+
+
+def process_single(
+    conn: PGConnection,
+    match_id: int,
+    settings: Settings,
+    metrics: RunMetrics,
+    mark_done: bool = True,
+) -> FactCounters:
+    """
+    Un partido en su propia transacción. Registra la latencia en metrics
+    solo si termina bien; ante un error hace rollback y lo propaga.
+    """
+    started = time.perf_counter()
+    table_rows: Dict[str, Tuple[int, int]] = {}
+    with transaction(conn):
+        with metrics.timer("dimensions"):
+            context = upsert_dimensions_for_match(conn, match_id, settings=settings)
+        with metrics.timer("facts"):
+            counters: FactCounters = process_match(
+                conn, match_id, context, table_rows=table_rows
+            )
+            if mark_done:
+                mark_match_done(conn, match_id)
+
+    for table, (inserted, updated) in table_rows.items():
+        metrics.add_rows(table, inserted, updated)
+    metrics.observe_match(time.perf_counter() - started)
+    return counters
+
+
+def record_success(
+    status_buffer: StatusBuffer, match_id: int, counters: FactCounters
+) -> None:
+    status_buffer.match_finished(
+        match_id,
+        stage="facts",
+        status="success",
+        rows_inserted_core=counters.get("core_inserted", 0),
+        rows_updated_core=counters.get("core_updated", 0),
+        rows_inserted_stats=counters.get("stats_inserted", 0),
+        rows_updated_stats=counters.get("stats_updated", 0),
+    )
+
+
+def record_failure(
+    status_buffer: StatusBuffer,
+    match_id: int,
+    error: Exception,
+    context: Optional[Dict[str, Any]] = None,
+) -> None:
+    status_buffer.match_finished(
+        match_id,
+        stage="facts",
+        status="error",
+        error_code=type(error).__name__,
+        error_message=str(error),
+    )
+    status_buffer.error(
+        match_id=match_id,
+        stage="facts",
+        message="Error processing match",
+        detail=str(error),
+        context={"match_id": match_id, **(context or {})},
+    )
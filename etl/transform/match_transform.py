@@ -0,0 +1,377 @@
+"""
+Transformación raw -> core/stats por batch.
+
+Recibe los RawMatchBundle de un batch junto con sus DimensionsContext y
+carga, con una sentencia multi-fila por tabla:
+  - core.match
+  - core.participation
+  - core.basic_stats
+  - stats.<rol>_stats (según la posición de la participación)
+  - core.standings (refresco de las temporadas con partidos que cambiaron)
+  - core.player_season_stats (refresco de los jugadores con stats que cambiaron)
+
+Las estadísticas se mapean con etl.config.stat_mapping; pueden llegar ya
+pivoteadas desde Postgres (RawAccessRepository.load_wide_stat_rows) o se
+pivotean aquí desde los bundles.
+
+core.event no se genera: el esquema raw no guarda eventos.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+try:
+    from psycopg2.extensions import connection as PGConnection
+except ImportError:  # pragma: no cover
+    PGConnection = Any  # type: ignore
+
+from psycopg2.extras import execute_values
+
+from etl.config.stat_mapping import StatGroup, StatMapping, load_stat_mapping, normalize_position
+from etl.db.connection import CountingTupleCursor
+from etl.dimensions import DimensionsContext, upsert_dimensions_for_match
+from etl.dimensions.exceptions import MissingDimensionData
+from etl.raw_access import RawAccessRepository, RawMatchBundle, RawWideStatRow
+from etl.raw_access.pivot import pivot_bundle_stats
+
+from .player_season import refresh_player_season_stats
+from .season_version import bump_season_versions
+from .standings import refresh_standings
+
+FactCounters = Dict[str, int]
+
+# raw.player_match.status -> reference.status_enum (participation_normalizer)
+STATUS_MAP: Dict[int, str] = {
+    1: "starter",
+    2: "substitute",
+    3: "unused",
+    4: "other",
+    5: "starter",
+}
+_MANAGER_STATUS: int = 5
+
+_MATCH_COLUMNS: Tuple[str, ...] = (
+    "match_id",
+    "matchday_id",
+    "local_team_id",
+    "away_team_id",
+    "local_score",
+    "away_score",
+    "stadium",
+    "duration",
+)
+
+
+def _empty_counters() -> FactCounters:
+    return {
+        "core_inserted": 0,
+        "core_updated": 0,
+        "stats_inserted": 0,
+        "stats_updated": 0,
+    }
+
+
+def _template(n: int, casts: Optional[Dict[int, str]] = None) -> str:
+    casts = casts or {}
+    parts = [f"%s::{casts[i]}" if i in casts else "%s" for i in range(n)]
+    return "(" + ", ".join(parts) + ")"
+
+
+def _changed(alias: str, columns: Sequence[str]) -> str:
+    """Condición del DO UPDATE: solo reescribe filas que cambian."""
+    if len(columns) == 1:
+        col = columns[0]
+        return f"{alias}.{col} IS DISTINCT FROM EXCLUDED.{col}"
+    current = ", ".join(f"{alias}.{c}" for c in columns)
+    incoming = ", ".join(f"EXCLUDED.{c}" for c in columns)
+    return f"({current}) IS DISTINCT FROM ({incoming})"
+
+
+def _count(
+    counters: Dict[int, FactCounters],
+    results: Sequence[Tuple[Any, ...]],
+    prefix: str,
+    match_of: Optional[Dict[int, int]] = None,
+) -> Tuple[int, int]:
+    """
+    Suma filas RETURNING (key, inserted) a los contadores por partido y
+    devuelve el total (insertadas, actualizadas).
+    """
+    inserted_total = 0
+    for key, inserted in results:
+        match_id = match_of[key] if match_of is not None else key
+        bucket = counters[match_id]
+        bucket[f"{prefix}_inserted" if inserted else f"{prefix}_updated"] += 1
+        inserted_total += 1 if inserted else 0
+    return inserted_total, len(results) - inserted_total
+
+
+def _upsert_matches(
+    cur: Any,
+    bundles: Sequence[RawMatchBundle],
+    contexts: Mapping[int, DimensionsContext],
+) -> List[Tuple[Any, ...]]:
+    """
+    Upsert de core.match. Devuelve solo los partidos nuevos o modificados:
+    (match_id, inserted, matchday_id previo o None).
+    """
+    rows = [
+        (
+            b.match.match_id,
+            contexts[b.match.match_id].matchday.matchday_id,
+            b.match.local_team_id,
+            b.match.away_team_id,
+            b.match.local_score,
+            b.match.away_score,
+            b.match.stadium,
+            b.match.duration,
+        )
+        for b in bundles
+    ]
+    updatable = _MATCH_COLUMNS[1:]
+    # El SELECT externo lee core.match con el snapshot previo al upsert: para
+    # los partidos actualizados trae la jornada anterior (NULL si es nuevo).
+    sql = f"""
+        WITH upserted AS (
+            INSERT INTO core.match AS t ({", ".join(_MATCH_COLUMNS)})
+            VALUES %s
+            ON CONFLICT (match_id) DO UPDATE
+            SET {", ".join(f"{c} = EXCLUDED.{c}" for c in updatable)}
+            WHERE {_changed("t", updatable)}
+            RETURNING t.match_id, (t.xmax = 0) AS inserted
+        )
+        SELECT u.match_id, u.inserted, prev.matchday_id
+        FROM upserted u
+        LEFT JOIN core.match prev ON prev.match_id = u.match_id
+    """
+    return execute_values(
+        cur, sql, rows, template=_template(len(_MATCH_COLUMNS)),
+        page_size=len(rows), fetch=True,
+    )
+
+
+def _participation_rows(bundles: Sequence[RawMatchBundle]) -> List[Tuple[Any, ...]]:
+    rows: List[Tuple[Any, ...]] = []
+    for b in bundles:
+        for p in b.participations:
+            position = normalize_position(p.position)
+            if p.status == _MANAGER_STATUS:
+                position = "MNG"
+            status = STATUS_MAP.get(p.status, "other") if p.status is not None else "other"
+            rows.append((p.match_id, p.player_id, status, position))
+    return rows
+
+
+def _upsert_participations(cur: Any, rows: List[Tuple[Any, ...]]) -> List[Tuple[Any, ...]]:
+    if not rows:
+        return []
+    sql = f"""
+        INSERT INTO core.participation AS t (match_id, player_id, status, position)
+        VALUES %s
+        ON CONFLICT (match_id, player_id) DO UPDATE
+        SET status = EXCLUDED.status, position = EXCLUDED.position
+        WHERE {_changed("t", ("status", "position"))}
+        RETURNING t.match_id, (t.xmax = 0) AS inserted
+    """
+    template = _template(4, {2: "reference.status_enum", 3: "reference.position_enum"})
+    return execute_values(cur, sql, rows, template=template, page_size=len(rows), fetch=True)
+
+
+def _upsert_basic_stats(
+    cur: Any, group: StatGroup, wide_rows: Sequence[RawWideStatRow]
+) -> List[Tuple[Any, ...]]:
+    """
+    Upsert de core.basic_stats devolviendo basic_stats_id de todas las
+    filas del batch: (basic_stats_id, match_id, player_id, estado) con
+    estado en {'inserted', 'updated', 'unchanged'}.
+    """
+    if not wide_rows:
+        return []
+
+    columns = group.column_names()
+    all_columns = ("match_id", "player_id") + columns
+    rows = [
+        (r.match_id, r.player_id) + tuple(r.basic.get(c) for c in columns)
+        for r in wide_rows
+    ]
+    casts = {0: "integer", 1: "integer"}
+    casts.update({i: "numeric" for i in range(2, len(all_columns))})
+
+    # La rama "unchanged" lee el snapshot previo al INSERT, así que solo
+    # encuentra filas existentes que el DO UPDATE no tocó.
+    sql = f"""
+        WITH v ({", ".join(all_columns)}) AS (
+            VALUES %s
+        ),
+        up AS (
+            INSERT INTO core.basic_stats AS t ({", ".join(all_columns)})
+            SELECT {", ".join(all_columns)} FROM v
+            ON CONFLICT (match_id, player_id) DO UPDATE
+            SET {", ".join(f"{c} = EXCLUDED.{c}" for c in columns)}
+            WHERE {_changed("t", columns)}
+            RETURNING t.basic_stats_id, t.match_id, t.player_id, (t.xmax = 0) AS inserted
+        )
+        SELECT basic_stats_id, match_id, player_id,
+               CASE WHEN inserted THEN 'inserted' ELSE 'updated' END
+        FROM up
+        UNION ALL
+        SELECT b.basic_stats_id, b.match_id, b.player_id, 'unchanged'
+        FROM core.basic_stats b
+        JOIN v ON v.match_id = b.match_id AND v.player_id = b.player_id
+        WHERE NOT EXISTS (
+            SELECT 1 FROM up
+            WHERE up.match_id = b.match_id AND up.player_id = b.player_id
+        )
+    """
+    return execute_values(
+        cur, sql, rows, template=_template(len(all_columns), casts),
+        page_size=len(rows), fetch=True,
+    )
+
+
+def _upsert_role_stats(
+    cur: Any, group: StatGroup, rows: List[Tuple[Any, ...]]
+) -> List[Tuple[Any, ...]]:
+    if not rows:
+        return []
+    columns = group.column_names()
+    all_columns = ("basic_stats_id",) + columns
+    sql = f"""
+        INSERT INTO {group.table} AS t ({", ".join(all_columns)})
+        VALUES %s
+        ON CONFLICT (basic_stats_id) DO UPDATE
+        SET {", ".join(f"{c} = EXCLUDED.{c}" for c in columns)}
+        WHERE {_changed("t", columns)}
+        RETURNING t.basic_stats_id, (t.xmax = 0) AS inserted
+    """
+    return execute_values(
+        cur, sql, rows, template=_template(len(all_columns)),
+        page_size=len(rows), fetch=True,
+    )
+
+
+def transform_matches(
+    conn: PGConnection,
+    bundles: Sequence[RawMatchBundle],
+    contexts: Mapping[int, DimensionsContext],
+    mapping: Optional[StatMapping] = None,
+    wide_rows: Optional[Sequence[RawWideStatRow]] = None,
+    table_rows: Optional[Dict[str, Tuple[int, int]]] = None,
+) -> Dict[int, FactCounters]:
+    """
+    Carga los hechos de un batch de partidos. No hace commit.
+
+    Args:
+        bundles: Bundles del batch (las stats pueden venir vacías si se
+                 pasan ``wide_rows``).
+        contexts: DimensionsContext por match_id.
+        mapping: Mapeo de estadísticas (por defecto load_stat_mapping()).
+        wide_rows: Stats ya pivoteadas; si es None se pivotean los bundles.
+        table_rows: Si se pasa, se completa con (insertadas, actualizadas)
+                    por tabla destino (para métricas).
+
+    Returns:
+        Contadores por match_id con las claves core_inserted, core_updated,
+        stats_inserted y stats_updated.
+    """
+    if not bundles:
+        return {}
+
+    missing = [b.match.match_id for b in bundles if b.match.match_id not in contexts]
+    if missing:
+        raise MissingDimensionData(f"No DimensionsContext for match_ids={missing}")
+
+    mapping = mapping or load_stat_mapping()
+    if wide_rows is None:
+        wide_rows = [row for b in bundles for row in pivot_bundle_stats(b, mapping)]
+
+    counters: Dict[int, FactCounters] = {b.match.match_id: _empty_counters() for b in bundles}
+    wide_rows = [r for r in wide_rows if r.match_id in counters]
+
+    per_table: Dict[str, Tuple[int, int]] = {}
+
+    with conn.cursor(cursor_factory=CountingTupleCursor) as cur:
+        changed_matches = _upsert_matches(cur, bundles, contexts)
+        per_table["core.match"] = _count(
+            counters, [(match_id, inserted) for match_id, inserted, _ in changed_matches], "core"
+        )
+        # Solo partidos nuevos o con cambios (resultado, jornada, ...) mueven
+        # la tabla de posiciones; si cambió la jornada se refresca desde la
+        # menor entre la anterior y la nueva.
+        per_table["core.standings"] = refresh_standings(
+            cur,
+            [match_id for match_id, _, _ in changed_matches],
+            [previous for _, _, previous in changed_matches if previous is not None],
+        )
+        per_table["core.participation"] = _count(
+            counters, _upsert_participations(cur, _participation_rows(bundles)), "core"
+        )
+
+        basic = _upsert_basic_stats(cur, mapping.basic, wide_rows)
+        basic_ids: Dict[Tuple[int, int], int] = {}
+        match_of: Dict[int, int] = {}
+        player_of: Dict[int, int] = {}
+        changed: List[Tuple[int, bool]] = []
+        # (match_id, player_id) con stats nuevas o modificadas.
+        touched: Set[Tuple[int, int]] = set()
+        for basic_stats_id, match_id, player_id, state in basic:
+            basic_ids[(match_id, player_id)] = basic_stats_id
+            match_of[basic_stats_id] = match_id
+            player_of[basic_stats_id] = player_id
+            if state != "unchanged":
+                changed.append((match_id, state == "inserted"))
+                touched.add((match_id, player_id))
+        per_table[mapping.basic.table] = _count(counters, changed, "core")
+
+        role_rows: Dict[str, List[Tuple[Any, ...]]] = {}
+        for r in wide_rows:
+            group = mapping.role_for_position(r.position)
+            basic_stats_id = basic_ids.get((r.match_id, r.player_id))
+            if group is None or basic_stats_id is None:
+                continue
+            role_rows.setdefault(group.name, []).append(
+                (basic_stats_id,) + tuple(r.role.get(c) for c in group.column_names())
+            )
+
+        for group in mapping.roles:
+            results = _upsert_role_stats(cur, group, role_rows.get(group.name, []))
+            per_table[group.table] = _count(counters, results, "stats", match_of)
+            touched.update(
+                (match_of[basic_stats_id], player_of[basic_stats_id])
+                for basic_stats_id, _ in results
+            )
+
+        per_table["core.player_season_stats"] = refresh_player_season_stats(cur, touched)
+
+        # Al final del batch: el lock de fila de core.season_version se
+        # sostiene hasta el commit, que llega enseguida.
+        bump_season_versions(
+            cur, [match_id for match_id, c in counters.items() if any(c.values())]
+        )
+
+    if table_rows is not None:
+        for table, (inserted, updated) in per_table.items():
+            prev_ins, prev_upd = table_rows.get(table, (0, 0))
+            table_rows[table] = (prev_ins + inserted, prev_upd + updated)
+    return counters
+
+
+def process_match(
+    conn: PGConnection,
+    match_id: int,
+    context: Optional[DimensionsContext] = None,
+    table_rows: Optional[Dict[str, Tuple[int, int]]] = None,
+) -> FactCounters:
+    """
+    Atajo de un solo partido sobre transform_matches (camino de reintento
+    cuando falla el batch completo).
+    """
+    bundle = RawAccessRepository(conn).load_match_bundle(match_id)
+    if bundle is None:
+        raise MissingDimensionData(f"raw.match not found for match_id={match_id}")
+
+    context = context or upsert_dimensions_for_match(conn, match_id)
+    counters = transform_matches(
+        conn, [bundle], {match_id: context}, table_rows=table_rows
+    )
+    return counters[match_id]
@@ -0,0 +1,56 @@
+"""
+Agregado por jugador y temporada (core.player_season_stats).
+
+Lo calcula core.refresh_player_season_stats() en Postgres; el ETL la
+invoca en la misma transacción que los hechos, solo para los jugadores
+con core.basic_stats o stats.<rol>_stats nuevas o modificadas en el batch.
+"""
+from __future__ import annotations
+
+from typing import Any, Iterable, Tuple
+
+_REFRESH_SQL: str = """
+    SELECT COALESCE(sum(r.inserted), 0), COALESCE(sum(r.updated), 0)
+    FROM (
+        SELECT md.season_id, array_agg(DISTINCT t.player_id) AS player_ids
+        FROM unnest(%s::integer[], %s::integer[]) AS t (match_id, player_id)
+        JOIN core."match" m ON m.match_id = t.match_id
+        JOIN core.matchday md ON md.matchday_id = m.matchday_id
+        GROUP BY md.season_id
+        -- Orden fijo de los locks por temporada entre workers concurrentes.
+        ORDER BY md.season_id
+    ) AS affected
+    CROSS JOIN LATERAL core.refresh_player_season_stats(
+        affected.season_id, affected.player_ids
+    ) AS r
+"""
+
+
+def refresh_player_season_stats(
+    cur: Any, match_players: Iterable[Tuple[int, int]]
+) -> Tuple[int, int]:
+    """
+    Refresca core.player_season_stats para los pares (match_id, player_id)
+    dados (cada jugador en la temporada de su partido). No hace commit.
+
+    Returns:
+        (filas insertadas, filas actualizadas).
+    """
+    pairs = sorted(set(match_players))
+    if not pairs:
+        return 0, 0
+    cur.execute(_REFRESH_SQL, ([m for m, _ in pairs], [p for _, p in pairs]))
+    row = cur.fetchone()
+    if row is None:
+        return 0, 0
+    return int(row[0]), int(row[1])
+
+
+def rebuild_player_season_stats(cur: Any, season_id: int) -> Tuple[int, int]:
+    """Reconstrucción completa de una temporada (bajo demanda)."""
+    cur.execute(
+        "SELECT inserted, updated FROM core.refresh_player_season_stats(%s::smallint)",
+        (season_id,),
+    )
+    row = cur.fetchone()
+    return (int(row[0]), int(row[1])) if row else (0, 0)
@@ -0,0 +1,43 @@
+"""
+Versión de datos por temporada (core.season_version).
+
+El ETL la sube en la misma transacción en que carga hechos nuevos o
+modificados, una vez por temporada afectada; la API la usa como ETag para
+responder 304 mientras la temporada no cambie.
+"""
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+_BUMP_SQL: str = """
+    SELECT count(core.bump_season_version(affected.season_id))
+    FROM (
+        SELECT DISTINCT md.season_id
+        FROM core."match" m
+        JOIN core.matchday md ON md.matchday_id = m.matchday_id
+        WHERE m.match_id = ANY(%s)
+        -- Orden fijo de los locks de fila entre workers concurrentes.
+        ORDER BY md.season_id
+    ) AS affected
+"""
+
+
+def bump_season_versions(cur: Any, match_ids: Iterable[int]) -> int:
+    """
+    Sube la versión de las temporadas de ``match_ids``. No hace commit.
+
+    Returns:
+        Cantidad de temporadas cuya versión se subió.
+    """
+    ids = sorted(set(match_ids))
+    if not ids:
+        return 0
+    cur.execute(_BUMP_SQL, (ids,))
+    row = cur.fetchone()
+    return int(row[0]) if row else 0
+
+
+def bump_season_version(cur: Any, season_id: int) -> int:
+    """Sube la versión de una temporada y devuelve la nueva."""
+    cur.execute("SELECT core.bump_season_version(%s::smallint)", (season_id,))
+    return int(cur.fetchone()[0])
@@ -0,0 +1,72 @@
+"""
+Tabla de posiciones incremental (core.standings).
+
+core.standings guarda, por temporada, jornada y equipo, la tabla acumulada
+hasta esa jornada. La calcula core.refresh_standings() en Postgres; el ETL
+la invoca en la misma transacción que los hechos, solo para las temporadas
+con partidos insertados o modificados y desde la primera jornada afectada,
+contando la jornada anterior de un partido que cambió de jornada (las
+anteriores no dependen de ellos). Así la API lee una tabla ya hecha en
+vez de recalcularla desde todos los partidos en cada request.
+"""
+from __future__ import annotations
+
+from typing import Any, Iterable, Tuple
+
+_REFRESH_SQL: str = """
+    SELECT COALESCE(sum(r.inserted), 0), COALESCE(sum(r.updated), 0)
+    FROM (
+        SELECT md.season_id, min(md.matchday_number) AS from_matchday
+        FROM (
+            SELECT m.matchday_id FROM core."match" m WHERE m.match_id = ANY(%s)
+            UNION
+            -- Jornadas de las que salieron partidos movidos de jornada.
+            SELECT unnest(%s::integer[])
+        ) AS touched (matchday_id)
+        JOIN core.matchday md ON md.matchday_id = touched.matchday_id
+        GROUP BY md.season_id
+        -- Orden fijo de los locks por temporada entre workers concurrentes.
+        ORDER BY md.season_id
+    ) AS affected
+    CROSS JOIN LATERAL core.refresh_standings(
+        affected.season_id, affected.from_matchday
+    ) AS r
+"""
+
+
+def refresh_standings(
+    cur: Any,
+    match_ids: Iterable[int],
+    previous_matchday_ids: Iterable[int] = (),
+) -> Tuple[int, int]:
+    """
+    Refresca core.standings para las temporadas de ``match_ids``. No hace
+    commit.
+
+    Args:
+        match_ids: Partidos nuevos o modificados (ya escritos).
+        previous_matchday_ids: Jornadas que tenían antes los partidos que
+            cambiaron de jornada; el refresco arranca desde la menor entre
+            estas y las actuales.
+
+    Returns:
+        (filas insertadas, filas actualizadas).
+    """
+    ids = sorted(set(match_ids))
+    if not ids:
+        return 0, 0
+    cur.execute(_REFRESH_SQL, (ids, sorted(set(previous_matchday_ids))))
+    row = cur.fetchone()
+    if row is None:
+        return 0, 0
+    return int(row[0]), int(row[1])
+
+
+def rebuild_standings(cur: Any, season_id: int) -> Tuple[int, int]:
+    """Reconstrucción completa de una temporada (bajo demanda)."""
+    cur.execute(
+        "SELECT inserted, updated FROM core.refresh_standings(%s::smallint)",
+        (season_id,),
+    )
+    row = cur.fetchone()
+    return (int(row[0]), int(row[1])) if row else (0, 0)
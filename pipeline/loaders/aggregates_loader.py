@@ -0,0 +1,38 @@
+from .base_loader import BaseLoader
+
+class AggregatesLoader(BaseLoader):
+    def __init__(self, conn):
+        super().__init__(conn, log_name="aggregates_loader")
+
+    def refresh_season(self, season_id, from_matchday=1):
+        """
+        Refreshes the season aggregates (core.standings from `from_matchday`
+        onwards and core.player_season_stats) after matches and stats were
+        loaded, and bumps the season data version (core.season_version) so API
+        clients revalidate. Everything runs in a single transaction.
+        """
+        try:
+            with self.conn:
+                with self.conn.cursor() as cur:
+                    cur.execute(
+                        "SELECT inserted, updated FROM core.refresh_standings(%s::smallint, %s::smallint)",
+                        (season_id, from_matchday),
+                    )
+                    standings = cur.fetchone()
+                    cur.execute(
+                        "SELECT inserted, updated FROM core.refresh_player_season_stats(%s::smallint)",
+                        (season_id,),
+                    )
+                    players = cur.fetchone()
+                    cur.execute(
+                        "SELECT core.bump_season_version(%s::smallint)",
+                        (season_id,),
+                    )
+                    version = cur.fetchone()[0]
+            self.log_info(
+                f"Refreshed aggregates for season {season_id}: "
+                f"standings {standings}, player_season_stats {players}, version {version}."
+            )
+        except Exception as e:
+            self.log_error(f"Error refreshing aggregates for season {season_id}: {e}")
+            raise
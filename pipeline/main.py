@@ -15,6 +15,7 @@ from loaders.match_loader import MatchLoader
 from loaders.stats_loader import StatsLoader
 from loaders.basic_stats_loader import BasicStatsLoader
 from loaders.event_loader import EventLoader   # ⟵ NUEVO
+from loaders.aggregates_loader import AggregatesLoader
 
 if __name__ == "__main__":
     config, json_data_root, conn = initialize_pipeline()
@@ -42,6 +43,7 @@ if __name__ == "__main__":
     stats_loader  = StatsLoader(conn)
     basic_stats   = BasicStatsLoader(conn)
     event_loader  = EventLoader(conn)
+    aggregates    = AggregatesLoader(conn)
 
     # 1) Extraer todo
     all_matches, all_events, all_players, all_player_stats = extract_all_entities(
@@ -80,4 +82,7 @@ if __name__ == "__main__":
     event_df = build_event_entity(conn, all_events, schema_path="pipeline/config/event_schema.json")
     event_loader.insert_events(event_df)   # ⟵ NUEVO
 
+    # 9) Agregados de la temporada (tabla de posiciones + stats por jugador)
+    aggregates.refresh_season(season_id, from_matchday=jmin)
+
     conn.close()
@@ -1,8 +1,37 @@
 from __future__ import annotations
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-api = FastAPI(title="Fifth Referee API", version="1.0")
+from infrastructure.postgres.connection import (
+    close_async_pools, close_pools, get_async_pool, get_pool,
+)
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    # Resuelve el DSN y abre los pools al arrancar (no en el primer request).
+    try:
+        get_pool()
+        await get_async_pool()
+    except RuntimeError as e:
+        print(f"[api] DB pool not started: {e}")
+    yield
+    await close_async_pools()
+    close_pools()
+
+api = FastAPI(title="Fifth Referee API", version="1.0", lifespan=_lifespan)
+
+# Middlewares: el último registrado queda más afuera. Orden del request:
+# CORS -> ETag por versión de temporada (If-None-Match -> 304) -> caché
+# de respuestas (usa la versión que resolvió el ETag) -> endpoint.
+from .etag import season_etag_middleware
+from .response_cache import response_cache, response_cache_middleware
+api.middleware("http")(response_cache_middleware)
+api.middleware("http")(season_etag_middleware)
+
+@api.get("/v1/cache/stats", include_in_schema=False)
+def cache_stats() -> dict:
+    return response_cache.stats()
 
 # CORS (ajusta orígenes si hace falta)
 api.add_middleware(
@@ -24,6 +53,8 @@ from .routers import (
     standings,
     stats,
     events,
+    export,
+    leaders,
 )
 
 # Monta routers con prefijo /v1
@@ -36,3 +67,5 @@ api.include_router(matches.router,   prefix="/v1")
 api.include_router(standings.router, prefix="/v1")
 api.include_router(stats.router,     prefix="/v1")
 api.include_router(events.router,    prefix="/v1")
+api.include_router(export.router,    prefix="/v1")
+api.include_router(leaders.router,   prefix="/v1")
@@ -1,8 +1,8 @@
 from __future__ import annotations
 from typing import Any, List, Optional
 from fastapi import HTTPException
-from domain.ids import SeasonId
 from infrastructure.postgres.adapters import get_conn, PgMatchAdapter
+from infrastructure.postgres.connection import get_async_conn
 from .schemas import TeamItem, StandingRowAPI
 
 def _get(row: Any, *keys: Any) -> Any:
@@ -29,12 +29,60 @@ def _get(row: Any, *keys: Any) -> Any:
 def get_adapter() -> PgMatchAdapter:
     return PgMatchAdapter()
 
+# Seasons are never renumbered: once seen, skip the round-trip.
+_KNOWN_SEASONS: set[int] = set()
+
 def _ensure_season(season_id: int) -> None:
+    if season_id in _KNOWN_SEASONS:
+        return
     sql = "SELECT 1 FROM core.season WHERE season_id = %s"
     with get_conn() as conn:
         row = conn.execute(sql, [season_id]).fetchone()
     if not row:
         raise HTTPException(404, detail="season not found")
+    _KNOWN_SEASONS.add(season_id)
+
+# ---- Async data access (async handlers) ----
+# Each call borrows its own pooled connection, so independent queries of one
+# request can run concurrently with asyncio.gather.
+
+async def _fetch_all(sql: str, params: Optional[List[Any] | dict] = None) -> list:
+    async with get_async_conn() as conn:
+        cur = await conn.execute(sql, params)
+        return await cur.fetchall()
+
+async def _fetch_one(sql: str, params: Optional[List[Any]] = None) -> Any:
+    async with get_async_conn() as conn:
+        cur = await conn.execute(sql, params)
+        return await cur.fetchone()
+
+async def _ensure_season_async(season_id: int) -> None:
+    if season_id in _KNOWN_SEASONS:
+        return
+    row = await _fetch_one("SELECT 1 FROM core.season WHERE season_id = %s", [season_id])
+    if not row:
+        raise HTTPException(404, detail="season not found")
+    _KNOWN_SEASONS.add(season_id)
+
+# ---- Season data version (core.season_version, bumped by ETL/pipeline) ----
+
+_HAS_SEASON_VERSION_TABLE = False
+
+async def _season_version(season_id: int) -> Optional[int]:
+    """
+    Current data version of a season (0 if it was never bumped), or None
+    when core.season_version does not exist yet (no migration applied).
+    """
+    global _HAS_SEASON_VERSION_TABLE
+    if not _HAS_SEASON_VERSION_TABLE:
+        row = await _fetch_one("SELECT to_regclass('core.season_version') IS NOT NULL AS ok")
+        if not (row and _get(row, "ok", 0)):
+            return None
+        _HAS_SEASON_VERSION_TABLE = True
+    row = await _fetch_one(
+        "SELECT version FROM core.season_version WHERE season_id = %s", [season_id]
+    )
+    return int(_get(row, "version", 0)) if row else 0
 
 def _list_teams(season_id: int) -> List[TeamItem]:
     sql = """
@@ -59,73 +107,176 @@ def _list_teams(season_id: int) -> List[TeamItem]:
 def _team_name_map(season_id: int) -> dict[int, str]:
     return {t.team_id: t.team_name for t in _list_teams(season_id)}
 
-def _wdl_by_team(season_id: int, adapter: PgMatchAdapter) -> dict[int, dict[str, int]]:
-    out: dict[int, dict[str, int]] = {}
-    matches = adapter.list_by_season(SeasonId(season_id), only_finalized=True)
-    for m in matches:
-        if m.score is None:
-            continue
-        ht, at = int(m.home_team_id), int(m.away_team_id)
-        hs, as_ = int(m.score.home), int(m.score.away)
-        for tid in (ht, at):
-            out.setdefault(tid, {"win": 0, "draw": 0, "loss": 0})
-        if hs > as_:
-            out[ht]["win"] += 1; out[at]["loss"] += 1
-        elif hs < as_:
-            out[ht]["loss"] += 1; out[at]["win"] += 1
-        else:
-            out[ht]["draw"] += 1; out[at]["draw"] += 1
-    return out
-
-def _compute_standings_fallback(season_id: int, win: int, draw: int, loss: int) -> list[StandingRowAPI]:
-    teams = _list_teams(season_id)
-    if not teams:
-        return []
-    sql = """
-    SELECT m.local_team_id  AS home_team_id,
-           m.away_team_id   AS away_team_id,
-           m.local_score    AS home_score,
-           m.away_score     AS away_score
-    FROM core.match m
+# ---- Standings computed in SQL (no core.standings, or custom scoring) ----
+# Each finalized match is unpivoted into one row per side (a single scan of
+# core.match), then grouped per team. Points and the table order (points,
+# goal difference, goals for, name) are resolved in the same statement.
+
+_STANDINGS_RESULTS_CTE = """
+results AS (
+    SELECT md.matchday_number, r.team_id, r.gf, r.ga
+    FROM core."match" m
     JOIN core.matchday md ON md.matchday_id = m.matchday_id
-    WHERE md.season_id = %s
+    CROSS JOIN LATERAL (VALUES
+        (m.local_team_id, m.local_score, m.away_score),
+        (m.away_team_id,  m.away_score,  m.local_score)
+    ) AS r (team_id, gf, ga)
+    WHERE md.season_id = %(season_id)s
+      AND m.local_score IS NOT NULL
+      AND m.away_score IS NOT NULL
+      AND (%(until)s::int IS NULL OR md.matchday_number <= %(until)s::int)
+),
+teams AS (
+    SELECT st.team_id FROM registry.season_team st WHERE st.season_id = %(season_id)s
+    UNION
+    SELECT team_id FROM results
+)"""
+
+_STANDINGS_SQL = f"""
+WITH {_STANDINGS_RESULTS_CTE},
+totals AS (
+    SELECT t.team_id,
+           count(r.team_id)::int                     AS played,
+           (count(*) FILTER (WHERE r.gf > r.ga))::int AS win,
+           (count(*) FILTER (WHERE r.gf = r.ga))::int AS draw,
+           (count(*) FILTER (WHERE r.gf < r.ga))::int AS loss,
+           COALESCE(sum(r.gf), 0)::int               AS gf,
+           COALESCE(sum(r.ga), 0)::int               AS ga
+    FROM teams t
+    LEFT JOIN results r ON r.team_id = t.team_id
+    GROUP BY t.team_id
+),
+scored AS (
+    SELECT x.*, x.gf - x.ga AS gd,
+           x.win * %(win)s::int + x.draw * %(draw)s::int + x.loss * %(loss)s::int AS points
+    FROM totals x
+)
+SELECT s.team_id, tm.team_name, s.played, s.win, s.draw, s.loss,
+       s.gf, s.ga, s.gd, s.points,
+       row_number() OVER (ORDER BY s.points DESC, s.gd DESC, s.gf DESC, tm.team_name) AS "position"
+FROM scored s
+LEFT JOIN reference.team tm ON tm.team_id = s.team_id
+ORDER BY "position"
+"""
+
+_STANDINGS_HISTORY_SQL = f"""
+WITH {_STANDINGS_RESULTS_CTE},
+matchdays AS (
+    SELECT DISTINCT matchday_number FROM results
+),
+per_matchday AS (
+    SELECT d.matchday_number, t.team_id,
+           count(r.team_id)                  AS played,
+           count(*) FILTER (WHERE r.gf > r.ga) AS win,
+           count(*) FILTER (WHERE r.gf = r.ga) AS draw,
+           count(*) FILTER (WHERE r.gf < r.ga) AS loss,
+           COALESCE(sum(r.gf), 0)            AS gf,
+           COALESCE(sum(r.ga), 0)            AS ga
+    FROM matchdays d
+    CROSS JOIN teams t
+    LEFT JOIN results r ON r.team_id = t.team_id AND r.matchday_number = d.matchday_number
+    GROUP BY d.matchday_number, t.team_id
+),
+cumulative AS (
+    SELECT matchday_number, team_id,
+           (sum(played) OVER w)::int AS played,
+           (sum(win)    OVER w)::int AS win,
+           (sum(draw)   OVER w)::int AS draw,
+           (sum(loss)   OVER w)::int AS loss,
+           (sum(gf)     OVER w)::int AS gf,
+           (sum(ga)     OVER w)::int AS ga
+    FROM per_matchday
+    WINDOW w AS (PARTITION BY team_id ORDER BY matchday_number)
+),
+scored AS (
+    SELECT c.*, c.gf - c.ga AS gd,
+           c.win * %(win)s::int + c.draw * %(draw)s::int + c.loss * %(loss)s::int AS points
+    FROM cumulative c
+),
+ranked AS (
+    SELECT s.matchday_number, s.team_id, tm.team_name, s.played, s.win, s.draw, s.loss,
+           s.gf, s.ga, s.gd, s.points,
+           (row_number() OVER (
+               PARTITION BY s.matchday_number
+               ORDER BY s.points DESC, s.gd DESC, s.gf DESC, tm.team_name
+           ))::int AS "position"
+    FROM scored s
+    LEFT JOIN reference.team tm ON tm.team_id = s.team_id
+)
+SELECT * FROM ranked
+WHERE %(team_id)s::int IS NULL OR team_id = %(team_id)s::int
+ORDER BY matchday_number, "position"
+"""
+
+async def _standings_computed(
+    season_id: int, win: int, draw: int, loss: int, until_matchday: Optional[int] = None
+) -> list[StandingRowAPI]:
+    rows = await _fetch_all(_STANDINGS_SQL, {
+        "season_id": season_id, "until": until_matchday,
+        "win": win, "draw": draw, "loss": loss,
+    })
+    return [
+        StandingRowAPI(
+            team_id=int(r["team_id"]), team_name=r["team_name"],
+            played=r["played"], win=r["win"], draw=r["draw"], loss=r["loss"],
+            gf=r["gf"], ga=r["ga"], gd=r["gd"], points=r["points"], position=r["position"],
+        )
+        for r in rows
+    ]
+
+async def _standings_history(
+    season_id: int, win: int, draw: int, loss: int,
+    until_matchday: Optional[int] = None, team_id: Optional[int] = None,
+) -> list:
+    """Cumulative table after every matchday with results (dict rows)."""
+    return await _fetch_all(_STANDINGS_HISTORY_SQL, {
+        "season_id": season_id, "until": until_matchday, "team_id": team_id,
+        "win": win, "draw": draw, "loss": loss,
+    })
+
+_STANDINGS_SNAPSHOT_SQL = """
+SELECT s.team_id, t.team_name, s.played, s.win, s.draw, s.loss,
+       s.gf, s.ga, s.points, s."position"
+FROM core.standings s
+LEFT JOIN reference.team t ON t.team_id = s.team_id
+WHERE s.season_id = %s
+  AND s.matchday_number = (
+      SELECT max(matchday_number)
+      FROM core.standings
+      WHERE season_id = %s
+        AND (%s::int IS NULL OR matchday_number <= %s::int)
+  )
+ORDER BY s."position"
+"""
+
+# Only a positive answer is cached, so applying the migration needs no restart.
+_HAS_STANDINGS_TABLE = False
+
+async def _standings_snapshot(season_id: int, until_matchday: Optional[int] = None) -> list[StandingRowAPI]:
     """
-    with get_conn() as conn:
-        rows = conn.execute(sql, [season_id]).fetchall()
-    by_team: dict[int, dict[str, int]] = {
-        int(t.team_id): {"played": 0, "win": 0, "draw": 0, "loss": 0, "gf": 0, "ga": 0}
-        for t in teams
-    }
-    for r in rows:
-        hs = _get(r, "home_score")
-        as_ = _get(r, "away_score")
-        if hs is None or as_ is None:
-            continue
-        ht = int(_get(r, "home_team_id"))
-        at = int(_get(r, "away_team_id"))
-        hs = int(hs); as_ = int(as_)
-        by_team[ht]["played"] += 1; by_team[at]["played"] += 1
-        by_team[ht]["gf"] += hs; by_team[ht]["ga"] += as_
-        by_team[at]["gf"] += as_; by_team[at]["ga"] += hs
-        if hs > as_:
-            by_team[ht]["win"] += 1; by_team[at]["loss"] += 1
-        elif hs < as_:
-            by_team[ht]["loss"] += 1; by_team[at]["win"] += 1
-        else:
-            by_team[ht]["draw"] += 1; by_team[at]["draw"] += 1
-    name_map = _team_name_map(season_id)
-    out: list[StandingRowAPI] = []
-    for tid, agg in by_team.items():
-        gd = agg["gf"] - agg["ga"]
-        pts = agg["win"] * win + agg["draw"] * draw + agg["loss"] * loss
-        out.append(StandingRowAPI(
-            team_id=tid,
-            team_name=name_map.get(tid),
-            played=agg["played"],
-            win=agg["win"], draw=agg["draw"], loss=agg["loss"],
-            gf=agg["gf"], ga=agg["ga"], gd=gd, points=pts, position=0
-        ))
-    out.sort(key=lambda x: (-x.points, -x.gd, -x.gf, x.team_name or ""))
-    for i, r in enumerate(out, start=1):
-        r.position = i
-    return out
+    Precomputed table (core.standings, maintained by the ETL) as of the last
+    matchday <= until_matchday. Empty when the table is missing or has no
+    rows for the season, so callers can fall back to computing it.
+    """
+    global _HAS_STANDINGS_TABLE
+    if not _HAS_STANDINGS_TABLE:
+        row = await _fetch_one("SELECT to_regclass('core.standings') IS NOT NULL AS ok")
+        if not (row and _get(row, "ok", 0)):
+            return []
+        _HAS_STANDINGS_TABLE = True
+    rows = await _fetch_all(
+        _STANDINGS_SNAPSHOT_SQL, [season_id, season_id, until_matchday, until_matchday]
+    )
+    return [
+        StandingRowAPI(
+            team_id=int(_get(r, "team_id")),
+            team_name=_get(r, "team_name"),
+            played=int(_get(r, "played")),
+            win=int(_get(r, "win")), draw=int(_get(r, "draw")), loss=int(_get(r, "loss")),
+            gf=int(_get(r, "gf")), ga=int(_get(r, "ga")),
+            gd=int(_get(r, "gf")) - int(_get(r, "ga")),
+            points=int(_get(r, "points")),
+            position=int(_get(r, "position")),
+        )
+        for r in rows
+    ]
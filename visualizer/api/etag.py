@@ -0,0 +1,75 @@
+from __future__ import annotations
+import re
+from typing import Optional
+from fastapi import Request, Response
+
+from . import deps
+from .streaming import ARROW_STREAM, wants_ndjson
+
+# Season data only changes when the ETL/pipeline commits a load, which bumps
+# core.season_version. Every /v1/seasons/{id}/... GET carries that version
+# as its ETag; a matching If-None-Match is answered with 304 after a single
+# primary-key lookup, before the endpoint runs any of its queries.
+
+_SEASON_PATH = re.compile(r"^/v1/seasons/(\d+)(?:/|$)")
+
+# Routes whose body depends on Accept (JSON vs NDJSON, Arrow vs CSV): the
+# negotiated representation goes into the ETag and the response varies on
+# Accept, so a revalidation never matches a body of another format.
+_NDJSON_ROUTES = re.compile(r"^/v1/seasons/\d+/(events|participations|stats/basic)$")
+_EXPORT_ROUTE = re.compile(r"^/v1/seasons/\d+/export/[^/]+$")
+
+def _representation(request: Request) -> Optional[str]:
+    """Requested media variant of a negotiated route; None for the rest."""
+    path, accept = request.url.path, request.headers.get("accept")
+    if _NDJSON_ROUTES.match(path):
+        return "ndjson" if wants_ndjson(accept) else "json"
+    if _EXPORT_ROUTE.match(path):
+        fmt = request.query_params.get("format")
+        if fmt in ("arrow", "csv"):
+            return fmt
+        return "arrow" if ARROW_STREAM in (accept or "") else "csv"
+    return None
+
+def season_etag(season_id: int, version: int, representation: Optional[str] = None) -> str:
+    if representation:
+        return f'W/"season-{season_id}-v{version}-{representation}"'
+    return f'W/"season-{season_id}-v{version}"'
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison (RFC 9110 §13.1.2) against a comma-separated list."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in if_none_match.split(","))
+
+async def season_etag_middleware(request: Request, call_next):
+    m = _SEASON_PATH.match(request.url.path)
+    if m is None or request.method not in ("GET", "HEAD"):
+        return await call_next(request)
+
+    season_id = int(m.group(1))
+    try:
+        version = await deps._season_version(season_id)
+    except Exception as e:
+        # Without a version we just serve uncached; the endpoint reports DB errors.
+        print(f"[etag] season={season_id} version lookup failed: {e!r}")
+        version = None
+    request.state.season_version = version  # reused by the response cache
+    if version is None:
+        return await call_next(request)
+
+    representation = _representation(request)
+    etag = season_etag(season_id, version, representation)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if representation is not None:
+        headers["Vary"] = "Accept"
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    response = await call_next(request)
+    if 200 <= response.status_code < 300:
+        response.headers.update(headers)
+    return response
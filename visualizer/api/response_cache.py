@@ -0,0 +1,160 @@
+from __future__ import annotations
+import asyncio
+import os
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from fastapi import Request, Response
+
+# In-process cache of rendered responses for the season endpoints the
+# dashboard polls constantly. Entries are tagged with the season data
+# version (core.season_version, see api.etag): a bump by the ETL/pipeline
+# makes every older entry of that season a miss. Size-bounded LRU; concurrent
+# misses of the same key share one computation (single-flight).
+
+_CACHED_ROUTES = re.compile(
+    r"^/v1/seasons/(\d+)/(standings(?:/history)?|leaders|summary|snapshot|teams|players|matchdays)$"
+)
+
+@dataclass(frozen=True)
+class CachedResponse:
+    status_code: int
+    headers: Tuple[Tuple[str, str], ...]
+    body: bytes
+
+    def to_response(self) -> Response:
+        return Response(content=self.body, status_code=self.status_code, headers=dict(self.headers))
+
+Key = Tuple[str, str]
+
+class ResponseCache:
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Key, Tuple[int, CachedResponse]]" = OrderedDict()
+        self._inflight: Dict[Tuple[Key, int], asyncio.Future] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def _drop(self, key: Key) -> None:
+        _version, entry = self._entries.pop(key)
+        self._bytes -= len(entry.body)
+
+    def get(self, key: Key, version: int) -> Optional[CachedResponse]:
+        found = self._entries.get(key)
+        if found is None:
+            return None
+        if found[0] != version:
+            self._drop(key)  # the season was reloaded since
+            return None
+        self._entries.move_to_end(key)
+        return found[1]
+
+    def put(self, key: Key, version: int, entry: CachedResponse) -> None:
+        if len(entry.body) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (version, entry)
+        self._bytes += len(entry.body)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    async def get_or_compute(
+        self, key: Key, version: int, compute: Callable[[], Awaitable[CachedResponse]]
+    ) -> CachedResponse:
+        flight = (key, version)
+        while True:
+            entry = self.get(key, version)
+            if entry is not None:
+                self.hits += 1
+                return entry
+            pending = self._inflight.get(flight)
+            if pending is None:
+                break
+            self.coalesced += 1
+            entry = await asyncio.shield(pending)
+            if entry is not None:
+                return entry
+            # The computing request was cancelled (client gone): this one is
+            # still connected, so it retries and may become the new leader.
+
+        self.misses += 1
+        # Resolves to the entry, or to None if the computing request is cancelled.
+        fut: "asyncio.Future[Optional[CachedResponse]]" = asyncio.get_running_loop().create_future()
+        self._inflight[flight] = fut
+        try:
+            entry = await compute()
+        except asyncio.CancelledError:
+            fut.set_result(None)
+            raise
+        except Exception as e:
+            fut.set_exception(e)
+            fut.exception()  # mark retrieved when nobody was waiting
+            raise
+        else:
+            if entry.status_code == 200:
+                self.put(key, version, entry)
+            fut.set_result(entry)
+            return entry
+        finally:
+            self._inflight.pop(flight, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else None,
+        }
+
+response_cache = ResponseCache(
+    max_entries=int(os.getenv("FR_API_CACHE_ENTRIES", "512")),
+    max_bytes=int(os.getenv("FR_API_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+)
+
+def _cache_key(request: Request) -> Key:
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    return request.url.path, query
+
+async def response_cache_middleware(request: Request, call_next):
+    # Runs inside the ETag middleware, which already looked up the version.
+    version: Optional[int] = getattr(request.state, "season_version", None)
+    if (
+        request.method != "GET"
+        or version is None
+        or not response_cache.enabled
+        or not _CACHED_ROUTES.match(request.url.path)
+    ):
+        return await call_next(request)
+
+    async def compute() -> CachedResponse:
+        response = await call_next(request)
+        chunks: List[bytes] = [chunk async for chunk in response.body_iterator]
+        return CachedResponse(
+            status_code=response.status_code,
+            headers=tuple(response.headers.items()),
+            body=b"".join(chunks),
+        )
+
+    entry = await response_cache.get_or_compute(_cache_key(request), version, compute)
+    return entry.to_response()
@@ -2,50 +2,22 @@
 from __future__ import annotations
 
 from typing import Optional, List, Any
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Header, Query
 
 from ..schemas import MatchEvent, ParticipationAPI
-from ..deps import _ensure_season, get_conn, _get
+from ..deps import _ensure_season_async, _fetch_all
+from ..pagination import NEXT_CURSOR_HEADER, decode_cursor, keyset_condition, next_cursor
+from ..serialization import RowSpec, json_response
+from ..streaming import ndjson_response, wants_ndjson
 
 router = APIRouter(tags=["events"])
 
 
-# -----------------------------
-# Helpers de casteo tolerantes
-# -----------------------------
-
-def _int_or_none(x) -> Optional[int]:
-    try:
-        return int(x) if x is not None else None
-    except Exception:
-        return None
-
-def _str_or_none(x) -> Optional[str]:
-    try:
-        return str(x) if x is not None else None
-    except Exception:
-        return None
-
-def _row_to_dict(r):
-    """Normaliza cualquier tipo de fila a dict con las claves del SELECT."""
-    if isinstance(r, dict):
-        return r
-    m = getattr(r, "_mapping", None)
-    if m is not None:
-        return dict(m)
-    # fallback: tupla/sequence en el mismo orden del SELECT
-    return {
-        "event_id": r[0],
-        "match_id": r[1],
-        "event_type": r[2],
-        "minute": r[3],
-        "main_player_id": r[4],
-        "extra_player_id": r[5],
-        "team_id": r[6],
-    }
+_EVENT_ROW = RowSpec(MatchEvent)
+_PARTICIPATION_ROW = RowSpec(ParticipationAPI)
 
 @router.get("/seasons/{season_id}/events", response_model=List[MatchEvent])
-def season_events(
+async def season_events(
     season_id: int,
     team_id: Optional[int] = Query(None, ge=1),
     match_id: Optional[int] = Query(None, ge=1),
@@ -54,12 +26,18 @@ def season_events(
     minute_to: Optional[int] = Query(None, ge=0),
     limit: int = Query(1000, ge=1, le=5000),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page (offset is ignored)"),
+    accept: Optional[str] = Header(None),
 ):
     """
-    Lista eventos de una temporada. Castea ENUM a texto y tolera filas dict/Row/tupla.
-    Descarta filas sin (event_id, match_id, event_type).
+    Lista eventos de una temporada (ENUM casteado a texto); excluye filas
+    sin (event_id, match_id, event_type).
+    Si hay más páginas, la siguiente se pide con el header X-Next-Cursor.
+    Con `Accept: application/x-ndjson` transmite todo el resultado filtrado
+    (desde `cursor`, sin limit/offset), una fila JSON por línea.
     """
-    _ensure_season(season_id)
+    await _ensure_season_async(season_id)
+    after = decode_cursor("events", cursor, 2)
 
     where = ["md.season_id = %s"]
     params: List[Any] = [season_id]
@@ -85,6 +63,10 @@ def season_events(
         "e.match_id IS NOT NULL",
         "e.event_type IS NOT NULL",
     ])
+    if after is not None:
+        where.append(keyset_condition(("e.match_id", "e.event_id")))
+        params.extend(after)
+        offset = 0
 
     sql = f"""
         SELECT
@@ -100,61 +82,43 @@ def season_events(
         JOIN core.matchday md ON md.matchday_id = m.matchday_id
         WHERE {' AND '.join(where)}
         ORDER BY e.match_id, e.event_id
-        LIMIT %s OFFSET %s
     """
-    params.extend([limit, offset])
-
-    with get_conn() as conn:
-        rows = conn.execute(sql, params).fetchall()
-
-    out: List[MatchEvent] = []
-    dropped = 0
-
-    for r in rows:
-        try:
-            d = _row_to_dict(r)
-            eid = _int_or_none(d.get("event_id"))
-            mid = _int_or_none(d.get("match_id"))
-            ety = _str_or_none(d.get("event_type"))
-            if eid is None or mid is None or ety is None:
-                dropped += 1
-                continue
-
-            out.append(MatchEvent(
-                event_id=eid,
-                match_id=mid,
-                event_type=ety,  # ya es str por el cast
-                minute=_int_or_none(d.get("minute")),
-                main_player_id=_int_or_none(d.get("main_player_id")),
-                extra_player_id=_int_or_none(d.get("extra_player_id")),
-                team_id=_int_or_none(d.get("team_id")),
-            ))
-        except Exception as e:
-            print(f"[events] WARN row parse failed: {e!r} | row={r!r}")
-            dropped += 1
-            continue
-
-    print(f"[events] season={season_id} rows={len(rows)} out={len(out)} dropped={dropped}")
-    return out
+    if wants_ndjson(accept):
+        return ndjson_response(sql, params)
+
+    rows = await _fetch_all(sql + " LIMIT %s OFFSET %s", [*params, limit, offset])
+
+    last = rows[-1] if rows else None
+    token = next_cursor(
+        "events", (last["match_id"], last["event_id"]) if last else None, len(rows), limit
+    )
+    return json_response(
+        _EVENT_ROW.rows(rows), headers={NEXT_CURSOR_HEADER: token} if token else None
+    )
 
 
 # ------------------------------------------------------------------
 # /v1/seasons/{season_id}/participations
 # ------------------------------------------------------------------
 @router.get("/seasons/{season_id}/participations", response_model=List[ParticipationAPI])
-def season_participations(
+async def season_participations(
     season_id: int,
     team_id: Optional[int] = Query(None, ge=1),
     player_id: Optional[int] = Query(None, ge=1),
     matchday: Optional[int] = Query(None, ge=1),
     limit: int = Query(1000, ge=1, le=5000),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page (offset is ignored)"),
+    accept: Optional[str] = Header(None),
 ):
     """
     Participaciones por temporada, con filtros básicos.
     Devuelve pares (match_id, player_id) + status/position tal cual DB.
+    Si hay más páginas, la siguiente se pide con el header X-Next-Cursor.
+    Con `Accept: application/x-ndjson` transmite todo el resultado filtrado.
     """
-    _ensure_season(season_id)
+    await _ensure_season_async(season_id)
+    after = decode_cursor("participations", cursor, 2)
 
     where = ["md.season_id = %s"]
     params: List[Any] = [season_id]
@@ -168,31 +132,32 @@ def season_participations(
     if matchday is not None:
         where.append("md.matchday_number = %s")
         params.append(matchday)
+    if after is not None:
+        where.append(keyset_condition(("p.match_id", "p.player_id")))
+        params.extend(after)
+        offset = 0
 
     sql = f"""
     SELECT
         p.match_id,
         p.player_id,
-        p.status,
-        p.position
+        COALESCE(p.status::text, '')   AS status,
+        COALESCE(p.position::text, '') AS position
     FROM core.participation p
     JOIN core.match m     ON m.match_id = p.match_id
     JOIN core.matchday md ON md.matchday_id = m.matchday_id
     WHERE {' AND '.join(where)}
     ORDER BY p.match_id, p.player_id
-    LIMIT %s OFFSET %s
     """
-    params.extend([limit, offset])
-
-    with get_conn() as conn:
-        rows = conn.execute(sql, params).fetchall()
-
-    out: List[ParticipationAPI] = []
-    for r in rows:
-        out.append(ParticipationAPI(
-            match_id=_int_or_none(_get(r, 0)) or 0,
-            player_id=_int_or_none(_get(r, 1)) or 0,
-            status=_str_or_none(_get(r, 2)) or "",
-            position=_str_or_none(_get(r, 3)) or "",
-        ))
-    return out
+    if wants_ndjson(accept):
+        return ndjson_response(sql, params)
+
+    rows = await _fetch_all(sql + " LIMIT %s OFFSET %s", [*params, limit, offset])
+
+    last = rows[-1] if rows else None
+    token = next_cursor(
+        "participations", (last["match_id"], last["player_id"]) if last else None, len(rows), limit
+    )
+    return json_response(
+        _PARTICIPATION_ROW.rows(rows), headers={NEXT_CURSOR_HEADER: token} if token else None
+    )
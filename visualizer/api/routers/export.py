@@ -0,0 +1,166 @@
+from __future__ import annotations
+import io
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional
+from fastapi import APIRouter, Header, Query
+from fastapi.responses import StreamingResponse
+
+from ..deps import _ensure_season_async
+from ..streaming import ARROW_STREAM, Column, iter_copy_csv, iter_row_batches
+
+try:  # optional: without pyarrow every export is CSV
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - depends on the environment
+    pa = None
+
+router = APIRouter(tags=["export"])
+
+_SEASON_JOIN = """
+JOIN core.match m     ON m.match_id = bs.match_id
+JOIN core.matchday md ON md.matchday_id = m.matchday_id
+WHERE md.season_id = %s
+"""
+
+def _role_sql(table: str) -> str:
+    return f"""
+    SELECT x.* FROM {table} x
+    JOIN core.basic_stats bs ON bs.basic_stats_id = x.basic_stats_id
+    {_SEASON_JOIN}
+    ORDER BY x.basic_stats_id
+    """
+
+# Whole-season datasets, same rows and order as the paged endpoints.
+_DATASETS: Dict[str, str] = {
+    "basic_stats": f"""
+    SELECT bs.basic_stats_id, bs.match_id, bs.player_id,
+           COALESCE(bs.minutes,0) AS minutes, COALESCE(bs.goals,0) AS goals,
+           COALESCE(bs.assists,0) AS assists, COALESCE(bs.touches,0) AS touches,
+           COALESCE(bs.passes_total,0) AS passes_total,
+           COALESCE(bs.passes_completed,0) AS passes_completed,
+           COALESCE(bs.ball_recoveries,0) AS ball_recoveries,
+           COALESCE(bs.possessions_lost,0) AS possessions_lost,
+           COALESCE(bs.aerial_duels_won,0) AS aerial_duels_won,
+           COALESCE(bs.aerial_duels_total,0) AS aerial_duels_total,
+           COALESCE(bs.ground_duels_won,0) AS ground_duels_won,
+           COALESCE(bs.ground_duels_total,0) AS ground_duels_total
+    FROM core.basic_stats bs
+    {_SEASON_JOIN}
+    ORDER BY bs.basic_stats_id
+    """,
+    "goalkeeper_stats": _role_sql("stats.goalkeeper_stats"),
+    "defender_stats": _role_sql("stats.defender_stats"),
+    "midfielder_stats": _role_sql("stats.midfielder_stats"),
+    "forward_stats": _role_sql("stats.forward_stats"),
+    "participations": """
+    SELECT p.match_id, p.player_id, p.status::text AS status, p.position::text AS position
+    FROM core.participation p
+    JOIN core.match m     ON m.match_id = p.match_id
+    JOIN core.matchday md ON md.matchday_id = m.matchday_id
+    WHERE md.season_id = %s
+    ORDER BY p.match_id, p.player_id
+    """,
+    "events": """
+    SELECT e.event_id, e.match_id, e.event_type::text AS event_type, e.minute,
+           e.main_player_id, e.extra_player_id, e.team_id
+    FROM core.event e
+    JOIN core.match m     ON m.match_id = e.match_id
+    JOIN core.matchday md ON md.matchday_id = m.matchday_id
+    WHERE md.season_id = %s
+    ORDER BY e.match_id, e.event_id
+    """,
+}
+
+Dataset = Literal[
+    "basic_stats", "goalkeeper_stats", "defender_stats", "midfielder_stats",
+    "forward_stats", "participations", "events",
+]
+
+# ---- Arrow IPC ----
+
+# Postgres type OID -> Arrow type; anything else goes out as string.
+_INT_OIDS = {21: "int16", 23: "int32", 20: "int64"}
+_FLOAT_OIDS = {700, 701, 1700}  # float4, float8, numeric
+_BOOL_OID = 16
+
+def _arrow_schema(columns: List[Column]):
+    fields = []
+    for name, oid in columns:
+        if oid in _INT_OIDS:
+            typ = getattr(pa, _INT_OIDS[oid])()
+        elif oid in _FLOAT_OIDS:
+            typ = pa.float64()
+        elif oid == _BOOL_OID:
+            typ = pa.bool_()
+        else:
+            typ = pa.string()
+        fields.append(pa.field(name, typ))
+    return pa.schema(fields)
+
+def _arrow_batch(schema, rows: List[tuple]):
+    arrays = []
+    for i, field in enumerate(schema):
+        values: List[Any] = [r[i] for r in rows]
+        if pa.types.is_floating(field.type):
+            values = [float(v) if isinstance(v, Decimal) else v for v in values]
+        elif pa.types.is_string(field.type):
+            values = [None if v is None else str(v) for v in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+class _ChunkSink(io.RawIOBase):
+    """File-like target for the IPC writer; drained after every batch."""
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        out, self._chunks = b"".join(self._chunks), []
+        return out
+
+async def _arrow_stream(sql: str, params: List[Any]) -> AsyncIterator[bytes]:
+    sink, writer = _ChunkSink(), None
+    async for columns, rows in iter_row_batches(sql, params):
+        if writer is None:
+            writer = pa.ipc.new_stream(sink, _arrow_schema(columns))
+        if rows:
+            writer.write_batch(_arrow_batch(writer.schema, rows))
+        yield sink.drain()
+    if writer is not None:
+        writer.close()
+        yield sink.drain()
+
+@router.get("/seasons/{season_id}/export/{dataset}")
+async def export_season_dataset(
+    season_id: int,
+    dataset: Dataset,
+    format: Optional[Literal["arrow", "csv"]] = Query(
+        None, description="arrow (IPC stream) or csv; default from Accept, CSV without pyarrow"
+    ),
+    accept: Optional[str] = Header(None),
+):
+    """
+    Whole season of one dataset in a single streamed response, read from a
+    server-side cursor (Arrow) or COPY (CSV) instead of 1000-row JSON pages.
+    """
+    await _ensure_season_async(season_id)
+    want_arrow = format == "arrow" or (format is None and ARROW_STREAM in (accept or ""))
+    sql, params = _DATASETS[dataset], [season_id]
+    filename = f"season_{season_id}_{dataset}"
+
+    if want_arrow and pa is not None:
+        return StreamingResponse(
+            _arrow_stream(sql, params),
+            media_type=ARROW_STREAM,
+            headers={"Content-Disposition": f'attachment; filename="{filename}.arrows"'},
+        )
+    return StreamingResponse(
+        iter_copy_csv(sql, params),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}.csv"'},
+    )
@@ -0,0 +1,137 @@
+from __future__ import annotations
+from typing import List
+from fastapi import APIRouter, HTTPException, Query
+from ..schemas import LeaderRowAPI, LeadersAPI
+from ..deps import _ensure_season_async, _fetch_all, _fetch_one, _get
+from ..serialization import RowSpec, json_response
+
+router = APIRouter(tags=["leaders"])
+
+# metric -> expression over the per-player season totals (`p`)
+METRICS = {
+    "goals": "p.goals",
+    "assists": "p.assists",
+    "goal_contributions": "p.goals + p.assists",
+    "minutes": "p.minutes",
+    "appearances": "p.appearances",
+    "goalkeeper_saves": "p.goalkeeper_saves",
+    "goals_conceded": "p.goals_conceded",
+}
+
+# Per-player season totals: the aggregate the ETL maintains, or the same
+# numbers grouped on the fly from the player-match rows.
+_FROM_AGGREGATE = """
+SELECT ps.player_id, ps.minutes, ps.appearances, ps.goals, ps.assists,
+       ps.goalkeeper_saves, ps.goals_conceded
+FROM core.player_season_stats ps
+WHERE ps.season_id = %(season_id)s
+"""
+
+_FROM_MATCH_ROWS = """
+SELECT bs.player_id,
+       COALESCE(sum(bs.minutes), 0)::int                   AS minutes,
+       (count(*) FILTER (WHERE bs.minutes > 0))::int       AS appearances,
+       COALESCE(sum(bs.goals), 0)::int                     AS goals,
+       COALESCE(sum(bs.assists), 0)::int                   AS assists,
+       COALESCE(sum(gk.goalkeeper_saves), 0)::int          AS goalkeeper_saves,
+       COALESCE(sum(gk.goals_conceded), 0)::int            AS goals_conceded
+FROM core.basic_stats bs
+JOIN core."match" m   ON m.match_id = bs.match_id
+JOIN core.matchday md ON md.matchday_id = m.matchday_id
+LEFT JOIN stats.goalkeeper_stats gk ON gk.basic_stats_id = bs.basic_stats_id
+WHERE md.season_id = %(season_id)s
+GROUP BY bs.player_id
+"""
+
+def _leaders_sql(source: str, metrics: List[str]) -> str:
+    values = ",\n        ".join(f"('{name}', ({METRICS[name]})::numeric)" for name in metrics)
+    return f"""
+WITH per_player AS ({source}),
+candidates AS (
+    SELECT v.metric, p.player_id, p.minutes, v.total,
+           CASE WHEN p.minutes > 0 THEN round(v.total * 90 / p.minutes, 2) END AS per90
+    FROM per_player p
+    CROSS JOIN LATERAL (VALUES
+        {values}
+    ) AS v (metric, total)
+    WHERE p.minutes >= %(min_minutes)s
+      AND v.total > 0
+),
+ranked AS (
+    SELECT c.*,
+           (row_number() OVER (
+               PARTITION BY c.metric
+               ORDER BY CASE WHEN %(per90)s THEN c.per90 ELSE c.total END DESC NULLS LAST,
+                        c.minutes, c.player_id
+           ))::int AS rank
+    FROM candidates c
+)
+SELECT r.metric, r.rank, r.player_id, pl.player_name, tm.team_id, tm.team_name,
+       CASE WHEN %(per90)s THEN r.per90 ELSE r.total END AS value,
+       r.total, r.per90, r.minutes
+FROM ranked r
+LEFT JOIN reference.player pl ON pl.player_id = r.player_id
+LEFT JOIN LATERAL (
+    -- Team of the player's most recent match in the season: the side of
+    -- that match the player is registered with (the new club after a transfer).
+    SELECT t.team_id, t.team_name
+    FROM core.participation pa
+    JOIN core."match" m   ON m.match_id = pa.match_id
+    JOIN core.matchday md ON md.matchday_id = m.matchday_id
+    JOIN registry.season_team st
+      ON st.season_id = md.season_id
+     AND st.team_id IN (m.local_team_id, m.away_team_id)
+    JOIN registry.team_player tp
+      ON tp.season_team_id = st.season_team_id
+     AND tp.player_id = pa.player_id
+    JOIN reference.team t ON t.team_id = st.team_id
+    WHERE pa.player_id = r.player_id AND md.season_id = %(season_id)s
+    ORDER BY md.matchday_number DESC, m.match_id DESC
+    LIMIT 1
+) tm ON true
+WHERE r.rank <= %(k)s
+ORDER BY r.metric, r.rank
+"""
+
+_LEADER_ROW = RowSpec(LeaderRowAPI)
+
+# Only a positive answer is cached, so applying the migration needs no restart.
+_HAS_PLAYER_SEASON_TABLE = False
+
+async def _player_totals_source() -> str:
+    global _HAS_PLAYER_SEASON_TABLE
+    if not _HAS_PLAYER_SEASON_TABLE:
+        row = await _fetch_one("SELECT to_regclass('core.player_season_stats') IS NOT NULL AS ok")
+        if not (row and _get(row, "ok", 0)):
+            return _FROM_MATCH_ROWS
+        _HAS_PLAYER_SEASON_TABLE = True
+    return _FROM_AGGREGATE
+
+@router.get("/seasons/{season_id}/leaders", response_model=LeadersAPI)
+async def season_leaders(
+    season_id: int,
+    metric: str = Query(
+        "goals,assists,goalkeeper_saves,goals_conceded",
+        description=f"comma-separated, any of: {', '.join(METRICS)}",
+    ),
+    k: int = Query(5, ge=1, le=50),
+    per90: bool = Query(False, description="rank by value per 90 minutes"),
+    min_minutes: int = Query(0, ge=0, description="players below this many minutes are left out"),
+):
+    """Top-k players per metric, aggregated and ranked in a single query."""
+    await _ensure_season_async(season_id)
+    metrics = list(dict.fromkeys(m.strip() for m in metric.split(",") if m.strip()))
+    unknown = [m for m in metrics if m not in METRICS]
+    if not metrics or unknown:
+        raise HTTPException(400, detail=f"unknown metric: {', '.join(unknown) or '(none)'}")
+
+    sql = _leaders_sql(await _player_totals_source(), metrics)
+    rows = await _fetch_all(sql, {
+        "season_id": season_id, "k": k, "per90": per90, "min_minutes": min_minutes,
+    })
+    return json_response({
+        "k": k,
+        "per90": per90,
+        "min_minutes": min_minutes,
+        "rows": _LEADER_ROW.rows(rows),
+    })
@@ -1,13 +1,38 @@
 from __future__ import annotations
+import asyncio
 from typing import Optional, Literal, List, Any
 from fastapi import APIRouter, Query
 from ..schemas import MatchList, MatchAPI, MatchEvent, ParticipationAPI
-from ..deps import _ensure_season, get_conn, _get
+from ..deps import _ensure_season_async, _fetch_all, _fetch_one, _get
+from ..pagination import decode_cursor, keyset_condition, next_cursor
 
 router = APIRouter(tags=["matches"])
 
+_EVENTS_SQL = """
+SELECT e.event_id, e.match_id, e.event_type, e.minute,
+       e.main_player_id, e.extra_player_id, e.team_id
+FROM core.event e
+WHERE e.match_id = ANY(%s)
+ORDER BY e.match_id, e.event_id
+"""
+
+_PARTICIPATIONS_SQL = """
+SELECT p.match_id, p.player_id, p.status, p.position
+FROM core.participation p
+WHERE p.match_id = ANY(%s)
+ORDER BY p.match_id, p.player_id
+"""
+
+_SORT_KEYS = ("md.matchday_number", "m.match_id")
+
+async def _no_rows() -> list:
+    return []
+
+async def _no_row() -> None:
+    return None
+
 @router.get("/seasons/{season_id}/matches", response_model=MatchList)
-def list_matches(
+async def list_matches(
     season_id: int,
     matchday_from: Optional[int] = Query(None, ge=1),
     matchday_to: Optional[int] = Query(None, ge=1),
@@ -18,8 +43,11 @@ def list_matches(
     include: Optional[Literal["events", "participations", "events,participations"]] = Query(None),
     limit: int = Query(200, ge=1, le=1000),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (offset is ignored)"),
+    with_total: bool = Query(True, description="run COUNT(*) for `total`"),
 ):
-    _ensure_season(season_id)
+    await _ensure_season_async(season_id)
+    after = decode_cursor("matches", cursor, len(_SORT_KEYS))
     where = ["md.season_id = %s"]
     params: List[Any] = [season_id]
     if matchday is not None:
@@ -37,80 +65,83 @@ def list_matches(
         params.extend([opponent_id, opponent_id])
     if finalized is not None:
         where.append("m.local_score IS NOT NULL AND m.away_score IS NOT NULL" if finalized
-                     else "m.local_score IS NULL OR m.away_score IS NULL")
-    base_sql = f"""
+                     else "(m.local_score IS NULL OR m.away_score IS NULL)")
+    from_sql = """
     FROM core.match m
     JOIN core.matchday md ON md.matchday_id = m.matchday_id
-    WHERE {' AND '.join(where)}
     """
-    count_sql = f"SELECT COUNT(*) {base_sql}"
+    count_sql = f"SELECT COUNT(*) {from_sql} WHERE {' AND '.join(where)}"
+    page_where, page_params = list(where), list(params)
+    if after is not None:
+        page_where.append(keyset_condition(_SORT_KEYS))
+        page_params.extend(after)
+        offset = 0
     list_sql = f"""
     SELECT m.match_id, m.matchday_id, m.local_team_id, m.away_team_id,
-           m.local_score, m.away_score, m.duration, m.stadium
-    {base_sql}
+           m.local_score, m.away_score, m.duration, m.stadium, md.matchday_number
+    {from_sql}
+    WHERE {' AND '.join(page_where)}
     ORDER BY md.matchday_number, m.match_id
     LIMIT %s OFFSET %s
     """
-    with get_conn() as conn:
-        total_row = conn.execute(count_sql, params).fetchone()
-        total = int(_get(total_row, 0, "count")) if total_row else None
-        rows = conn.execute(list_sql, [*params, limit, offset]).fetchall()
-        items = [
-            MatchAPI(
-                match_id=int(_get(r, 0, "match_id")),
-                matchday_id=int(_get(r, 1, "matchday_id")),
-                local_team_id=int(_get(r, 2, "local_team_id")),
-                away_team_id=int(_get(r, 3, "away_team_id")),
-                local_score=(int(_get(r, 4, "local_score")) if _get(r, 4, "local_score") is not None else None),
-                away_score=(int(_get(r, 5, "away_score")) if _get(r, 5, "away_score") is not None else None),
-                duration=int(_get(r, 6, "duration")),
-                stadium=(str(_get(r, 7, "stadium")) if _get(r, 7, "stadium") is not None else None),
-            )
-            for r in rows
-        ]
-        if include:
-            ids = [int(m.match_id) for m in items]
-            if ids:
-                if "events" in include:
-                    ev_sql = """
-                    SELECT e.event_id, e.match_id, e.event_type, e.minute,
-                           e.main_player_id, e.extra_player_id, e.team_id
-                    FROM core.event e
-                    WHERE e.match_id = ANY(%s)
-                    ORDER BY e.match_id, e.event_id
-                    """
-                    ev_rows = conn.execute(ev_sql, [ids]).fetchall()
-                    by_ev: dict[int, list[MatchEvent]] = {}
-                    for r in ev_rows:
-                        e = MatchEvent(
-                            event_id=int(_get(r, 0, "event_id")),
-                            match_id=int(_get(r, 1, "match_id")),
-                            event_type=str(_get(r, 2, "event_type")),
-                            minute=(int(_get(r, 3, "minute")) if _get(r, 3, "minute") is not None else None),
-                            main_player_id=(int(_get(r, 4, "main_player_id")) if _get(r, 4, "main_player_id") is not None else None),
-                            extra_player_id=(int(_get(r, 5, "extra_player_id")) if _get(r, 5, "extra_player_id") is not None else None),
-                            team_id=(int(_get(r, 6, "team_id")) if _get(r, 6, "team_id") is not None else None),
-                        )
-                        by_ev.setdefault(e.match_id, []).append(e)
-                    for m in items:
-                        m.events = by_ev.get(int(m.match_id), [])
-                if "participations" in include:
-                    pr_sql = """
-                    SELECT p.match_id, p.player_id, p.status, p.position
-                    FROM core.participation p
-                    WHERE p.match_id = ANY(%s)
-                    ORDER BY p.match_id, p.player_id
-                    """
-                    pr_rows = conn.execute(pr_sql, [ids]).fetchall()
-                    by_pr: dict[int, list[ParticipationAPI]] = {}
-                    for r in pr_rows:
-                        p = ParticipationAPI(
-                            match_id=int(_get(r, 0, "match_id")),
-                            player_id=int(_get(r, 1, "player_id")),
-                            status=str(_get(r, 2, "status")),
-                            position=str(_get(r, 3, "position")),
-                        )
-                        by_pr.setdefault(p.match_id, []).append(p)
-                    for m in items:
-                        m.participations = by_pr.get(int(m.match_id), [])
-    return MatchList(items=items, limit=limit, offset=offset, total=total)
+    # count + page are independent: one pooled connection each, in parallel.
+    total_row, rows = await asyncio.gather(
+        _fetch_one(count_sql, params) if with_total else _no_row(),
+        _fetch_all(list_sql, [*page_params, limit, offset]),
+    )
+    last = rows[-1] if rows else None
+    cursor_out = next_cursor(
+        "matches",
+        (_get(last, 8, "matchday_number"), _get(last, 0, "match_id")) if last is not None else None,
+        len(rows), limit,
+    )
+    total = int(_get(total_row, 0, "count") or 0) if with_total else None
+    items = [
+        MatchAPI(
+            match_id=int(_get(r, 0, "match_id")),
+            matchday_id=int(_get(r, 1, "matchday_id")),
+            local_team_id=int(_get(r, 2, "local_team_id")),
+            away_team_id=int(_get(r, 3, "away_team_id")),
+            local_score=(int(_get(r, 4, "local_score")) if _get(r, 4, "local_score") is not None else None),
+            away_score=(int(_get(r, 5, "away_score")) if _get(r, 5, "away_score") is not None else None),
+            duration=int(_get(r, 6, "duration")),
+            stadium=(str(_get(r, 7, "stadium")) if _get(r, 7, "stadium") is not None else None),
+        )
+        for r in rows
+    ]
+    ids = [int(m.match_id) for m in items]
+    if include and ids:
+        want_events = "events" in include
+        want_parts = "participations" in include
+        ev_rows, pr_rows = await asyncio.gather(
+            _fetch_all(_EVENTS_SQL, [ids]) if want_events else _no_rows(),
+            _fetch_all(_PARTICIPATIONS_SQL, [ids]) if want_parts else _no_rows(),
+        )
+        if want_events:
+            by_ev: dict[int, list[MatchEvent]] = {}
+            for r in ev_rows:
+                e = MatchEvent(
+                    event_id=int(_get(r, 0, "event_id")),
+                    match_id=int(_get(r, 1, "match_id")),
+                    event_type=str(_get(r, 2, "event_type")),
+                    minute=(int(_get(r, 3, "minute")) if _get(r, 3, "minute") is not None else None),
+                    main_player_id=(int(_get(r, 4, "main_player_id")) if _get(r, 4, "main_player_id") is not None else None),
+                    extra_player_id=(int(_get(r, 5, "extra_player_id")) if _get(r, 5, "extra_player_id") is not None else None),
+                    team_id=(int(_get(r, 6, "team_id")) if _get(r, 6, "team_id") is not None else None),
+                )
+                by_ev.setdefault(e.match_id, []).append(e)
+            for m in items:
+                m.events = by_ev.get(int(m.match_id), [])
+        if want_parts:
+            by_pr: dict[int, list[ParticipationAPI]] = {}
+            for r in pr_rows:
+                p = ParticipationAPI(
+                    match_id=int(_get(r, 0, "match_id")),
+                    player_id=int(_get(r, 1, "player_id")),
+                    status=str(_get(r, 2, "status")),
+                    position=str(_get(r, 3, "position")),
+                )
+                by_pr.setdefault(p.match_id, []).append(p)
+            for m in items:
+                m.participations = by_pr.get(int(m.match_id), [])
+    return MatchList(items=items, limit=limit, offset=offset, total=total, next_cursor=cursor_out)
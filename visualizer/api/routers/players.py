@@ -2,13 +2,13 @@ from __future__ import annotations
 from typing import Optional, List, Any
 from fastapi import APIRouter, Query
 from ..schemas import PlayerList, PlayerItem
-from ..deps import _ensure_season, get_conn, _get
+from ..deps import _ensure_season_async, _fetch_all, _get
 
 router = APIRouter(tags=["players"])
 
 @router.get("/seasons/{season_id}/players", response_model=PlayerList)
-def list_players(season_id: int, team_id: Optional[int] = Query(None, ge=1)):
-    _ensure_season(season_id)
+async def list_players(season_id: int, team_id: Optional[int] = Query(None, ge=1)):
+    await _ensure_season_async(season_id)
     sql = """
     SELECT st.season_team_id,
            st.team_id,
@@ -27,8 +27,7 @@ def list_players(season_id: int, team_id: Optional[int] = Query(None, ge=1)):
         sql += " AND st.team_id = %s"
         params.append(team_id)
     sql += " ORDER BY t.team_name, p.player_name"
-    with get_conn() as conn:
-        rows = conn.execute(sql, params).fetchall()
+    rows = await _fetch_all(sql, params)
     items = [
         PlayerItem(
             season_team_id=int(_get(r, 0, "season_team_id")),
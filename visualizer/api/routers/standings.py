@@ -1,52 +1,52 @@
 from __future__ import annotations
 from typing import Optional
-from fastapi import APIRouter, Query, Depends, HTTPException
-from domain.ids import SeasonId
-from application.use_cases import get_season_standings
-from infrastructure.postgres.adapters import PgMatchAdapter
-from ..schemas import SeasonStandingsDTOAPI, StandingRowAPI
-from ..deps import get_adapter, _team_name_map, _wdl_by_team, _compute_standings_fallback
+from fastapi import APIRouter, Query
+from ..schemas import SeasonStandingsDTOAPI, StandingsHistoryAPI, StandingsHistoryRowAPI
+from ..deps import _ensure_season_async, _standings_computed, _standings_history, _standings_snapshot
+from ..serialization import RowSpec, json_response
 
 router = APIRouter(tags=["standings"])
 
+_HISTORY_ROW = RowSpec(StandingsHistoryRowAPI)
+
 @router.get("/seasons/{season_id}/standings", response_model=SeasonStandingsDTOAPI)
-def standings(
+async def standings(
     season_id: int,
     win: int = Query(3, ge=0, le=10),
     draw: int = Query(1, ge=0, le=10),
     loss: int = Query(0, ge=0, le=10),
     until_matchday: Optional[int] = Query(None, ge=1),
-    adapter: PgMatchAdapter = Depends(get_adapter),
 ):
-    try:
-        dto = get_season_standings(SeasonId(season_id), adapter)
-        wdl = _wdl_by_team(season_id, adapter)
-        name_map = _team_name_map(season_id)
-        out: list[StandingRowAPI] = []
-        for r in dto.rows:
-            tid = int(r.team_id)
-            w = int(wdl.get(tid, {}).get("win", 0))
-            d = int(wdl.get(tid, {}).get("draw", 0))
-            l = int(wdl.get(tid, {}).get("loss", 0))
-            pts_domain = int(getattr(r, "Pts", getattr(r, "points", 0)))
-            pts = (w * win + d * draw + l * loss) if (w or d or l) else pts_domain
-            out.append(StandingRowAPI(
-                team_id=tid,
-                team_name=name_map.get(tid),
-                played=int(getattr(r, "MP", getattr(r, "mp", 0))),
-                win=w, draw=d, loss=l,
-                gf=int(getattr(r, "GF", getattr(r, "gf", 0))),
-                ga=int(getattr(r, "GA", getattr(r, "ga", 0))),
-                gd=int(getattr(r, "GD", getattr(r, "gd", 0))),
-                points=pts,
-                position=int(getattr(r, "position", 0)),
-            ))
-        out.sort(key=lambda x: (-x.points, -x.gd, -x.gf, x.team_name or ""))
-        for i, row in enumerate(out, start=1):
-            row.position = i
-        return SeasonStandingsDTOAPI(rows=out)
-    except HTTPException as e:
-        if e.status_code != 404:
-            raise
-        rows = _compute_standings_fallback(season_id, win, draw, loss)
+    await _ensure_season_async(season_id)
+    # Fast path: single indexed read of the table the ETL keeps up to date.
+    rows = await _standings_snapshot(season_id, until_matchday)
+    if rows:
+        if (win, draw, loss) != (3, 1, 0):
+            for row in rows:
+                row.points = row.win * win + row.draw * draw + row.loss * loss
+            rows.sort(key=lambda x: (-x.points, -x.gd, -x.gf, x.team_name or ""))
+            for i, row in enumerate(rows, start=1):
+                row.position = i
         return SeasonStandingsDTOAPI(rows=rows)
+    # No precomputed table: one grouped query over the finalized matches up
+    # to `until_matchday`.
+    rows = await _standings_computed(season_id, win, draw, loss, until_matchday)
+    return SeasonStandingsDTOAPI(rows=rows)
+
+@router.get("/seasons/{season_id}/standings/history", response_model=StandingsHistoryAPI)
+async def standings_history(
+    season_id: int,
+    win: int = Query(3, ge=0, le=10),
+    draw: int = Query(1, ge=0, le=10),
+    loss: int = Query(0, ge=0, le=10),
+    until_matchday: Optional[int] = Query(None, ge=1),
+    team_id: Optional[int] = Query(None, ge=1),
+):
+    """
+    Cumulative table (points, position, ...) of every team after each
+    matchday with results, computed with window functions in one query.
+    `team_id` keeps one team's line; positions are still league-wide.
+    """
+    await _ensure_season_async(season_id)
+    rows = await _standings_history(season_id, win, draw, loss, until_matchday, team_id)
+    return json_response({"rows": _HISTORY_ROW.rows(rows)})
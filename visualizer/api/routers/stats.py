@@ -1,16 +1,26 @@
 from __future__ import annotations
+import asyncio
 from typing import Optional, List, Any
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Header, Query, HTTPException
 from ..schemas import (
     PagedBasicStats, BasicStatsAPI,
-    PagedRoleStats, GoalkeeperStatsAPI, DefenderStatsAPI, MidfielderStatsAPI, ForwardStatsAPI
+    PagedRoleStats, GoalkeeperStatsAPI, DefenderStatsAPI, MidfielderStatsAPI, ForwardStatsAPI,
+    PagedPlayerSeasonStats, PlayerSeasonStatsAPI,
 )
-from ..deps import _ensure_season, get_conn, _get
+from ..deps import _ensure_season, _ensure_season_async, _fetch_all, _fetch_one, get_conn, _get
+from ..pagination import decode_cursor, keyset_condition, next_cursor
+from ..serialization import RowSpec, json_response
+from ..streaming import ndjson_response, wants_ndjson
 
 router = APIRouter(tags=["stats"])
 
+async def _no_row() -> None:
+    return None
+
+_BASIC_STATS_ROW = RowSpec(BasicStatsAPI)
+
 @router.get("/seasons/{season_id}/stats/basic", response_model=PagedBasicStats)
-def season_basic_stats(
+async def season_basic_stats(
     season_id: int,
     team_id: Optional[int] = Query(None, ge=1),
     player_id: Optional[int] = Query(None, ge=1),
@@ -18,8 +28,16 @@ def season_basic_stats(
     matchday_to: Optional[int] = Query(None, ge=1),
     limit: int = Query(1000, ge=1, le=5000),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (offset is ignored)"),
+    with_total: bool = Query(True, description="run COUNT(*) for `total`"),
+    accept: Optional[str] = Header(None),
 ):
-    _ensure_season(season_id)
+    """
+    Paged basic stats. With `Accept: application/x-ndjson` the whole filtered
+    result (from `cursor` on, no limit/offset/total) is streamed, one row per line.
+    """
+    await _ensure_season_async(season_id)
+    after = decode_cursor("stats-basic", cursor, 1)
 
     where = ["md.season_id = %s"]
     params: list[Any] = [season_id]
@@ -36,14 +54,19 @@ def season_basic_stats(
         where.append("md.matchday_number <= %s")
         params.append(matchday_to)
 
-    base = f"""
+    from_sql = """
     FROM core.basic_stats bs
     JOIN core.match m     ON m.match_id = bs.match_id
     JOIN core.matchday md ON md.matchday_id = m.matchday_id
-    WHERE {' AND '.join(where)}
     """
 
-    count_sql = f"SELECT COUNT(*) AS count {base}"
+    count_sql = f"SELECT COUNT(*) AS count {from_sql} WHERE {' AND '.join(where)}"
+
+    page_where, page_params = list(where), list(params)
+    if after is not None:
+        page_where.append(keyset_condition(("bs.basic_stats_id",)))
+        page_params.extend(after)
+        offset = 0
 
     list_sql = f"""
     SELECT
@@ -62,46 +85,30 @@ def season_basic_stats(
       COALESCE(bs.aerial_duels_total,0)         AS aerial_duels_total,
       COALESCE(bs.ground_duels_won,0)           AS ground_duels_won,
       COALESCE(bs.ground_duels_total,0)         AS ground_duels_total
-    {base}
+    {from_sql}
+    WHERE {' AND '.join(page_where)}
     ORDER BY bs.basic_stats_id
-    LIMIT %s OFFSET %s
     """
+    if wants_ndjson(accept):
+        return ndjson_response(list_sql, page_params)
 
-    with get_conn() as conn:
-        total_row = conn.execute(count_sql, params).fetchone()
-        rows = conn.execute(list_sql, [*params, limit, offset]).fetchall()
-
-    total = int(_get(total_row, 0, "count") or 0)
-
-    items: list[BasicStatsAPI] = []
-    for r in rows:
-        bs_id = _get(r, 0, "basic_stats_id")
-        mid   = _get(r, 1, "match_id")
-        pid   = _get(r, 2, "player_id")
-        if bs_id is None or mid is None or pid is None:
-            # Si llega a pasar, tus datos tienen PKs nulas o el driver no expone nombres.
-            # Puedes raise o saltar la fila. Aquí hacemos raise para detectar el caso.
-            raise HTTPException(status_code=500, detail="Row with NULL ids in core.basic_stats query")
-
-        items.append(BasicStatsAPI(
-            basic_stats_id=int(bs_id),
-            match_id=int(mid),
-            player_id=int(pid),
-            minutes=int(_get(r, 3, "minutes") or 0),
-            goals=int(_get(r, 4, "goals") or 0),
-            assists=int(_get(r, 5, "assists") or 0),
-            touches=int(_get(r, 6, "touches") or 0),
-            passes_total=int(_get(r, 7, "passes_total") or 0),
-            passes_completed=int(_get(r, 8, "passes_completed") or 0),
-            ball_recoveries=int(_get(r, 9, "ball_recoveries") or 0),
-            possessions_lost=int(_get(r,10, "possessions_lost") or 0),
-            aerial_duels_won=int(_get(r,11, "aerial_duels_won") or 0),
-            aerial_duels_total=int(_get(r,12, "aerial_duels_total") or 0),
-            ground_duels_won=int(_get(r,13, "ground_duels_won") or 0),
-            ground_duels_total=int(_get(r,14, "ground_duels_total") or 0),
-        ))
-
-    return PagedBasicStats(items=items, limit=limit, offset=offset, total=total)
+    total_row, rows = await asyncio.gather(
+        _fetch_one(count_sql, params) if with_total else _no_row(),
+        _fetch_all(list_sql + " LIMIT %s OFFSET %s", [*page_params, limit, offset]),
+    )
+
+    total = int(_get(total_row, 0, "count") or 0) if with_total else None
+
+    cursor_out = next_cursor(
+        "stats-basic", (rows[-1]["basic_stats_id"],) if rows else None, len(rows), limit
+    )
+    return json_response({
+        "items": _BASIC_STATS_ROW.rows(rows),
+        "limit": limit,
+        "offset": offset,
+        "total": total,
+        "next_cursor": cursor_out,
+    })
 
 @router.get("/seasons/{season_id}/stats/goalkeeper", response_model=PagedRoleStats)
 def season_goalkeeper_stats(season_id: int, limit: int = Query(1000, ge=1, le=5000), offset: int = Query(0, ge=0)):
@@ -247,3 +254,41 @@ def season_forward_stats(season_id: int, limit: int = Query(1000, ge=1, le=5000)
         "fouls_suffered": _get(r, "fouls_suffered"),
         "woodwork": _get(r, "woodwork"),
     }) for r in rows]
+
+@router.get("/seasons/{season_id}/stats/players", response_model=PagedPlayerSeasonStats)
+async def season_player_stats(
+    season_id: int,
+    player_id: Optional[int] = Query(None, ge=1),
+    limit: int = Query(1000, ge=1, le=5000),
+    offset: int = Query(0, ge=0),
+):
+    """Per-player season totals from core.player_season_stats (one row per player)."""
+    await _ensure_season_async(season_id)
+    where = ["ps.season_id = %s"]
+    params: list[Any] = [season_id]
+    if player_id is not None:
+        where.append("ps.player_id = %s")
+        params.append(player_id)
+    sql = f"""
+    SELECT ps.player_id, p.player_name, ps.matches, ps.appearances, ps.minutes,
+           ps.goals, ps.assists, ps.goalkeeper_saves, ps.goals_conceded, ps.role_totals
+    FROM core.player_season_stats ps
+    LEFT JOIN reference.player p ON p.player_id = ps.player_id
+    WHERE {' AND '.join(where)}
+    ORDER BY ps.player_id
+    LIMIT %s OFFSET %s
+    """
+    rows = await _fetch_all(sql, [*params, limit, offset])
+    items = [PlayerSeasonStatsAPI(
+        player_id=int(_get(r, "player_id")),
+        player_name=_get(r, "player_name"),
+        matches=int(_get(r, "matches") or 0),
+        appearances=int(_get(r, "appearances") or 0),
+        minutes=int(_get(r, "minutes") or 0),
+        goals=int(_get(r, "goals") or 0),
+        assists=int(_get(r, "assists") or 0),
+        goalkeeper_saves=int(_get(r, "goalkeeper_saves") or 0),
+        goals_conceded=int(_get(r, "goals_conceded") or 0),
+        role_totals={k: float(v) for k, v in (_get(r, "role_totals") or {}).items()},
+    ) for r in rows]
+    return PagedPlayerSeasonStats(items=items, limit=limit, offset=offset)
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 try:
     from pydantic import BaseModel, Field, ConfigDict
     _PD_V2 = True
@@ -102,6 +102,7 @@ class MatchList(BaseModel):
     limit: int
     offset: int
     total: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 # ---- Standings ----
@@ -122,6 +123,41 @@ class StandingRowAPI(BaseModel):
 class SeasonStandingsDTOAPI(BaseModel):
     rows: List[StandingRowAPI]
 
+class StandingsHistoryRowAPI(BaseModel):
+    matchday_number: int
+    team_id: int
+    team_name: str | None = None
+    played: int
+    win: int
+    draw: int
+    loss: int
+    gf: int
+    ga: int
+    gd: int
+    points: int
+    position: int
+
+class StandingsHistoryAPI(BaseModel):
+    rows: List[StandingsHistoryRowAPI]
+
+class LeaderRowAPI(BaseModel):
+    metric: str
+    rank: int
+    player_id: int
+    player_name: str | None = None
+    team_id: int | None = None
+    team_name: str | None = None
+    value: float | None = None   # total, or per90 when ranking per 90'
+    total: float
+    per90: float | None = None
+    minutes: int
+
+class LeadersAPI(BaseModel):
+    k: int
+    per90: bool
+    min_minutes: int
+    rows: List[LeaderRowAPI]
+
 
 # ---- Stats: basic + role
 class BasicStatsAPI(BaseModel):
@@ -150,6 +186,7 @@ class PagedBasicStats(BaseModel):
     limit: int
     offset: int
     total: int | None = None
+    next_cursor: str | None = None
 
 class GoalkeeperStatsAPI(BaseModel):
     basic_stats_id: int
@@ -235,6 +272,23 @@ class PagedRoleStats(BaseModel):
     offset: int
     total: Optional[int] = None
 
+class PlayerSeasonStatsAPI(BaseModel):
+    player_id: int
+    player_name: str | None = None
+    matches: int
+    appearances: int
+    minutes: int
+    goals: int
+    assists: int
+    goalkeeper_saves: int
+    goals_conceded: int
+    role_totals: Dict[str, float] = Field(default_factory=dict)
+
+class PagedPlayerSeasonStats(BaseModel):
+    items: List[PlayerSeasonStatsAPI]
+    limit: int
+    offset: int
+
 
 # ---- Season snapshot ----
 class SeasonSnapshot(BaseModel):
@@ -0,0 +1,46 @@
+from __future__ import annotations
+import json
+from decimal import Decimal
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Type
+from fastapi import Response
+from pydantic import BaseModel
+
+try:  # optional: ~5-10x faster encoding; stdlib json otherwise
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Fast path for large list endpoints. Rows come from dict_row with the SQL
+# aliases equal to the response field names, so a row only needs its columns
+# picked (in schema order) before being encoded straight to JSON bytes:
+# no `_get` probing per column and no pydantic model per row. The pydantic
+# models stay as `response_model` for the OpenAPI schema, and RowSpec reads
+# its column list from them so the two can't drift apart. The SQL is
+# responsible for the types (COALESCE, ::text casts on enums).
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default)
+    return json.dumps(payload, default=_default, separators=(",", ":")).encode("utf-8")
+
+def json_response(payload: Any, headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(content=dumps(payload), media_type="application/json", headers=headers)
+
+class RowSpec:
+    """Precompiled column picker for one response model."""
+
+    def __init__(self, model: Type[BaseModel]):
+        self.columns = tuple(model.model_fields)
+        self._pick = itemgetter(*self.columns)
+
+    def rows(self, rows: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        cols, pick = self.columns, self._pick
+        if len(cols) == 1:
+            return [{cols[0]: pick(r)} for r in rows]
+        return [dict(zip(cols, pick(r))) for r in rows]
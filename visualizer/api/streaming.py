@@ -0,0 +1,74 @@
+from __future__ import annotations
+import json
+import os
+import uuid
+from decimal import Decimal
+from typing import Any, AsyncIterator, List, Optional, Sequence, Tuple
+from fastapi.responses import StreamingResponse
+from psycopg.rows import tuple_row
+
+from infrastructure.postgres.connection import get_async_conn
+
+# Season-wide reads for the bulk/streaming endpoints: a server-side (named)
+# cursor hands rows over in fixed-size batches, so server memory is bounded
+# by one batch and the first bytes go out before the query has finished.
+
+BATCH_ROWS = int(os.getenv("FR_API_STREAM_BATCH", "5000"))
+
+Column = Tuple[str, int]  # (name, type OID)
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+async def iter_row_batches(
+    sql: str,
+    params: Optional[Sequence[Any]] = None,
+    batch_rows: int = BATCH_ROWS,
+) -> AsyncIterator[Tuple[List[Column], List[tuple]]]:
+    """Yield (columns, tuple rows) batches of `sql`; the first batch may be empty."""
+    async with get_async_conn() as conn:
+        # Named cursors live inside the connection's transaction (committed
+        # when the connection goes back to the pool).
+        async with conn.cursor(name=f"stream_{uuid.uuid4().hex}", row_factory=tuple_row) as cur:
+            await cur.execute(sql, params)
+            columns: List[Column] = [(d.name, d.type_code) for d in cur.description or []]
+            first = True
+            while True:
+                rows = await cur.fetchmany(batch_rows)
+                if rows or first:
+                    yield columns, rows
+                first = False
+                if len(rows) < batch_rows:
+                    break
+
+async def iter_copy_csv(sql: str, params: Optional[Sequence[Any]] = None) -> AsyncIterator[bytes]:
+    """`COPY (sql) TO STDOUT` as CSV with header: Postgres renders the rows."""
+    async with get_async_conn() as conn:
+        cur = conn.cursor()
+        async with cur.copy(f"COPY ({sql}) TO STDOUT WITH (FORMAT csv, HEADER true)", params) as copy:
+            async for chunk in copy:
+                yield bytes(chunk)
+
+# ---- NDJSON (Accept: application/x-ndjson) ----
+
+NDJSON = "application/x-ndjson"
+
+def wants_ndjson(accept: Optional[str]) -> bool:
+    return NDJSON in (accept or "")
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+async def iter_ndjson(sql: str, params: Optional[Sequence[Any]] = None) -> AsyncIterator[bytes]:
+    """One JSON object per row; each fetched batch goes out as one chunk."""
+    async for columns, rows in iter_row_batches(sql, params):
+        names = [name for name, _oid in columns]
+        if rows:
+            yield "".join(
+                json.dumps(dict(zip(names, row)), default=_json_default, separators=(",", ":")) + "\n"
+                for row in rows
+            ).encode("utf-8")
+
+def ndjson_response(sql: str, params: Optional[Sequence[Any]] = None) -> StreamingResponse:
+    return StreamingResponse(iter_ndjson(sql, params), media_type=NDJSON)
@@ -1,14 +1,25 @@
 # visualizer/infrastructure/postgres/connection.py
+import asyncio
 import json
-from contextlib import contextmanager
+import os
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Iterable
+from typing import Dict, Any, Iterable, Optional
 
-import psycopg
 from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
 
 CONFIG_PATH = "/home/sp3767/Projects/fifth_referee_v2/pipeline/config"
 
+# FR_DB_DSN overrides the config file (containers, CI).
+DB_DSN_ENV = "FR_DB_DSN"
+POOL_MIN_SIZE = int(os.getenv("FR_DB_POOL_MIN", "1"))
+POOL_MAX_SIZE = int(os.getenv("FR_DB_POOL_MAX", "10"))
+POOL_TIMEOUT = float(os.getenv("FR_DB_POOL_TIMEOUT", "10.0"))    # wait for a free connection
+POOL_MAX_IDLE = float(os.getenv("FR_DB_POOL_MAX_IDLE", "300.0"))  # shrink back towards min_size
+
 def _resolve_config_file(path: str) -> Path:
     """Accept a file or a directory. If directory, try common filenames."""
     p = Path(path)
@@ -46,11 +57,98 @@ def _dsn_from_cfg(cfg: Dict[str, Any]) -> str:
     auth = f"{user}:{password}" if password else user  # omit ":" when empty
     return f"postgresql://{auth}@{host}:{port}/{name}"
 
+@lru_cache(maxsize=8)
 def get_dsn(path: str = CONFIG_PATH) -> str:
+    """Resolved once per path; call get_dsn.cache_clear() after editing the config."""
+    env_dsn = os.getenv(DB_DSN_ENV)
+    if env_dsn:
+        return env_dsn
     return _dsn_from_cfg(_load_config(path))
 
+_POOLS: Dict[str, ConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+def get_pool(path: str = CONFIG_PATH) -> ConnectionPool:
+    """
+    Process-wide pool for the DSN behind `path`. Connections are checked
+    before being handed out, so a restarted server doesn't surface as a
+    failed request.
+    """
+    dsn = get_dsn(path)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(dsn)
+        if pool is None:
+            pool = ConnectionPool(
+                dsn,
+                min_size=POOL_MIN_SIZE,
+                max_size=max(POOL_MIN_SIZE, POOL_MAX_SIZE),
+                max_idle=POOL_MAX_IDLE,
+                timeout=POOL_TIMEOUT,
+                kwargs={"row_factory": dict_row},
+                check=ConnectionPool.check_connection,
+                name="fifth-referee-api",
+                open=True,
+            )
+            _POOLS[dsn] = pool
+    return pool
+
+def close_pools() -> None:
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
+
 @contextmanager
-def get_conn(path: str = CONFIG_PATH):
+def get_conn(path: str = CONFIG_PATH, timeout: Optional[float] = None):
+    """
+    Borrow a pooled connection (dict rows). As with psycopg.connect, the
+    transaction is committed on a clean exit and rolled back on error; the
+    connection then goes back to the pool instead of being closed.
+    """
+    with get_pool(path).connection(timeout=timeout) as conn:
+        yield conn
+
+# ---- Async path (async FastAPI handlers) ----
+# Same DSN and sizing as the sync pool. Async pools are bound to the event
+# loop that opened them, so they live for the app's lifespan.
+
+_ASYNC_POOLS: Dict[str, AsyncConnectionPool] = {}
+_ASYNC_POOLS_LOCK = asyncio.Lock()
+
+async def get_async_pool(path: str = CONFIG_PATH) -> AsyncConnectionPool:
     dsn = get_dsn(path)
-    with psycopg.connect(dsn, row_factory=dict_row) as conn:
+    pool = _ASYNC_POOLS.get(dsn)
+    if pool is not None:
+        return pool
+    async with _ASYNC_POOLS_LOCK:
+        pool = _ASYNC_POOLS.get(dsn)
+        if pool is None:
+            pool = AsyncConnectionPool(
+                dsn,
+                min_size=POOL_MIN_SIZE,
+                max_size=max(POOL_MIN_SIZE, POOL_MAX_SIZE),
+                max_idle=POOL_MAX_IDLE,
+                timeout=POOL_TIMEOUT,
+                kwargs={"row_factory": dict_row},
+                check=AsyncConnectionPool.check_connection,
+                name="fifth-referee-api-async",
+                open=False,
+            )
+            await pool.open()
+            _ASYNC_POOLS[dsn] = pool
+    return pool
+
+async def close_async_pools() -> None:
+    async with _ASYNC_POOLS_LOCK:
+        pools = list(_ASYNC_POOLS.values())
+        _ASYNC_POOLS.clear()
+    for pool in pools:
+        await pool.close()
+
+@asynccontextmanager
+async def get_async_conn(path: str = CONFIG_PATH, timeout: Optional[float] = None):
+    """Async counterpart of get_conn (same commit/rollback semantics)."""
+    pool = await get_async_pool(path)
+    async with pool.connection(timeout=timeout) as conn:
         yield conn
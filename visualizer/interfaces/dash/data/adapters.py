@@ -2,7 +2,7 @@ from __future__ import annotations
 from typing import Any, Dict, Iterable, Optional
 import pandas as pd
 
-from ..services import get_api, ApiService
+from ..services import get_api, ApiError, ApiService
 from ..services.types import MatchItem
 from .transforms import events_kpis_corrected, events_simple_kpis
 
@@ -86,7 +86,21 @@ class DataAdapter:
     # ----------------------
     # Stats
     # ----------------------
-    def basic_stats_df(self, season_id: int, limit: int = 5000) -> pd.DataFrame:
+    def _export_df(self, season_id: int, dataset: str) -> Optional[pd.DataFrame]:
+        """Temporada completa vía export masivo; None si la API no lo soporta."""
+        try:
+            return self.api.export_df(season_id, dataset)
+        except ApiError:
+            return None
+
+    def basic_stats_df(self, season_id: int, limit: Optional[int] = 5000) -> pd.DataFrame:
+        """
+        limit=None trae la temporada completa por el export masivo (Arrow/CSV);
+        con límite, o si el export falla, pagina el JSON.
+        """
+        df = self._export_df(season_id, "basic_stats") if limit is None else None
+        if df is not None and not df.empty:
+            return df
         items = self.api.basic_stats_all(season_id, limit=limit)
         return pd.DataFrame(items) if items else pd.DataFrame(columns=[
             "basic_stats_id","match_id","player_id","minutes","goals","assists","touches",
@@ -102,6 +116,43 @@ class DataAdapter:
             "clearances","penalties_received","penalties_saved","interceptions","times_dribbled_past"
         ])
 
+    def player_season_stats_df(self, season_id: int) -> pd.DataFrame:
+        """
+        Totales por jugador de la temporada (una fila por jugador). Vacío si
+        la API no tiene el agregado; el llamador puede agregar desde
+        basic_stats_df/goalkeeper_stats_df.
+        """
+        try:
+            items = self.api.player_season_stats(season_id)
+        except ApiError:
+            items = []
+        return pd.DataFrame(items) if items else pd.DataFrame(columns=[
+            "player_id","player_name","matches","appearances","minutes","goals","assists",
+            "goalkeeper_saves","goals_conceded","role_totals"
+        ])
+
+    def leaders_df(
+        self,
+        season_id: int,
+        metrics: Iterable[str],
+        *,
+        k: int = 5,
+        per90: bool = False,
+        min_minutes: int = 0,
+    ) -> pd.DataFrame:
+        """
+        Top-k por métrica (metric, rank, player_id, player_name, team_name,
+        value, ...). Vacío si la API no tiene el endpoint.
+        """
+        try:
+            rows = self.api.leaders(season_id, metrics, k=k, per90=per90, min_minutes=min_minutes)
+        except ApiError:
+            rows = []
+        return pd.DataFrame(rows) if rows else pd.DataFrame(columns=[
+            "metric","rank","player_id","player_name","team_id","team_name",
+            "value","total","per90","minutes"
+        ])
+
     def events_df(
         self,
         season_id: int,
@@ -115,23 +166,30 @@ class DataAdapter:
         Obtiene eventos normalizados desde la API.
         - Convierte nombres de eventos de español a inglés
         - Normaliza tipos de columnas
+        Sin filtros usa el export masivo de la temporada (Arrow/CSV).
         """
-        items = self.api.events_all(
-            season_id,
-            team_id=team_id,
-            event_type=event_type,
-            minute_from=minute_from,
-            minute_to=minute_to,
-            page_limit=1000,
-        )
-        if not items:
+        df = None
+        if all(v is None for v in (team_id, event_type, minute_from, minute_to)):
+            df = self._export_df(season_id, "events")
+            if df is not None and "event_type" in df.columns:
+                # Mismo criterio que /events: fuera filas sin id/partido/tipo.
+                df = df.dropna(subset=["event_id", "match_id", "event_type"])
+        if df is None or df.empty:
+            items = self.api.events_all(
+                season_id,
+                team_id=team_id,
+                event_type=event_type,
+                minute_from=minute_from,
+                minute_to=minute_to,
+                page_limit=1000,
+            )
+            df = pd.DataFrame(items) if items else None
+        if df is None or df.empty:
             return pd.DataFrame(columns=[
                 "event_id","match_id","event_type","minute",
                 "main_player_id","extra_player_id","team_id"
             ])
 
-        df = pd.DataFrame(items)
-
         # Normaliza columnas que pueden faltar
         for c in ["event_id","match_id","minute","main_player_id","extra_player_id","team_id"]:
             if c in df.columns:
@@ -365,7 +365,7 @@ def _build_player_map(season_id: int) -> Dict[int, Tuple[str, str]]:
 
 def _aggregate_basic_stats(season_id: int) -> pd.DataFrame:
     """Agrega estadísticas básicas por jugador."""
-    df_basic = DATA.basic_stats_df(season_id, limit=5000)
+    df_basic = DATA.basic_stats_df(season_id, limit=None)
 
     for col in ("goals", "assists", "minutes"):
         if col not in df_basic.columns:
@@ -434,6 +434,25 @@ def _format_top_rows(
 
     return rows
 
+_LEADER_CARDS = (
+    ("goals", "Goleadores"),
+    ("assists", "Asistidores"),
+    ("goalkeeper_saves", "Arquero: más atajadas"),
+    ("goals_conceded", "Arquero: más goles recibidos"),
+)
+_LEADER_METRICS = [metric for metric, _title in _LEADER_CARDS]
+
+def _leader_rows(leaders: pd.DataFrame, metric: str) -> List[Tuple[str, str, str]]:
+    """Filas de una tarjeta desde /leaders (ya ordenadas por rank)."""
+    rows = []
+    for row in leaders[leaders["metric"] == metric].sort_values("rank").itertuples(index=False):
+        name = row.player_name if isinstance(row.player_name, str) else f"#{int(row.player_id)}"
+        team = row.team_name if isinstance(row.team_name, str) else "—"
+        value = float(row.value)
+        value_str = f"{int(value)}" if value.is_integer() else f"{value:.1f}"
+        rows.append((f"{int(row.rank)}.", f"{name} | {team}", value_str))
+    return rows
+
 @callback(
     Output("leaders-scorers", "children"),
     Output("leaders-assisters", "children"),
@@ -447,12 +466,32 @@ def render_player_leaders(season_id: int | None):
         empty = leader_card("—", [])
         return empty, empty, empty, empty
 
+    # Top-k calculado en la API (una sola consulta); si no está disponible,
+    # se arma aquí como antes.
+    leaders = DATA.leaders_df(season_id, _LEADER_METRICS, k=5)
+    if not leaders.empty:
+        return tuple(
+            leader_card(title, _leader_rows(leaders, metric))
+            for metric, title in _LEADER_CARDS
+        )
+
     player_map = _build_player_map(season_id)
-    df_basic_stats = _aggregate_basic_stats(season_id)
-    df_gk_stats = _aggregate_goalkeeper_stats(
-        season_id,
-        DATA.basic_stats_df(season_id, limit=5000)
-    )
+    # Agregado ya calculado (una fila por jugador); si no está disponible se
+    # agrega aquí desde las filas jugador-partido.
+    df_season = DATA.player_season_stats_df(season_id)
+    if not df_season.empty:
+        df_basic_stats = df_season[["player_id", "goals", "assists", "minutes"]].copy()
+        df_basic_stats["ga"] = df_basic_stats["goals"] + df_basic_stats["assists"]
+        df_gk_stats = df_season.loc[
+            (df_season["goalkeeper_saves"] > 0) | (df_season["goals_conceded"] > 0),
+            ["player_id", "goalkeeper_saves", "goals_conceded"],
+        ]
+    else:
+        df_basic_stats = _aggregate_basic_stats(season_id)
+        df_gk_stats = _aggregate_goalkeeper_stats(
+            season_id,
+            DATA.basic_stats_df(season_id, limit=None)
+        )
 
     scorers = leader_card(
         "Goleadores",
@@ -1,8 +1,9 @@
 from __future__ import annotations
-from .api import ApiService, get_api
+from .api import ApiError, ApiService, get_api
 from .types import Competition, SeasonSummary, TeamItem, PlayerItem, MatchItem
 
 __all__ = [
+    "ApiError",
     "ApiService",
     "get_api",
     "Competition",
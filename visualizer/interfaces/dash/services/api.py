@@ -1,19 +1,32 @@
 # interfaces/dash/services/api.py
 from __future__ import annotations
 
+import io
+import json
 import os
 import time
+from collections import OrderedDict
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 import pandas as pd
 import requests
+from requests.structures import CaseInsensitiveDict
 
 from ..config import API_BASE
 from .cache import MemoryCache
 from .types import Competition, MatchItem, PlayerItem
 
+try:  # opcional: sin pyarrow el export llega como CSV
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - depende del entorno
+    pa = None
+
 _DEFAULT_TIMEOUT = float(os.getenv("FR_HTTP_TIMEOUT", "8.0"))
 _RETRY_TIMES = int(os.getenv("FR_HTTP_RETRIES", "2"))
 MAX_API_LIMIT = 1000  # contrato del backend: le=1000
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+NDJSON = "application/x-ndjson"
+# Respuestas GET guardadas con su ETag para pedirlas condicionales (LRU).
+_VALIDATOR_CACHE_SIZE = int(os.getenv("FR_HTTP_VALIDATORS", "256"))
 
 
 class ApiError(RuntimeError):
@@ -31,6 +44,9 @@ class ApiService:
         self.timeout = timeout
         self._session = requests.Session()
         self._cache = MemoryCache()
+        # (url, params) -> (etag, content-type, body, headers); los headers
+        # quedan case-insensitive como en la respuesta original.
+        self._validators: "OrderedDict[Tuple[str, str], Tuple[str, str, bytes, CaseInsensitiveDict]]" = OrderedDict()
 
     # --------------------------
     # HTTP core
@@ -42,13 +58,40 @@ class ApiService:
         return f"{self.base_url}{path}"
 
     def _request(self, method: str, path: str, **kwargs) -> Any:
+        return self._request_with_headers(method, path, **kwargs)[0]
+
+    @staticmethod
+    def _decode(content_type: str, body: bytes) -> Any:
+        if "application/json" in (content_type or ""):
+            return json.loads(body)
+        return body.decode("utf-8", errors="replace")
+
+    def _request_with_headers(self, method: str, path: str, **kwargs) -> Tuple[Any, Dict[str, str]]:
+        """
+        Como `_request`, pero devuelve también los headers (p. ej. X-Next-Cursor).
+        Los GET con ETag se repiten con If-None-Match: si la temporada no cambió,
+        la API responde 304 sin consultar la base y se reusa el cuerpo guardado.
+        """
         url = self._url(path)
         kwargs.setdefault("timeout", self.timeout)
         last_exc: Optional[Exception] = None
 
+        vkey: Optional[Tuple[str, str]] = None
+        if method.upper() == "GET" and _VALIDATOR_CACHE_SIZE > 0:
+            vkey = (url, json.dumps(kwargs.get("params") or {}, sort_keys=True, default=str))
+            known = self._validators.get(vkey)
+            if known is not None:
+                headers = dict(kwargs.get("headers") or {})
+                headers["If-None-Match"] = known[0]
+                kwargs["headers"] = headers
+
         for attempt in range(_RETRY_TIMES + 1):
             try:
                 r = self._session.request(method.upper(), url, **kwargs)
+                if r.status_code == 304 and vkey in self._validators:
+                    self._validators.move_to_end(vkey)
+                    _etag, ctype, body, headers = self._validators[vkey]
+                    return self._decode(ctype, body), headers
                 if r.status_code >= 400:
                     try:
                         # FastAPI suele empaquetar errores en {"detail": ...}
@@ -56,9 +99,18 @@ class ApiService:
                     except Exception:
                         detail = r.text[:200]
                     raise ApiError(f"{r.status_code} {method} {url} :: {detail}")
+                etag = r.headers.get("ETag")
+                if vkey is not None and etag:
+                    self._validators[vkey] = (
+                        etag, r.headers.get("Content-Type") or "", r.content,
+                        CaseInsensitiveDict(r.headers),
+                    )
+                    self._validators.move_to_end(vkey)
+                    while len(self._validators) > _VALIDATOR_CACHE_SIZE:
+                        self._validators.popitem(last=False)
                 if "application/json" in (r.headers.get("Content-Type") or ""):
-                    return r.json()
-                return r.text
+                    return r.json(), r.headers
+                return r.text, r.headers
             except Exception as e:
                 last_exc = e
                 if attempt < _RETRY_TIMES:
@@ -140,10 +192,12 @@ class ApiService:
         offset: int = 0,
     ) -> Iterable[MatchItem]:
         """
-        Itera /v1/seasons/{season_id}/matches respetando el límite del servidor (≤1000),
-        paginando con offset. Si limit=None, trae todo lo disponible.
+        Itera /v1/seasons/{season_id}/matches respetando el límite del servidor (≤1000).
+        La primera página usa `offset`; las siguientes siguen el `next_cursor` (keyset)
+        y no piden el total. Si limit=None, trae todo lo disponible.
         """
         fetched = 0
+        cursor: Optional[str] = None
         while True:
             if limit is None:
                 page_size = MAX_API_LIMIT
@@ -153,7 +207,11 @@ class ApiService:
                     break
                 page_size = min(MAX_API_LIMIT, remaining)
 
-            params: Dict[str, Any] = {"limit": page_size, "offset": offset}
+            params: Dict[str, Any] = {"limit": page_size, "with_total": False}
+            if cursor:
+                params["cursor"] = cursor
+            else:
+                params["offset"] = offset
             if finalized is not None:
                 # FastAPI parsea bools en querystring (True/False)
                 params["finalized"] = finalized
@@ -178,11 +236,11 @@ class ApiService:
 
             n = len(items)
             fetched += n
-            offset += n
+            cursor = j.get("next_cursor")
 
             if limit is not None and fetched >= limit:
                 break
-            if n < page_size:
+            if n < page_size or not cursor:
                 break
 
     # --------------------------
@@ -217,8 +275,14 @@ class ApiService:
         player_id: Optional[int] = None,
         matchday_from: Optional[int] = None,
         matchday_to: Optional[int] = None,
+        cursor: Optional[str] = None,
+        with_total: bool = True,
     ) -> Dict[str, Any]:
-        params: Dict[str, Any] = {"limit": min(limit, MAX_API_LIMIT), "offset": offset}
+        params: Dict[str, Any] = {"limit": min(limit, MAX_API_LIMIT), "with_total": with_total}
+        if cursor:
+            params["cursor"] = cursor
+        else:
+            params["offset"] = offset
         if team_id is not None:
             params["team_id"] = team_id
         if player_id is not None:
@@ -241,7 +305,7 @@ class ApiService:
     ) -> List[Dict[str, Any]]:
         items: List[Dict[str, Any]] = []
         fetched = 0
-        offset = 0
+        cursor: Optional[str] = None
 
         while True:
             if limit is None:
@@ -255,11 +319,12 @@ class ApiService:
             page = self.basic_stats_page(
                 season_id,
                 limit=page_size,
-                offset=offset,
                 team_id=team_id,
                 player_id=player_id,
                 matchday_from=matchday_from,
                 matchday_to=matchday_to,
+                cursor=cursor,
+                with_total=False,
             )
             chunk = page.get("items", []) if isinstance(page, dict) else []
             if not chunk:
@@ -268,11 +333,11 @@ class ApiService:
             items.extend(chunk)
             n = len(chunk)
             fetched += n
-            offset += n
+            cursor = page.get("next_cursor")
 
             if limit is not None and fetched >= limit:
                 break
-            if n < page_size:
+            if n < page_size or not cursor:
                 break
 
         return items
@@ -318,6 +383,39 @@ class ApiService:
 
         return items
 
+    # --------------------------
+    # Agregados por jugador y temporada
+    # --------------------------
+    def player_season_stats(self, season_id: int, player_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Una fila por jugador (core.player_season_stats); pagina por si la temporada es grande."""
+        items: List[Dict[str, Any]] = []
+        offset = 0
+        while True:
+            params: Dict[str, Any] = {"limit": MAX_API_LIMIT, "offset": offset}
+            if player_id is not None:
+                params["player_id"] = player_id
+            page = self._request("GET", f"/v1/seasons/{season_id}/stats/players", params=params)
+            chunk = page.get("items", []) if isinstance(page, dict) else []
+            items.extend(chunk)
+            if len(chunk) < MAX_API_LIMIT:
+                break
+            offset += len(chunk)
+        return items
+
+    def leaders(
+        self,
+        season_id: int,
+        metrics: Iterable[str],
+        *,
+        k: int = 5,
+        per90: bool = False,
+        min_minutes: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """Top-k por métrica calculado en la API (una fila por metric/rank)."""
+        params = {"metric": ",".join(metrics), "k": k, "per90": per90, "min_minutes": min_minutes}
+        j = self._request("GET", f"/v1/seasons/{season_id}/leaders", params=params)
+        return j.get("rows", []) if isinstance(j, dict) else []
+
     # --------------------------
     # Helpers de caché
     # --------------------------
@@ -349,21 +447,24 @@ class ApiService:
         minute_from: Optional[int] = None,
         minute_to: Optional[int] = None,
         limit: int = 1000,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
-        params: Dict[str, Any] = {
-            "limit": min(limit, 5000),
-            "offset": offset,
-        }
+        params: Dict[str, Any] = {"limit": min(limit, 5000)}
+        if cursor:
+            params["cursor"] = cursor
+        else:
+            params["offset"] = offset
         if team_id is not None:     params["team_id"] = int(team_id)
         if match_id is not None:    params["match_id"] = int(match_id)
         if event_type is not None:  params["event_type"] = str(event_type)
         if minute_from is not None: params["minute_from"] = int(minute_from)
         if minute_to is not None:   params["minute_to"] = int(minute_to)
 
-        items = self._request("GET", f"/v1/seasons/{season_id}/events", params=params)
+        items, headers = self._request_with_headers("GET", f"/v1/seasons/{season_id}/events", params=params)
         # La API ya devuelve lista; la envolvemos en una forma uniforme
-        return {"items": (items or [])}
+        # (el cursor de la página siguiente viaja en un header).
+        return {"items": (items or []), "next_cursor": headers.get("X-Next-Cursor")}
 
     def events_all(
         self,
@@ -376,7 +477,7 @@ class ApiService:
         page_limit: int = 1000
     ) -> List[Dict[str, Any]]:
         out: List[Dict[str, Any]] = []
-        offset = 0
+        cursor: Optional[str] = None
         while True:
             page = self.events_page(
                 season_id,
@@ -385,17 +486,64 @@ class ApiService:
                 minute_from=minute_from,
                 minute_to=minute_to,
                 limit=page_limit,
-                offset=offset,
+                cursor=cursor,
             )
             items = page.get("items", [])
             if not items:
                 break
             out.extend(items)
-            if len(items) < page_limit:
+            cursor = page.get("next_cursor")
+            if not cursor:
                 break
-            offset += page_limit
         return out
 
+    # --------------------------
+    # Export masivo (temporada completa en una sola respuesta)
+    # --------------------------
+    def export_df(self, season_id: int, dataset: str) -> pd.DataFrame:
+        """
+        /v1/seasons/{season_id}/export/{dataset} directo a DataFrame: Arrow IPC
+        si hay pyarrow de ambos lados, si no CSV. Sin paginar ni JSON por fila.
+        """
+        url = self._url(f"/v1/seasons/{season_id}/export/{dataset}")
+        accept = f"{ARROW_STREAM}, text/csv;q=0.5" if pa is not None else "text/csv"
+        try:
+            r = self._session.get(url, headers={"Accept": accept}, timeout=self.timeout * 4)
+        except Exception as e:
+            raise ApiError(f"HTTP error GET {url}: {e}") from e
+        if r.status_code >= 400:
+            raise ApiError(f"{r.status_code} GET {url} :: {r.text[:200]}")
+        if ARROW_STREAM in (r.headers.get("Content-Type") or "") and pa is not None:
+            return pa.ipc.open_stream(r.content).read_pandas()
+        if not r.content:
+            return pd.DataFrame()
+        return pd.read_csv(io.BytesIO(r.content))
+
+    def iter_ndjson(self, path: str, params: Optional[Dict[str, Any]] = None) -> Iterable[Dict[str, Any]]:
+        """
+        Recorre un listado en streaming (Accept: application/x-ndjson): cada
+        fila se entrega apenas llega, sin esperar ni paginar el resultado.
+        """
+        url = self._url(path)
+        try:
+            with self._session.get(
+                url, params=params, headers={"Accept": NDJSON},
+                timeout=self.timeout, stream=True,
+            ) as r:
+                if r.status_code >= 400:
+                    raise ApiError(f"{r.status_code} GET {url} :: {r.text[:200]}")
+                for line in r.iter_lines():
+                    if line:
+                        yield json.loads(line)
+        except ApiError:
+            raise
+        except Exception as e:
+            raise ApiError(f"HTTP error GET {url}: {e}") from e
+
+    def events_stream(self, season_id: int, **filters: Any) -> Iterable[Dict[str, Any]]:
+        params = {k: v for k, v in filters.items() if v is not None}
+        return self.iter_ndjson(f"/v1/seasons/{season_id}/events", params=params)
+
 def iter_events(self, season_id: int,
                 batch: int = 1000,
                 **filters) -> Iterable[dict]:
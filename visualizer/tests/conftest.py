@@ -0,0 +1,71 @@
+# tests/conftest.py
+import asyncio
+
+import pytest
+
+_FIRST_ROW = object()
+
+
+class FakeDB:
+    """
+    Fake async DB for the API routers.
+
+    Season 7 is known and `_season_version` returns `version` (None: no
+    ETag). `install(module, ...)` replaces the module's `_fetch_all` /
+    `_fetch_one`: rows are picked by the first SQL fragment found in the
+    query (`default` otherwise) and every call lands in `calls`.
+    """
+
+    def __init__(self, monkeypatch):
+        import api.deps as deps
+
+        self.monkeypatch = monkeypatch
+        self.version = None
+        self.calls = []
+        self.active = self.max_active = 0
+        monkeypatch.setattr(deps, "_KNOWN_SEASONS", {7})
+        monkeypatch.setattr(deps, "_season_version", self._season_version)
+
+    async def _season_version(self, _season_id):
+        return self.version
+
+    @property
+    def sqls(self):
+        return [sql for sql, _params in self.calls]
+
+    def install(self, module, responses=None, default=(), one=_FIRST_ROW, delay=0.0):
+        """
+        responses: SQL fragment -> rows. `one` overrides what `_fetch_one`
+        returns (first row of the match otherwise). `delay` makes every
+        query yield to the loop, so overlapping calls show in `max_active`.
+        """
+        responses = dict(responses or {})
+
+        async def fetch_all(sql, params=None):
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            if delay:
+                await asyncio.sleep(delay)
+            self.active -= 1
+            self.calls.append((sql, params))
+            for fragment, rows in responses.items():
+                if fragment in sql:
+                    return list(rows)
+            return list(default)
+
+        async def fetch_one(sql, params=None):
+            if one is not _FIRST_ROW:
+                self.calls.append((sql, params))
+                return one
+            rows = await fetch_all(sql, params)
+            return rows[0] if rows else None
+
+        self.monkeypatch.setattr(module, "_fetch_all", fetch_all)
+        if hasattr(module, "_fetch_one"):
+            self.monkeypatch.setattr(module, "_fetch_one", fetch_one)
+        return self
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    return FakeDB(monkeypatch)
@@ -0,0 +1,76 @@
+# tests/test_api_async_routes.py
+from fastapi.testclient import TestClient
+
+import api as api_pkg
+from api.routers import matches as matches_router
+
+
+def test_list_matches_runs_independent_queries_concurrently(fake_db):
+    fake_db.install(
+        matches_router,
+        {
+            "COUNT(*)": [{"count": 1}],
+            "SELECT m.match_id": [{
+                "match_id": 1, "matchday_id": 3, "local_team_id": 10, "away_team_id": 20,
+                "local_score": 2, "away_score": 0, "duration": 90, "stadium": None,
+            }],
+            "FROM core.event": [{
+                "event_id": 5, "match_id": 1, "event_type": "Gol", "minute": 12,
+                "main_player_id": 100, "extra_player_id": None, "team_id": 10,
+            }],
+            "FROM core.participation": [
+                {"match_id": 1, "player_id": 100, "status": "starter", "position": "FW"},
+            ],
+        },
+        delay=0.01,
+    )
+    client = TestClient(api_pkg.api)
+    r = client.get("/v1/seasons/7/matches?include=events,participations")
+    assert r.status_code == 200
+    body = r.json()
+    assert body["total"] == 1
+    match = body["items"][0]
+    assert [e["event_id"] for e in match["events"]] == [5]
+    assert [p["player_id"] for p in match["participations"]] == [100]
+    # count+page, then events+participations: two rounds of two queries each.
+    assert len(fake_db.calls) == 4
+    assert fake_db.max_active == 2
+
+
+def test_list_matches_follows_keyset_cursor(fake_db):
+    fake_db.install(
+        matches_router,
+        {
+            "SELECT m.match_id": [{
+                "match_id": 4, "matchday_id": 3, "local_team_id": 10, "away_team_id": 20,
+                "local_score": None, "away_score": None, "duration": 90, "stadium": None,
+                "matchday_number": 2,
+            }],
+        },
+    )
+    client = TestClient(api_pkg.api)
+
+    r = client.get("/v1/seasons/7/matches?limit=1&with_total=false")
+    assert r.status_code == 200
+    body = r.json()
+    assert body["total"] is None
+    assert len(fake_db.calls) == 1  # no COUNT(*)
+    token = body["next_cursor"]
+    assert token
+
+    r = client.get(f"/v1/seasons/7/matches?limit=1&with_total=false&offset=50&cursor={token}")
+    assert r.status_code == 200
+    sql, params = fake_db.calls[-1]
+    assert "(md.matchday_number, m.match_id) > (%s, %s)" in sql
+    # season, keyset (matchday 2, match 4), limit, offset reset to 0
+    assert params == [7, 2, 4, 1, 0]
+
+
+def test_cursor_is_scoped_to_its_endpoint(fake_db):
+    from api.pagination import encode_cursor
+
+    fake_db.install(matches_router)
+    client = TestClient(api_pkg.api)
+    foreign = encode_cursor("events", (1, 2))
+    assert client.get(f"/v1/seasons/7/matches?cursor={foreign}").status_code == 400
+    assert client.get("/v1/seasons/7/matches?cursor=not-a-cursor").status_code == 400
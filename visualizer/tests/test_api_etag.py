@@ -0,0 +1,155 @@
+# tests/test_api_etag.py
+import json
+
+from fastapi.testclient import TestClient
+from requests.structures import CaseInsensitiveDict
+
+import api as api_pkg
+from api.etag import _etag_matches, season_etag
+from api.routers import matches as matches_router
+from interfaces.dash.services.api import ApiService
+
+
+def test_etag_weak_comparison():
+    tag = season_etag(7, 3)
+    assert _etag_matches(tag, tag)
+    assert _etag_matches('"season-7-v3"', tag)
+    assert _etag_matches(f'W/"other", {tag}', tag)
+    assert _etag_matches("*", tag)
+    assert not _etag_matches(season_etag(7, 2), tag)
+    assert not _etag_matches(None, tag)
+
+
+def test_if_none_match_skips_the_endpoint_until_the_version_changes(fake_db):
+    fake_db.version = 3
+    fake_db.install(matches_router, one={"count": 0})
+    client = TestClient(api_pkg.api)
+
+    r = client.get("/v1/seasons/7/matches")
+    assert r.status_code == 200
+    etag = r.headers["ETag"]
+    assert etag == season_etag(7, 3)
+    queries = len(fake_db.calls)
+
+    r = client.get("/v1/seasons/7/matches", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.headers["ETag"] == etag
+    assert len(fake_db.calls) == queries  # endpoint never ran
+
+    fake_db.version = 4
+    r = client.get("/v1/seasons/7/matches", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["ETag"] == season_etag(7, 4)
+
+
+def test_no_etag_without_version_table(fake_db):
+    fake_db.install(matches_router, one={"count": 0})
+    r = TestClient(api_pkg.api).get("/v1/seasons/7/matches")
+    assert r.status_code == 200
+    assert "ETag" not in r.headers
+
+
+def test_negotiated_routes_tag_the_representation_and_vary_on_accept(monkeypatch, fake_db):
+    from api import streaming
+    from api.routers import export as export_router
+
+    fake_db.version = 3
+
+    async def fake_batches(sql, params=None, batch_rows=streaming.BATCH_ROWS):
+        yield [("event_id", 23)], [(1,)]
+
+    async def fake_copy(sql, params=None):
+        yield b"event_id\n1\n"
+
+    monkeypatch.setattr(streaming, "iter_row_batches", fake_batches)
+    monkeypatch.setattr(export_router, "iter_copy_csv", fake_copy)
+    monkeypatch.setattr(export_router, "pa", None)
+    client = TestClient(api_pkg.api)
+    ndjson = {"Accept": "application/x-ndjson"}
+
+    r = client.get("/v1/seasons/7/events", headers=ndjson)
+    assert r.status_code == 200
+    assert r.headers["ETag"] == season_etag(7, 3, "ndjson")
+    assert "Accept" in r.headers["Vary"]
+    # Same version, other representation: no 304 with the NDJSON validator.
+    assert season_etag(7, 3, "json") != r.headers["ETag"]
+    r = client.get(
+        "/v1/seasons/7/export/events",
+        headers={"Accept": export_router.ARROW_STREAM, "If-None-Match": season_etag(7, 3, "csv")},
+    )
+    assert r.status_code == 200
+    assert r.headers["ETag"] == season_etag(7, 3, "arrow")
+    assert "Accept" in r.headers["Vary"]
+
+    r = client.get(
+        "/v1/seasons/7/export/events?format=csv",
+        headers={"If-None-Match": season_etag(7, 3, "csv")},
+    )
+    assert r.status_code == 304
+    assert "Accept" in r.headers["Vary"]
+
+
+class _Resp:
+    def __init__(self, status_code, payload=None, etag=None):
+        self.status_code = status_code
+        self.content = json.dumps(payload).encode() if payload is not None else b""
+        self.headers = {"Content-Type": "application/json"}
+        if etag:
+            self.headers["ETag"] = etag
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class _Session:
+    def __init__(self, responses):
+        self.responses = responses
+        self.sent = []
+
+    def request(self, method, url, **kwargs):
+        self.sent.append(kwargs.get("headers") or {})
+        return self.responses.pop(0)
+
+
+def test_api_service_revalidates_with_stored_etag():
+    svc = ApiService(base_url="http://api")
+    svc._session = _Session([
+        _Resp(200, {"items": [1]}, etag='W/"season-7-v1"'),
+        _Resp(304, etag='W/"season-7-v1"'),
+    ])
+
+    first = svc._request("GET", "/v1/seasons/7/teams", params={"a": 1})
+    first["items"].append(2)  # callers may mutate what they get back
+    second = svc._request("GET", "/v1/seasons/7/teams", params={"a": 1})
+
+    assert second == {"items": [1]}
+    assert "If-None-Match" not in svc._session.sent[0]
+    assert svc._session.sent[1]["If-None-Match"] == 'W/"season-7-v1"'
+
+
+def _lower_resp(status_code, payload=None, etag=None, cursor=None):
+    # Como requests sobre Starlette: headers en minúsculas, lookup case-insensitive.
+    r = _Resp(status_code, payload)
+    headers = {"content-type": "application/json"}
+    if etag:
+        headers["etag"] = etag
+    if cursor:
+        headers["x-next-cursor"] = cursor
+    r.headers = CaseInsensitiveDict(headers)
+    return r
+
+
+def test_events_all_pages_through_after_304_revalidation():
+    first, second = [{"event_id": 1}], [{"event_id": 2}]
+    svc = ApiService(base_url="http://api")
+    svc._session = _Session([
+        _lower_resp(200, first, etag='W/"season-7-v1-json"', cursor="c1"),
+        _lower_resp(200, second, etag='W/"season-7-v1-json"'),
+        _lower_resp(304, etag='W/"season-7-v1-json"'),
+        _lower_resp(304, etag='W/"season-7-v1-json"'),
+    ])
+
+    assert svc.events_all(7) == first + second
+    assert svc.events_all(7) == first + second
+    assert svc._session.sent[2]["If-None-Match"] == 'W/"season-7-v1-json"'
+    assert svc._session.responses == []
@@ -0,0 +1,95 @@
+# tests/test_api_export.py
+import json
+
+import pandas as pd
+from fastapi.testclient import TestClient
+
+import api as api_pkg
+from api.routers import export as export_router
+from interfaces.dash.data.adapters import DataAdapter
+from interfaces.dash.services import ApiError
+
+
+def test_export_streams_csv_from_copy(monkeypatch, fake_db):
+    seen = []
+
+    async def fake_copy(sql, params=None):
+        seen.append((sql, params))
+        yield b"event_id,match_id,event_type\n"
+        yield b"1,10,Gol\n"
+
+    monkeypatch.setattr(export_router, "iter_copy_csv", fake_copy)
+    monkeypatch.setattr(export_router, "pa", None)  # no pyarrow: Arrow falls back to CSV
+
+    r = TestClient(api_pkg.api).get(
+        "/v1/seasons/7/export/events", headers={"Accept": export_router.ARROW_STREAM}
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/csv")
+    assert r.text == "event_id,match_id,event_type\n1,10,Gol\n"
+    assert "FROM core.event e" in seen[0][0]
+    assert seen[0][1] == [7]
+
+
+def test_unknown_dataset_is_rejected(fake_db):
+    r = TestClient(api_pkg.api).get("/v1/seasons/7/export/nope")
+    assert r.status_code == 422
+
+
+class _FakeApi:
+    def __init__(self, export=None):
+        self.export = export
+        self.paged = 0
+
+    def export_df(self, season_id, dataset):
+        if self.export is None:
+            raise ApiError("404")
+        return self.export
+
+    def events_all(self, season_id, **_kwargs):
+        self.paged += 1
+        return [{"event_id": 2, "match_id": 10, "event_type": "Tarjeta roja", "minute": 80,
+                 "main_player_id": 5, "extra_player_id": None, "team_id": 3}]
+
+
+def test_events_df_prefers_bulk_export():
+    api = _FakeApi(pd.DataFrame([
+        {"event_id": 1, "match_id": 10, "event_type": "Gol", "minute": 12,
+         "main_player_id": 5, "extra_player_id": None, "team_id": 3},
+        {"event_id": None, "match_id": 10, "event_type": None, "minute": 1,
+         "main_player_id": None, "extra_player_id": None, "team_id": None},
+    ]))
+    df = DataAdapter(api=api).events_df(7)
+    assert api.paged == 0
+    assert df["event_type"].tolist() == ["Goal"]
+
+
+def test_events_df_falls_back_to_pages():
+    api = _FakeApi(export=None)
+    df = DataAdapter(api=api).events_df(7)
+    assert api.paged == 1
+    assert df["event_type"].tolist() == ["Red card"]
+
+
+def test_events_stream_as_ndjson(monkeypatch, fake_db):
+    from api import streaming
+    seen = []
+
+    async def fake_batches(sql, params=None, batch_rows=streaming.BATCH_ROWS):
+        seen.append((sql, params))
+        cols = [("event_id", 23), ("match_id", 23), ("event_type", 25)]
+        yield cols, [(1, 10, "Gol"), (2, 10, "Tarjeta roja")]
+        yield cols, [(3, 11, "Gol")]
+
+    monkeypatch.setattr(streaming, "iter_row_batches", fake_batches)
+
+    r = TestClient(api_pkg.api).get(
+        "/v1/seasons/7/events?team_id=3&limit=1", headers={"Accept": "application/x-ndjson"}
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lines = r.text.splitlines()
+    assert [json.loads(l)["event_id"] for l in lines] == [1, 2, 3]
+    sql, params = seen[0]
+    assert "LIMIT" not in sql  # streaming returns the whole filtered result
+    assert params == [7, 3]
@@ -0,0 +1,58 @@
+# tests/test_api_leaders.py
+import pytest
+from fastapi.testclient import TestClient
+
+import api as api_pkg
+import api.routers.leaders as leaders_router
+
+
+@pytest.fixture(autouse=True)
+def _no_cached_table_check(monkeypatch):
+    monkeypatch.setattr(leaders_router, "_HAS_PLAYER_SEASON_TABLE", False)
+
+
+def _install(fake_db, rows, has_aggregate=True):
+    fake_db.install(leaders_router, {"to_regclass": [{"ok": has_aggregate}]}, default=rows)
+
+
+def test_leaders_top_k_ranked_in_sql(fake_db):
+    _install(fake_db, [{
+        "metric": "goals", "rank": 1, "player_id": 9, "player_name": "Nueve",
+        "team_id": 10, "team_name": "Alpha", "value": 12, "total": 12,
+        "per90": 0.6, "minutes": 1800,
+    }])
+
+    r = TestClient(api_pkg.api).get(
+        "/v1/seasons/7/leaders?metric=goals,assists&k=3&per90=true&min_minutes=450"
+    )
+    assert r.status_code == 200
+    body = r.json()
+    assert (body["k"], body["per90"], body["min_minutes"]) == (3, True, 450)
+    assert body["rows"][0]["player_name"] == "Nueve"
+    sql, params = fake_db.calls[-1]
+    assert "PARTITION BY c.metric" in sql
+    assert "core.player_season_stats" in sql
+    assert "('assists'" in sql and "('goalkeeper_saves'" not in sql
+    # Team taken from the player's latest match in the season.
+    assert "FROM core.participation pa" in sql
+    assert "ORDER BY md.matchday_number DESC" in sql
+    assert params == {"season_id": 7, "k": 3, "per90": True, "min_minutes": 450}
+
+
+def test_leaders_without_aggregate_groups_match_rows(fake_db):
+    _install(fake_db, [], has_aggregate=False)
+
+    r = TestClient(api_pkg.api).get("/v1/seasons/7/leaders?metric=goalkeeper_saves")
+    assert r.status_code == 200
+    assert r.json()["rows"] == []
+    sql, _params = fake_db.calls[-1]
+    assert "GROUP BY bs.player_id" in sql
+
+
+def test_leaders_rejects_unknown_metric(fake_db):
+    _install(fake_db, [])
+
+    r = TestClient(api_pkg.api).get("/v1/seasons/7/leaders?metric=goals,xg")
+    assert r.status_code == 400
+    assert "xg" in r.json()["detail"]
+    assert fake_db.calls == []
@@ -0,0 +1,106 @@
+# tests/test_api_response_cache.py
+import asyncio
+
+from fastapi.testclient import TestClient
+
+import api as api_pkg
+from api.response_cache import CachedResponse, ResponseCache, response_cache
+from api.routers import players as players_router
+
+
+def _entry(body: bytes) -> CachedResponse:
+    return CachedResponse(status_code=200, headers=(), body=body)
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = ResponseCache(max_entries=2, max_bytes=10)
+    cache.put(("/a", ""), 1, _entry(b"aaaa"))
+    cache.put(("/b", ""), 1, _entry(b"bbbb"))
+    assert cache.get(("/a", ""), 1) is not None  # /a is now most recent
+    cache.put(("/c", ""), 1, _entry(b"cc"))
+    assert cache.get(("/b", ""), 1) is None
+    cache.put(("/d", ""), 1, _entry(b"dddddddd"))  # 14 > max_bytes: evicts /a
+    assert cache.get(("/a", ""), 1) is None
+    assert cache.stats()["bytes"] == 10
+    assert cache.evictions == 2
+    cache.put(("/e", ""), 1, _entry(b"e" * 11))  # larger than the whole cache
+    assert cache.get(("/e", ""), 1) is None
+
+
+def test_newer_season_version_invalidates_entry():
+    cache = ResponseCache(max_entries=8, max_bytes=1024)
+    cache.put(("/x", ""), 1, _entry(b"old"))
+    assert cache.get(("/x", ""), 2) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_concurrent_misses_share_one_computation():
+    cache = ResponseCache(max_entries=8, max_bytes=1024)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return _entry(b"payload")
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_compute(("/x", ""), 1, compute) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert {r.body for r in results} == {b"payload"}
+    assert (cache.misses, cache.coalesced) == (1, 4)
+    asyncio.run(cache.get_or_compute(("/x", ""), 1, compute))
+    assert cache.hits == 1
+
+
+def test_waiters_recompute_when_the_computing_request_is_cancelled():
+    cache = ResponseCache(max_entries=8, max_bytes=1024)
+    started, calls = None, []
+
+    async def slow():
+        calls.append("slow")
+        started.set()
+        await asyncio.sleep(10)
+
+    async def fast():
+        calls.append("fast")
+        return _entry(b"payload")
+
+    async def run():
+        nonlocal started
+        started = asyncio.Event()
+        leader = asyncio.create_task(cache.get_or_compute(("/x", ""), 1, slow))
+        await started.wait()
+        waiter = asyncio.create_task(cache.get_or_compute(("/x", ""), 1, fast))
+        await asyncio.sleep(0)
+        leader.cancel()  # e.g. the first client disconnected
+        return leader, await waiter
+
+    leader, entry = asyncio.run(run())
+    assert leader.cancelled()
+    assert entry.body == b"payload"
+    assert calls == ["slow", "fast"]
+    assert cache.get(("/x", ""), 1) is not None
+
+
+def test_players_endpoint_is_served_from_cache_until_version_bump(fake_db):
+    fake_db.version = 1
+    fake_db.install(players_router, default=[{
+        "season_team_id": 1, "team_id": 10, "team_name": "A",
+        "player_id": 100, "player_name": "P", "jersey_number": 9,
+    }])
+    response_cache.clear()
+    client = TestClient(api_pkg.api)
+
+    first = client.get("/v1/seasons/7/players")
+    second = client.get("/v1/seasons/7/players")
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert len(fake_db.calls) == 1
+
+    fake_db.version = 2
+    assert client.get("/v1/seasons/7/players").status_code == 200
+    assert len(fake_db.calls) == 2
+    response_cache.clear()
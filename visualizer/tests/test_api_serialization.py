@@ -0,0 +1,36 @@
+# tests/test_api_serialization.py
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+
+import api as api_pkg
+from api.routers import stats as stats_router
+from api.schemas import BasicStatsAPI, MatchEvent, PagedBasicStats
+from api.serialization import RowSpec, dumps
+
+_BASIC_COLUMNS = list(BasicStatsAPI.model_fields)
+
+
+def test_row_spec_follows_model_field_order_and_drops_extras():
+    spec = RowSpec(MatchEvent)
+    row = {"team_id": 3, "extra": "x", "event_id": 1, "match_id": 10, "event_type": "Gol",
+           "minute": None, "main_player_id": 5, "extra_player_id": None}
+    (out,) = spec.rows([row])
+    assert list(out) == list(MatchEvent.model_fields)
+    assert "extra" not in out
+
+
+def test_dumps_encodes_numeric_as_float():
+    assert dumps({"xg": Decimal("0.25")}) == b'{"xg":0.25}'
+
+
+def test_basic_stats_fast_path_matches_schema(fake_db):
+    rows = [{c: i * 100 + n for n, c in enumerate(_BASIC_COLUMNS)} for i in range(1, 4)]
+    fake_db.install(stats_router, default=rows, one={"count": 3})
+
+    r = TestClient(api_pkg.api).get("/v1/seasons/7/stats/basic?limit=3")
+    assert r.status_code == 200
+    page = PagedBasicStats.model_validate(r.json())
+    assert page.total == 3
+    assert [i.basic_stats_id for i in page.items] == [100, 200, 300]
+    assert page.next_cursor is not None  # full page: there may be more
@@ -0,0 +1,44 @@
+# tests/test_api_standings_sql.py
+from fastapi.testclient import TestClient
+
+import api as api_pkg
+import api.deps as deps
+
+
+def _install(monkeypatch, fake_db, rows):
+    # No core.standings table: computed path.
+    monkeypatch.setattr(deps, "_HAS_STANDINGS_TABLE", False)
+    fake_db.install(deps, {"to_regclass": [], "core.standings s": []}, default=rows, one=None)
+
+
+def test_standings_computed_in_sql_honours_until_matchday(monkeypatch, fake_db):
+    _install(monkeypatch, fake_db, [{
+        "team_id": 10, "team_name": "Alpha", "played": 2, "win": 1, "draw": 1, "loss": 0,
+        "gf": 3, "ga": 1, "gd": 2, "points": 5, "position": 1,
+    }])
+
+    r = TestClient(api_pkg.api).get("/v1/seasons/7/standings?until_matchday=2&win=4")
+    assert r.status_code == 200
+    (row,) = r.json()["rows"]
+    assert row["team_name"] == "Alpha"
+    sql, params = fake_db.calls[-1]
+    assert "GROUP BY t.team_id" in sql
+    assert params == {"season_id": 7, "until": 2, "win": 4, "draw": 1, "loss": 0}
+
+
+def test_standings_history_rows(monkeypatch, fake_db):
+    base = {"team_name": "Alpha", "draw": 0, "loss": 0, "ga": 0}
+    _install(monkeypatch, fake_db, [
+        {**base, "matchday_number": 1, "team_id": 10, "played": 1, "win": 1,
+         "gf": 2, "gd": 2, "points": 3, "position": 1},
+        {**base, "matchday_number": 2, "team_id": 10, "played": 2, "win": 2,
+         "gf": 3, "gd": 3, "points": 6, "position": 1},
+    ])
+
+    r = TestClient(api_pkg.api).get("/v1/seasons/7/standings/history?team_id=10")
+    assert r.status_code == 200
+    rows = r.json()["rows"]
+    assert [(x["matchday_number"], x["points"]) for x in rows] == [(1, 3), (2, 6)]
+    sql, params = fake_db.calls[-1]
+    assert "PARTITION BY s.matchday_number" in sql
+    assert params["team_id"] == 10
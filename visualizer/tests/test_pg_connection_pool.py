@@ -0,0 +1,62 @@
+# tests/test_pg_connection_pool.py
+import json
+
+import infrastructure.postgres.connection as connection
+
+
+class _FakePool:
+    created = []
+
+    def __init__(self, conninfo, **kwargs):
+        self.conninfo = conninfo
+        self.kwargs = kwargs
+        self.closed = False
+        _FakePool.created.append(self)
+
+    def close(self):
+        self.closed = True
+
+    check_connection = staticmethod(lambda conn: None)
+
+
+def _write_config(tmp_path, host="db.local"):
+    cfg = tmp_path / "config.json"
+    cfg.write_text(json.dumps({"DB_HOST": host, "DB_NAME": "fr", "DB_USER": "fr"}), encoding="utf-8")
+    return tmp_path
+
+
+def test_dsn_is_resolved_once(tmp_path, monkeypatch):
+    monkeypatch.delenv(connection.DB_DSN_ENV, raising=False)
+    connection.get_dsn.cache_clear()
+    path = str(_write_config(tmp_path))
+    assert connection.get_dsn(path) == "postgresql://fr@db.local:5432/fr"
+
+    # Config edits are not re-read until the cache is cleared.
+    _write_config(tmp_path, host="other.local")
+    assert connection.get_dsn(path) == "postgresql://fr@db.local:5432/fr"
+    connection.get_dsn.cache_clear()
+    assert connection.get_dsn(path) == "postgresql://fr@other.local:5432/fr"
+    connection.get_dsn.cache_clear()
+
+
+def test_pool_is_shared_per_dsn(monkeypatch):
+    monkeypatch.setenv(connection.DB_DSN_ENV, "postgresql://fr@env.local/fr")
+    monkeypatch.setattr(connection, "ConnectionPool", _FakePool)
+    connection.get_dsn.cache_clear()
+    connection.close_pools()
+    _FakePool.created.clear()
+    try:
+        first = connection.get_pool()
+        second = connection.get_pool()
+        assert first is second
+        assert len(_FakePool.created) == 1
+        assert first.conninfo == "postgresql://fr@env.local/fr"
+        assert first.kwargs["min_size"] <= first.kwargs["max_size"]
+        assert first.kwargs["check"] is _FakePool.check_connection
+
+        connection.close_pools()
+        assert first.closed
+        assert connection.get_pool() is not first
+    finally:
+        connection.close_pools()
+        connection.get_dsn.cache_clear()